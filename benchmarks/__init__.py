@@ -0,0 +1 @@
+"""Performance benchmarks for the design pattern implementations."""
@@ -0,0 +1,91 @@
+"""Benchmark: repeat access cost of the metaclass Singleton vs the old base.
+
+Run with pytest-benchmark (the file is collected when named explicitly):
+
+    pytest benchmarks/bench_singleton_access.py --benchmark-only
+
+or without the plugin, as a plain timeit summary:
+
+    python -m benchmarks.bench_singleton_access
+"""
+
+import timeit
+from threading import Lock
+
+from patterns.singleton.after import Singleton
+
+
+class NewBasedSingleton:
+    """The previous base: ``__new__`` lookup, then ``__init__`` runs again."""
+    _instances = {}
+    _lock = Lock()
+    
+    def __new__(cls, *args, **kwargs):
+        if cls not in cls._instances:
+            with cls._lock:
+                if cls not in cls._instances:
+                    instance = super().__new__(cls)
+                    cls._instances[cls] = instance
+        return cls._instances[cls]
+
+
+class OldConfig(NewBasedSingleton):
+    def __init__(self):
+        if hasattr(self, 'values'):
+            return
+        self.values = {}
+
+
+class MetaConfig(Singleton):
+    def __init__(self):
+        self.values = {}
+
+
+class DirectConfig(Singleton, direct=True):
+    def __init__(self):
+        self.values = {}
+
+
+GLOBAL_CONFIG = DirectConfig()
+
+
+def old_access():
+    return OldConfig()
+
+
+def meta_access():
+    return MetaConfig()
+
+
+def direct_access():
+    return DirectConfig.instance
+
+
+def global_access():
+    return GLOBAL_CONFIG
+
+
+def test_old_new_based(benchmark):
+    assert benchmark(old_access) is OldConfig()
+
+
+def test_metaclass_call(benchmark):
+    assert benchmark(meta_access) is MetaConfig()
+
+
+def test_direct_slot(benchmark):
+    assert benchmark(direct_access) is DirectConfig()
+
+
+def test_module_global(benchmark):
+    assert benchmark(global_access) is DirectConfig()
+
+
+if __name__ == "__main__":
+    calls = 2_000_000
+    for name, fn in (("old __new__ base", old_access),
+                     ("metaclass __call__", meta_access),
+                     ("direct Class.instance", direct_access),
+                     ("module global", global_access)):
+        seconds = min(timeit.repeat(fn, number=calls, repeat=3))
+        print(f"{name:<24} {seconds / calls * 1e9:>7.1f} ns/access")
@@ -0,0 +1,92 @@
+"""Benchmark: bytes per entry of the Cache storage engines.
+
+Fills each store with ``--entries`` keys like ``"user:123456"`` and
+measures the memory they hold with tracemalloc (keys and values included,
+since a dict keeps them alive and the compact store copies them), then
+times an untraced fill and random reads. Compares a plain dict, the
+default ``ShardedCache`` and ``CompactCache`` for int and for short bytes
+values.
+
+    python -m benchmarks.cache_compact_memory --entries 1000000
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from patterns.singleton.caching import ShardedCache
+from patterns.singleton.compact import CompactCache
+
+
+class DictStore(dict):
+    def set(self, key, value):
+        self[key] = value
+
+
+STORES = {
+    "dict": DictStore,
+    "ShardedCache": lambda: ShardedCache(1),
+    "CompactCache": CompactCache,
+}
+VALUES = {
+    "int": lambda i: i * 7,
+    "bytes[16]": lambda i: i.to_bytes(16, "little"),
+}
+
+
+def fill(factory, entries: int, make_value):
+    store = factory()
+    for i in range(entries):
+        store.set(f"user:{i}", make_value(i))
+    return store
+
+
+def traced_bytes(factory, entries: int, make_value) -> int:
+    """Memory held by a filled store, per tracemalloc."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store = fill(factory, entries, make_value)
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del store
+    return held
+
+
+def read_ns(store, keys: list) -> float:
+    get = store.get
+    start = time.perf_counter()
+    for key in keys:
+        get(key)
+    return (time.perf_counter() - start) / len(keys) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--reads", type=int, default=200_000)
+    args = parser.parse_args()
+    
+    rng = random.Random(42)
+    keys = [f"user:{rng.randrange(args.entries)}" for _ in range(args.reads)]
+    
+    print(f"{args.entries:,} entries\n")
+    print(f"{'Store':<14} {'Values':<10} {'MiB':>8} {'B/entry':>8} {'Fill s':>7} {'Get ns':>7}")
+    print("-" * 59)
+    for value_name, make_value in VALUES.items():
+        for store_name, factory in STORES.items():
+            held = traced_bytes(factory, args.entries, make_value)
+            # Timed separately: tracing slows allocation-heavy code unevenly
+            start = time.perf_counter()
+            store = fill(factory, args.entries, make_value)
+            seconds = time.perf_counter() - start
+            print(f"{store_name:<14} {value_name:<10} {held / 2**20:>8.1f} "
+                  f"{held / args.entries:>8.1f} {seconds:>7.2f} {read_ns(store, keys):>7.0f}")
+            del store
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark: Cache throughput under thread contention.
+
+Runs a fixed mix of get / set / incr operations split across 1..64 worker
+threads, comparing a single global lock (``shards=1``) with lock striping.
+
+    python -m benchmarks.cache_contention --ops 400000
+"""
+
+import argparse
+import random
+import time
+from threading import Barrier, Thread
+from typing import List
+
+from patterns.singleton.caching import ShardedCache
+
+
+THREAD_COUNTS = (1, 2, 4, 8, 16, 32, 64)
+
+
+def worker(cache: ShardedCache, keys: List[str], ops: int, barrier: Barrier, seed: int):
+    rng = random.Random(seed)
+    picks = [rng.choice(keys) for _ in range(ops)]
+    get, put, incr = cache.get, cache.set, cache.incr
+    barrier.wait()
+    for i, key in enumerate(picks):
+        op = i % 10
+        if op < 7:
+            get(key)
+        elif op < 9:
+            put(key, i)
+        else:
+            incr("counter:" + key[-1])
+
+
+def run(shards: int, threads: int, total_ops: int, keys: List[str]) -> float:
+    cache = ShardedCache(shards, capacity=len(keys) // 2, policy="lru")
+    per_thread = total_ops // threads
+    barrier = Barrier(threads + 1)
+    pool = [
+        Thread(target=worker, args=(cache, keys, per_thread, barrier, seed))
+        for seed in range(threads)
+    ]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=400_000)
+    parser.add_argument("--keys", type=int, default=50_000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+    
+    keys = [f"key:{i}" for i in range(args.keys)]
+    header = "".join(f"{f'shards={n}':>14}" for n in args.shards)
+    print(f"Ops/sec for {args.ops:,} mixed operations (70% get, 20% set, 10% incr)\n")
+    print(f"{'Threads':<8}{header}")
+    print("-" * (8 + 14 * len(args.shards)))
+    for threads in THREAD_COUNTS:
+        row = "".join(f"{run(n, threads, args.ops, keys):>14,.0f}" for n in args.shards)
+        print(f"{threads:<8}{row}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark: hit rate and throughput of Cache eviction policies.
+
+Replays a Zipf-distributed trace over a large key space against caches
+that can only hold a fraction of it.
+
+    python -m benchmarks.cache_eviction --keys 1000000 --ops 2000000
+"""
+
+import argparse
+import random
+import time
+from itertools import accumulate
+from typing import List
+
+from patterns.singleton.caching import BoundedCache
+
+
+def zipf_trace(keys: int, ops: int, skew: float = 1.0, seed: int = 42) -> List[str]:
+    """Generate ``ops`` key accesses where key ``i`` has weight ``1 / i**skew``."""
+    rng = random.Random(seed)
+    cum_weights = list(accumulate(1.0 / (i ** skew) for i in range(1, keys + 1)))
+    names = [f"key:{i}" for i in range(keys)]
+    # Shuffle names so that hot keys are not also the first ones inserted
+    rng.shuffle(names)
+    return rng.choices(names, cum_weights=cum_weights, k=ops)
+
+
+def run(cache: BoundedCache, trace: List[str]) -> tuple:
+    """Read-through replay: a miss loads the key into the cache."""
+    hits = 0
+    get, put = cache.get, cache.set
+    start = time.perf_counter()
+    for key in trace:
+        if get(key) is None:
+            put(key, key)
+        else:
+            hits += 1
+    elapsed = time.perf_counter() - start
+    return hits / len(trace), len(trace) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=1_000_000)
+    parser.add_argument("--ops", type=int, default=2_000_000)
+    parser.add_argument("--capacity", type=int, default=100_000)
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--ttl", type=float, default=0.5)
+    args = parser.parse_args()
+    
+    print(f"Generating trace: {args.ops:,} ops over {args.keys:,} keys "
+          f"(zipf s={args.skew})...")
+    trace = zipf_trace(args.keys, args.ops, args.skew)
+    
+    configs = {
+        "unbounded dict": dict(),
+        "LRU": dict(capacity=args.capacity, policy="lru"),
+        "LFU": dict(capacity=args.capacity, policy="lfu"),
+        f"LRU + TTL {args.ttl}s": dict(capacity=args.capacity, policy="lru", ttl=args.ttl),
+        "LRU by bytes": dict(max_bytes=args.capacity * 120, policy="lru"),
+    }
+    
+    print(f"\n{'Policy':<20} {'Hit rate':>10} {'Ops/sec':>14} {'Entries':>10} {'Evictions':>11}")
+    print("-" * 69)
+    for name, options in configs.items():
+        cache = BoundedCache(**options)
+        hit_rate, ops_per_sec = run(cache, trace)
+        print(f"{name:<20} {hit_rate:>9.1%} {ops_per_sec:>14,.0f} "
+              f"{len(cache):>10,} {cache.evictions:>11,}")
+
+
+if __name__ == "__main__":
+    main()
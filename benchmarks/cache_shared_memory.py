@@ -0,0 +1,105 @@
+"""Benchmark: per-process Cache copies vs one SharedMemoryCache.
+
+Forks N workers that each read random keys from a warmed cache. In the
+per-process mode every worker warms its own ``BoundedCache``; in the shared
+mode the parent warms one ``SharedMemoryCache`` before forking. Memory is
+reported as PSS (proportional set size), which splits shared pages fairly
+between the processes mapping them. Linux only.
+
+    python -m benchmarks.cache_shared_memory --workers 4 --entries 200000
+"""
+
+import argparse
+import multiprocessing
+import random
+import resource
+import time
+
+from patterns.singleton.caching import BoundedCache
+from patterns.singleton.shared_cache import SharedMemoryCache
+
+
+def memory_kb() -> int:
+    """PSS of the current process in KiB (falls back to RSS)."""
+    for path, field in (("/proc/self/smaps_rollup", "Pss:"), ("/proc/self/status", "VmRSS:")):
+        try:
+            with open(path) as stats:
+                for line in stats:
+                    if line.startswith(field):
+                        return int(line.split()[1])
+        except OSError:
+            continue
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def fill(cache, entries: int, value_size: int) -> None:
+    payload = "x" * value_size
+    for i in range(entries):
+        cache.set(f"key:{i}", payload)
+
+
+def worker(mode: str, shared, entries: int, value_size: int, reads: int, results) -> None:
+    if mode == "per-process":
+        cache = BoundedCache()
+        fill(cache, entries, value_size)
+    else:
+        cache = shared
+    
+    rng = random.Random()
+    keys = [f"key:{rng.randrange(entries)}" for _ in range(reads)]
+    get = cache.get
+    start = time.perf_counter()
+    for key in keys:
+        get(key)
+    elapsed = time.perf_counter() - start
+    del keys
+    results.put((reads / elapsed, memory_kb()))
+
+
+def run(mode: str, workers: int, entries: int, value_size: int, reads: int) -> tuple:
+    ctx = multiprocessing.get_context("fork")
+    shared = None
+    if mode == "shared":
+        shared = SharedMemoryCache(capacity=int(entries * 1.25), key_size=16,
+                                   value_size=value_size, context=ctx)
+        fill(shared, entries, value_size)
+    
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=worker, args=(mode, shared, entries, value_size, reads, results))
+        for _ in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+    samples = [results.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+    if shared is not None:
+        shared.close()
+        shared.unlink()
+    
+    throughput = sum(ops for ops, _ in samples)
+    memory = sum(kb for _, kb in samples)
+    return throughput, memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--value-size", type=int, default=100)
+    parser.add_argument("--reads", type=int, default=200_000)
+    args = parser.parse_args()
+    
+    print(f"{args.entries:,} entries of {args.value_size} bytes, "
+          f"{args.reads:,} random reads per worker\n")
+    print(f"{'Workers':<8} {'Mode':<12} {'Total PSS MiB':>14} {'Reads/sec':>14}")
+    print("-" * 51)
+    for workers in args.workers:
+        for mode in ("per-process", "shared"):
+            throughput, memory = run(mode, workers, args.entries, args.value_size, args.reads)
+            print(f"{workers:<8} {mode:<12} {memory / 1024:>14,.1f} {throughput:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Trace replay: hit ratio of each Cache policy on a recorded key trace.
+
+The trace file holds one access per line; the key is the first field
+(whitespace- or comma-separated), so both plain key dumps and CSV access
+logs work. ``-`` reads stdin. Without a file, a synthetic trace is used:
+Zipf-distributed hot keys interrupted by scans of keys seen only once,
+the pattern that admission filtering is meant for.
+
+    python -m benchmarks.cache_trace_replay access.log --capacity 10000 100000
+    python -m benchmarks.cache_trace_replay --write-synthetic trace.txt
+"""
+
+import argparse
+import re
+import sys
+from typing import Iterable, List
+
+from benchmarks.cache_eviction import run, zipf_trace
+from patterns.singleton.caching import BoundedCache
+
+
+POLICIES = {
+    "LRU": dict(policy="lru"),
+    "LFU": dict(policy="lfu"),
+    "LRU + TinyLFU": dict(policy="lru", admission="tinylfu"),
+    "LFU + TinyLFU": dict(policy="lfu", admission="tinylfu"),
+}
+
+_FIELD = re.compile(r"[^\s,]+")
+
+
+def read_trace(lines: Iterable[str]) -> List[str]:
+    trace = []
+    for line in lines:
+        match = _FIELD.search(line)
+        if match:
+            trace.append(match.group(0))
+    return trace
+
+
+def synthetic_trace(keys: int, ops: int, scan_every: int, scan_length: int,
+                    seed: int = 42) -> List[str]:
+    """Zipf accesses with a burst of never-repeated keys every ``scan_every`` ops."""
+    hot = zipf_trace(keys, ops, skew=0.9, seed=seed)
+    trace = []
+    scans = 0
+    for position, key in enumerate(hot):
+        if position and position % scan_every == 0:
+            scans += 1
+            trace.extend(f"scan:{scans}:{i}" for i in range(scan_length))
+        trace.append(key)
+    return trace
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace", nargs="?", help="key trace file, or - for stdin")
+    parser.add_argument("--capacity", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--keys", type=int, default=100_000, help="synthetic trace key space")
+    parser.add_argument("--ops", type=int, default=500_000, help="synthetic trace length")
+    parser.add_argument("--scan-every", type=int, default=20_000)
+    parser.add_argument("--scan-length", type=int, default=10_000)
+    parser.add_argument("--write-synthetic", metavar="PATH",
+                        help="write the synthetic trace to PATH and exit")
+    args = parser.parse_args()
+    
+    if args.trace == "-":
+        trace = read_trace(sys.stdin)
+        source = "stdin"
+    elif args.trace:
+        with open(args.trace) as handle:
+            trace = read_trace(handle)
+        source = args.trace
+    else:
+        trace = synthetic_trace(args.keys, args.ops, args.scan_every, args.scan_length)
+        source = "synthetic zipf + scans"
+    if args.write_synthetic:
+        with open(args.write_synthetic, "w") as handle:
+            handle.writelines(f"{key}\n" for key in trace)
+        print(f"Wrote {len(trace):,} accesses to {args.write_synthetic}")
+        return
+    
+    print(f"Trace: {source}, {len(trace):,} accesses, {len(set(trace)):,} distinct keys\n")
+    print(f"{'Capacity':>10} {'Policy':<16} {'Hit ratio':>10} {'Ops/sec':>12}")
+    print("-" * 51)
+    for capacity in args.capacity:
+        for name, options in POLICIES.items():
+            hit_rate, throughput = run(BoundedCache(capacity, **options), trace)
+            print(f"{capacity:>10,} {name:<16} {hit_rate:>9.1%} {throughput:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark: Cache warm-up after a restart, with and without a snapshot.
+
+A simulated backend answers every cache miss after ``--latency`` seconds.
+Requests follow a Zipf distribution over ``--keys`` keys, read through
+``Cache.get_or_load``. The run reports how long it takes until a window of
+requests reaches the target hit rate: from an empty cache, from a lazily
+restored snapshot and from an eagerly loaded one.
+
+    python -m benchmarks.cache_warm_start --keys 20000 --latency 0.0005
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.cache_eviction import zipf_trace
+from patterns.singleton.after import Cache
+
+
+def make_value(key: str) -> dict:
+    return {"key": key, "profile": "x" * 64, "score": len(key)}
+
+
+def backend(latency: float):
+    def loader(key: str) -> dict:
+        time.sleep(latency)
+        return make_value(key)
+    return loader
+
+
+def warm_up(cache: Cache, trace: list, loader, window: int, target: float) -> tuple:
+    """Replay ``trace``; returns (seconds, requests) until a window hits ``target``."""
+    start = time.perf_counter()
+    window_misses = 0
+    for done, key in enumerate(trace, 1):
+        if key not in cache:
+            window_misses += 1
+        cache.get_or_load(key, loader)
+        if done % window == 0:
+            if 1 - window_misses / window >= target:
+                return time.perf_counter() - start, done
+            window_misses = 0
+    return float("nan"), len(trace)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=400_000)
+    parser.add_argument("--latency", type=float, default=0.0005, help="seconds per backend load")
+    parser.add_argument("--window", type=int, default=2_000)
+    parser.add_argument("--target", type=float, default=0.99, help="hit rate counted as warm")
+    args = parser.parse_args()
+    
+    trace = zipf_trace(args.keys, args.requests, skew=0.8)
+    loader = backend(args.latency)
+    cache = Cache(shards=16)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cache.snap")
+        # The "previous deploy": fully warm, then snapshotted
+        for key in set(trace):
+            cache.set(key, make_value(key))
+        start = time.perf_counter()
+        written = cache.snapshot(path)
+        snapshot_seconds = time.perf_counter() - start
+        print(f"Snapshot: {written:,} entries, {os.path.getsize(path) / 2**20:.1f} MiB "
+              f"in {snapshot_seconds * 1000:.0f} ms\n")
+        
+        print(f"{'Start':<18} {'Restore ms':>11} {'Warm after s':>13} {'Requests':>10}")
+        print("-" * 55)
+        for label, lazy in (("cold (empty)", None), ("snapshot, lazy", True),
+                            ("snapshot, eager", False)):
+            cache.clear()
+            start = time.perf_counter()
+            if lazy is not None:
+                cache.restore(path, lazy=lazy)
+            restore_ms = (time.perf_counter() - start) * 1000
+            seconds, requests = warm_up(cache, trace, loader, args.window, args.target)
+            print(f"{label:<18} {restore_ms:>11.1f} {seconds + restore_ms / 1000:>13.2f} "
+                  f"{requests:>10,}")
+
+
+if __name__ == "__main__":
+    main()
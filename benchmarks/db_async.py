@@ -0,0 +1,79 @@
+"""Benchmark: sync DatabaseConnection vs pipelined AsyncDatabaseConnection.
+
+Both talk to a ``FakeDatabaseServer`` with the same per-round-trip latency.
+The sync API is driven by one thread per caller, each running its queries
+through ``execute_query`` (one round trip per query); the async API by one
+coroutine per caller, whose queries are coalesced into batches.
+
+    python -m benchmarks.db_async --callers 1000 --latency 0.001
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from patterns.singleton.after import AsyncDatabaseConnection, DatabaseConnection
+from patterns.singleton.async_db import FakeDatabaseServer
+
+
+def run_sync(callers: int, queries: int, latency: float) -> tuple:
+    server = FakeDatabaseServer(latency)
+    db = DatabaseConnection("localhost", 5432, "bench-sync", server)
+    db.connect()
+    
+    def caller(n: int) -> None:
+        for i in range(queries):
+            db.execute_query(f"SELECT * FROM users WHERE id = {n * queries + i}")
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(callers) as pool:
+        list(pool.map(caller, range(callers)))
+    elapsed = time.perf_counter() - start
+    return callers * queries / elapsed, server.round_trips
+
+
+def run_async(callers: int, queries: int, latency: float,
+              max_batch: int, max_in_flight: int) -> tuple:
+    server = FakeDatabaseServer(latency)
+    db = AsyncDatabaseConnection("localhost", 5432, f"bench-async-{max_batch}-{max_in_flight}",
+                                 server, max_batch=max_batch, max_in_flight=max_in_flight)
+    db.connect()
+    
+    async def caller(n: int) -> None:
+        for i in range(queries):
+            await db.aexecute(f"SELECT * FROM users WHERE id = {n * queries + i}")
+    
+    async def main() -> None:
+        await asyncio.gather(*[caller(n) for n in range(callers)])
+    
+    start = time.perf_counter()
+    asyncio.run(main())
+    elapsed = time.perf_counter() - start
+    return callers * queries / elapsed, server.round_trips
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--callers", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=3, help="queries per caller")
+    parser.add_argument("--latency", type=float, default=0.001, help="seconds per round trip")
+    args = parser.parse_args()
+    
+    print(f"{args.callers:,} concurrent callers x {args.queries} queries, "
+          f"{args.latency * 1000:g} ms per round trip\n")
+    print(f"{'API':<32} {'Requests/sec':>14} {'Round trips':>12}")
+    print("-" * 60)
+    rows = [("sync execute_query (threads)",
+             lambda: run_sync(args.callers, args.queries, args.latency))]
+    for max_batch, max_in_flight in ((1, 1), (1, 8), (128, 1), (128, 8)):
+        rows.append((f"async batch={max_batch} in-flight={max_in_flight}",
+                     lambda b=max_batch, f=max_in_flight: run_async(
+                         args.callers, args.queries, args.latency, b, f)))
+    for label, bench in rows:
+        throughput, round_trips = bench()
+        print(f"{label:<32} {throughput:>14,.0f} {round_trips:>12,}")
+
+
+if __name__ == "__main__":
+    main()
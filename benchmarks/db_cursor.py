@@ -0,0 +1,81 @@
+"""Benchmark: fetching a large sqlite result at once vs streaming it.
+
+The rows come from a recursive CTE, so nothing is stored on disk and the
+result can be made as large as wanted. Each mode sums one column over the
+whole result; peak memory is measured with ``tracemalloc``. NumPy is used
+for the columnar mode when installed, ``array.array`` otherwise.
+
+    python -m benchmarks.db_cursor --rows 10000000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from patterns.singleton.after import DatabaseConnection
+from patterns.singleton.cursor import numpy
+from patterns.singleton.pool import sqlite_connector
+
+
+QUERY = """
+WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+SELECT n AS id, n * 0.5 AS amount, 'row-' || n AS label FROM seq
+"""
+
+
+def fetch_all(db, rows, batch):
+    return sum(row[1] for row in db.execute(QUERY, (rows,)))
+
+
+def iterate(db, rows, batch):
+    return sum(row[1] for row in db.cursor(QUERY, (rows,), arraysize=batch))
+
+
+def fetchmany(db, rows, batch):
+    total = 0.0
+    with db.cursor(QUERY, (rows,)) as cursor:
+        while True:
+            chunk = cursor.fetchmany(batch)
+            if not chunk:
+                return total
+            total += sum(row[1] for row in chunk)
+
+
+def columnar(db, rows, batch):
+    cursor = db.cursor(QUERY, (rows,))
+    return sum(float(sum(columns["amount"]))
+               for columns in cursor.iter_batches(batch, columnar=True))
+
+
+MODES = [
+    ("execute (fetchall)", fetch_all),
+    ("cursor iteration", iterate),
+    ("cursor fetchmany", fetchmany),
+    ("columnar batches", columnar),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=10_000)
+    args = parser.parse_args()
+    
+    db = DatabaseConnection("sqlite", 0, ":memory:", driver=sqlite_connector(":memory:"))
+    db.connect()
+    print(f"{args.rows:,} rows, batches of {args.batch:,}, "
+          f"columns as {'numpy' if numpy is not None else 'array.array'}\n")
+    print(f"{'Mode':<20} {'Seconds':>9} {'Peak MiB':>10} {'Sum':>18}")
+    print("-" * 60)
+    for label, mode in MODES:
+        tracemalloc.start()
+        start = time.perf_counter()
+        total = mode(db, args.rows, args.batch)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{label:<20} {elapsed:>9.2f} {peak / 2**20:>10.1f} {total:>18,.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark: one shared DatabaseConnection-style connection vs ConnectionPool.
+
+Every thread runs read queries against a sqlite3 database. The shared mode
+serializes all threads on one connection (what a singleton connection
+forces); the pool mode gives each thread its own checked-out connection.
+
+    python -m benchmarks.db_pool --queries 4000
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from threading import Barrier, Lock, Thread
+
+from patterns.singleton.pool import ConnectionPool, sqlite_connector
+
+
+THREAD_COUNTS = (1, 2, 4, 8, 16, 32, 64)
+QUERY = "SELECT COUNT(*), SUM(value) FROM items WHERE value % ? = 0"
+
+
+def create_database(path: str, rows: int) -> None:
+    with sqlite3.connect(path) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, value INTEGER)")
+        conn.executemany("INSERT INTO items (value) VALUES (?)", ((i,) for i in range(rows)))
+
+
+def run_threads(threads: int, queries: int, job) -> float:
+    per_thread = queries // threads
+    barrier = Barrier(threads + 1)
+    
+    def worker(seed: int):
+        barrier.wait()
+        for i in range(per_thread):
+            job(seed + i % 7 + 2)
+    
+    pool = [Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def shared_connection(path: str, threads: int, queries: int) -> float:
+    conn = sqlite_connector(path)()
+    lock = Lock()
+    
+    def job(modulo: int):
+        with lock:
+            conn.execute(QUERY, (modulo,)).fetchone()
+    
+    try:
+        return run_threads(threads, queries, job)
+    finally:
+        conn.close()
+
+
+def pooled_connections(path: str, threads: int, queries: int) -> float:
+    pool = ConnectionPool(sqlite_connector(path), min_size=1, max_size=threads)
+    
+    def job(modulo: int):
+        with pool.connection() as conn:
+            conn.execute(QUERY, (modulo,)).fetchone()
+    
+    try:
+        return run_threads(threads, queries, job)
+    finally:
+        pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=4000)
+    parser.add_argument("--rows", type=int, default=20_000)
+    args = parser.parse_args()
+    
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "bench.db")
+    create_database(path, args.rows)
+    print(f"{args.queries:,} queries over {args.rows:,} rows "
+          f"(sqlite3, {os.cpu_count()} CPUs)\n")
+    print(f"{'Threads':<8} {'Shared q/s':>12} {'Pool q/s':>12} {'Speedup':>9}")
+    print("-" * 44)
+    try:
+        for threads in THREAD_COUNTS:
+            shared = shared_connection(path, threads, args.queries)
+            pooled = pooled_connections(path, threads, args.queries)
+            print(f"{threads:<8} {shared:>12,.0f} {pooled:>12,.0f} {pooled / shared:>8.2f}x")
+    finally:
+        for name in os.listdir(directory):
+            os.unlink(os.path.join(directory, name))
+        os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
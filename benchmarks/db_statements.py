@@ -0,0 +1,106 @@
+"""Benchmark: what the prepared-statement cache adds on top of sqlite's own.
+
+Runs a handful of hot query shapes, each issued in several spellings
+(extra whitespace, a comment, trailing ``;``), as different call sites
+tend to write it. Three set-ups:
+
+* "sqlite, no cache" - the raw driver with ``cached_statements=0``: every
+  call compiles its statement again;
+* "sqlite cache" - the raw driver with its statement cache (one entry per
+  spelling) and a new cursor per call, i.e. life without ``StatementCache``;
+* "StatementCache" - ``DatabaseConnection.execute`` on the same driver:
+  every spelling maps onto one statement that reuses its own cursor.
+
+The first gap is sqlite's doing; only the second is the connection's,
+and on sqlite it is a cost, not a gain: the connection's lock and the
+statement lookup take more than reusing the cursor saves (about 15% per
+query here). What ``StatementCache`` buys is one statement, with hit/miss
+counts, per query shape, not speed over a driver that caches by itself.
+
+    python -m benchmarks.db_statements --rows 10000 --calls 100000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from patterns.singleton.after import DatabaseConnection
+from patterns.singleton.pool import sqlite_connector
+
+
+SHAPES = [
+    "SELECT name, email FROM users WHERE id = ?",
+    "SELECT COUNT(*) FROM orders WHERE user_id = ?",
+    "SELECT SUM(total) FROM orders WHERE user_id = ? AND status = 'paid'",
+    "SELECT id, total FROM orders WHERE user_id = ? ORDER BY id DESC LIMIT 5",
+    "SELECT u.name, o.total FROM users u JOIN orders o ON o.user_id = u.id WHERE o.id = ?",
+]
+
+
+def spellings(sql: str) -> list:
+    return [sql, sql + ";", sql.replace(" ", "  "),
+            "\n  " + sql.replace(" WHERE", " -- hot path\n WHERE")]
+
+
+def setup(path: str, rows: int) -> None:
+    with sqlite3.connect(path) as db:
+        db.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, email TEXT)")
+        db.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY, user_id INTEGER, "
+                   "total REAL, status TEXT)")
+        db.execute("CREATE INDEX orders_user ON orders (user_id)")
+        db.executemany("INSERT INTO users VALUES (?, ?, ?)",
+                       ((i, f"user{i}", f"user{i}@example.com") for i in range(rows)))
+        db.executemany("INSERT INTO orders VALUES (?, ?, ?, ?)",
+                       ((i, i % rows, i * 0.5, "paid" if i % 3 else "open")
+                        for i in range(rows * 3)))
+
+
+def run(label: str, path: str, cached_statements: int, statement_cache: bool,
+        calls: int, rows: int) -> None:
+    driver = sqlite_connector(path, cached_statements=cached_statements)
+    if statement_cache:
+        db = DatabaseConnection("sqlite", 0, f"{path}:{label}", driver=driver)
+        db.connect()
+        execute, close = db.execute, db.close
+    else:
+        connection = driver()
+        close = connection.close
+        
+        def execute(sql, params):
+            return connection.execute(sql, params).fetchall()
+    rng = random.Random(7)
+    workload = [(rng.choice(spellings(rng.choice(SHAPES))), (rng.randrange(rows),))
+                for _ in range(calls)]
+    start = time.perf_counter()
+    for sql, params in workload:
+        execute(sql, params)
+    elapsed = time.perf_counter() - start
+    hits = f"{db.statements.hits:,}" if statement_cache else "-"
+    misses = f"{db.statements.misses:,}" if statement_cache else "-"
+    print(f"{label:<18} {elapsed / calls * 1e6:>10.2f} {calls / elapsed:>12,.0f} "
+          f"{hits:>10} {misses:>10}")
+    close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--calls", type=int, default=100_000)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        setup(path, args.rows)
+        print(f"{len(SHAPES)} query shapes x 4 spellings, {args.calls:,} calls\n")
+        print(f"{'Mode':<18} {'us/query':>10} {'Queries/sec':>12} {'Hits':>10} {'Misses':>10}")
+        print("-" * 64)
+        run("sqlite, no cache", path, 0, False, args.calls, args.rows)
+        run("sqlite cache", path, 128, False, args.calls, args.rows)
+        run("StatementCache", path, 128, True, args.calls, args.rows)
+
+
+if __name__ == "__main__":
+    main()
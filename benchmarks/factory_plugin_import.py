@@ -0,0 +1,110 @@
+"""Benchmark: startup import time, eager vs lazy provider plugins.
+
+Generates ``--providers`` plugin modules, each standing in for a provider
+SDK that needs ``--sdk-ms`` to import, and runs three fresh interpreters
+with ``-X importtime``: one imports every plugin and registers the
+classes (what ``VPSFactory._creators`` does today), one registers them by
+module path and lists them with ``get_providers()``, and one also creates
+a server of a single provider. Reported: total import time from the
+``-X importtime`` log, how many plugins got imported and wall time
+(which also covers the lazy import, not logged by ``-X importtime``).
+
+    python -m benchmarks.factory_plugin_import --providers 24 --sdk-ms 20
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+
+PLUGIN = '''\
+import time
+
+from patterns.factory_method.after import VPS
+
+time.sleep({seconds})  # SDK initialisation
+
+
+class Provider(VPS):
+    provider = "{name}"
+
+    def deploy(self) -> str:
+        return f"Deploying {{self.name}} on {name}"
+
+    def get_cost(self) -> float:
+        return 10.0
+'''
+
+SCRIPTS = {
+    "eager import": """
+import sys
+{imports}
+from patterns.factory_method.after import VPSFactory
+for k in range({count}):
+    VPSFactory.register(f"p{{k}}", sys.modules[f"bench_plugin_{{k}}"].Provider)
+VPSFactory.get_providers()
+""",
+    "lazy, list only": """
+from patterns.factory_method.after import VPSFactory
+for k in range({count}):
+    VPSFactory.register(f"p{{k}}", f"bench_plugin_{{k}}:Provider")
+VPSFactory.get_providers()
+""",
+    "lazy + 1 create": """
+from patterns.factory_method.after import VPSFactory
+for k in range({count}):
+    VPSFactory.register(f"p{{k}}", f"bench_plugin_{{k}}:Provider")
+VPSFactory.get_providers()
+VPSFactory.create("p0", "web-1", "small").deploy()
+""",
+}
+# importlib.import_module (used for lazy loading) bypasses the -X importtime
+# log, so the plugins actually imported are counted from sys.modules
+REPORT = """
+import sys
+print(sum(name.startswith("bench_plugin_") for name in sys.modules))
+"""
+
+_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|")
+
+
+def run(script: str, plugin_dir: str) -> tuple:
+    """(total import µs, plugins imported, wall seconds) of one interpreter."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([plugin_dir, os.getcwd(), env.get("PYTHONPATH", "")])
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", script + REPORT],
+                               env=env, capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+    total = sum(int(self_us) for self_us in _IMPORTTIME.findall(completed.stderr))
+    return total, int(completed.stdout.split()[-1]), wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--providers", type=int, default=24)
+    parser.add_argument("--sdk-ms", type=float, default=20.0, help="import time of one plugin")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as plugin_dir:
+        for k in range(args.providers):
+            with open(os.path.join(plugin_dir, f"bench_plugin_{k}.py"), "w") as handle:
+                handle.write(PLUGIN.format(seconds=args.sdk_ms / 1000, name=f"Plugin{k}"))
+        run("import bench_plugin_0", plugin_dir)  # compile the plugins' .pyc once
+        
+        print(f"{args.providers} plugins, {args.sdk_ms:.0f} ms each to import\n")
+        print(f"{'Startup':<18} {'Import ms':>10} {'Plugins imported':>17} {'Wall ms':>8}")
+        print("-" * 56)
+        for label, script in SCRIPTS.items():
+            imports = "\n".join(f"import bench_plugin_{k}" for k in range(args.providers))
+            script = script.format(count=args.providers, imports=imports)
+            total, plugins, wall = run(script, plugin_dir)
+            print(f"{label:<18} {total / 1000:>10.1f} {plugins:>17} {wall * 1000:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
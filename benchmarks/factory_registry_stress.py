@@ -0,0 +1,109 @@
+"""Benchmark: VPSFactory lookups under concurrent registrations.
+
+``--readers`` threads call ``create()`` in a loop, and every 100th call
+also walks the provider table the way ``VPSFactory.freeze`` does, while
+an optional writer thread registers and unregisters a provider in turn,
+``--writes`` times a second (0: as fast as it can). Two factories are
+compared: one on a plain shared dict, as before the copy-on-write
+registry, and ``VPSFactory`` itself. Reported: creates per second across
+all readers, writes per second and how many reads failed ("dictionary
+changed size during iteration").
+
+    python -m benchmarks.factory_registry_stress --readers 8 --seconds 2 --writes 1000
+"""
+
+import argparse
+import threading
+import time
+from typing import Optional
+
+from patterns.factory_method.after import GCPVPS, VPSFactory
+from patterns.factory_method.plugins import LazyProvider
+
+
+class DictFactory:
+    """VPSFactory as it was before the registry: one shared, unsynchronized dict."""
+    _creators = dict(VPSFactory._creators)
+    
+    @classmethod
+    def create(cls, provider_type, name, config):
+        if provider_type not in cls._creators:
+            raise ValueError(f"Unknown provider: {provider_type}")
+        
+        vps_class = cls._creators[provider_type]
+        if isinstance(vps_class, LazyProvider):
+            vps_class = vps_class.load()
+        return vps_class(name, config)
+    
+    @classmethod
+    def register(cls, provider_type, vps_class):
+        cls._creators[provider_type] = vps_class
+    
+    @classmethod
+    def unregister(cls, provider_type):
+        return cls._creators.pop(provider_type, None) is not None
+
+
+def reader(factory, stop: threading.Event, counts: list, slot: int) -> None:
+    creates = errors = 0
+    while not stop.is_set():
+        for _ in range(100):
+            factory.create("aws", "web", "small")
+        creates += 100
+        try:
+            for _ in factory._creators.items():
+                time.sleep(0)  # let the writer in mid-walk, as a real scan would
+        except RuntimeError:
+            errors += 1
+    counts[slot] = (creates, errors)
+
+
+def writer(factory, stop: threading.Event, rate: float, done: list) -> None:
+    pause = 1 / rate if rate else 0
+    writes = 0
+    while not stop.wait(pause):
+        if writes % 2:
+            factory.unregister("burst")
+        else:
+            factory.register("burst", GCPVPS)
+        writes += 1
+    done.append(writes)
+
+
+def run(factory, readers: int, seconds: float, writes: Optional[float]) -> tuple:
+    """(creates/s, writes/s, failed reads); ``writes=None`` runs no writer."""
+    stop = threading.Event()
+    counts = [(0, 0)] * readers
+    done = [0]
+    threads = [threading.Thread(target=reader, args=(factory, stop, counts, slot))
+               for slot in range(readers)]
+    if writes is not None:
+        threads.append(threading.Thread(target=writer, args=(factory, stop, writes, done)))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    creates = sum(creates for creates, _ in counts)
+    return creates / seconds, done[-1] / seconds, sum(errors for _, errors in counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--writes", type=float, default=1000.0, help="writer rate, 0 = unthrottled")
+    args = parser.parse_args()
+    
+    print(f"{args.readers} reader threads, {args.seconds:g} s per run\n")
+    print(f"{'Registry':<16} {'Creates/s':>11} {'Writes/s':>10} {'Failed reads':>13}")
+    print("-" * 53)
+    for label, factory in (("plain dict", DictFactory), ("copy-on-write", VPSFactory)):
+        for writes in (None, args.writes):
+            rate, write_rate, errors = run(factory, args.readers, args.seconds, writes)
+            print(f"{label:<16} {rate:>11,.0f} {write_rate:>10,.0f} {errors:>13,}")
+
+
+if __name__ == "__main__":
+    main()
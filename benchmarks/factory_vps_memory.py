@@ -0,0 +1,72 @@
+"""Benchmark: bytes per VPS instance for the different inventory layouts.
+
+Creates ``--servers`` servers and measures what they hold with
+tracemalloc: the former ``__dict__``-based VPS class, today's slotted
+classes (configs interned), the ``FrozenVPS`` tuple and one row of a
+columnar ``Fleet``. Names are unique per server; configs repeat, but each
+spec builds its config string anew, as parsing an inventory file would.
+
+    python -m benchmarks.factory_vps_memory --servers 1000000
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from patterns.factory_method.after import VPSFactory
+
+
+CONFIGS = ["t2.micro", "t2.medium", "m5.large", "c5.xlarge"]
+
+
+class DictVPS:
+    """The VPS layout before slots: one ``__dict__`` per instance."""
+    provider = "AWS"
+    
+    def __init__(self, name: str, config: str):
+        self.name = name
+        self.config = config
+
+
+def specs(servers: int):
+    for i in range(servers):
+        family, size = CONFIGS[i % len(CONFIGS)].split(".")
+        yield "aws", f"server-{i}", f"{family}.{size}"
+
+
+LAYOUTS = {
+    "dict-based VPS": lambda servers: [DictVPS(name, config)
+                                       for _, name, config in specs(servers)],
+    "slotted VPS": lambda servers: [VPSFactory.create(*spec) for spec in specs(servers)],
+    "FrozenVPS": lambda servers: [VPSFactory.freeze(VPSFactory.create(*spec))
+                                  for spec in specs(servers)],
+    "Fleet row": lambda servers: VPSFactory.create_many(specs(servers)),
+}
+
+
+def traced_bytes(build, servers: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    inventory = build(servers)
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del inventory
+    return held
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", type=int, default=1_000_000)
+    args = parser.parse_args()
+    
+    print(f"{args.servers:,} servers\n")
+    print(f"{'Layout':<16} {'MiB':>8} {'B/server':>9}")
+    print("-" * 35)
+    for label, build in LAYOUTS.items():
+        held = traced_bytes(build, args.servers)
+        print(f"{label:<16} {held / 2**20:>8.1f} {held / args.servers:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark: fleet cost analytics, per-object loop vs columnar Fleet.
+
+Builds ``--servers`` servers over the four built-in providers and a few
+configs, once as a list of ``VPS`` objects from ``VPSFactory.create`` and
+once as a ``Fleet`` from ``VPSFactory.create_many``. Then times total
+cost, cost per provider, top-10 and a 36-month projection: the loop calls
+``get_cost()`` on every object, the analytics module works on columns.
+
+    python -m benchmarks.fleet_cost_analytics --servers 10000000
+"""
+
+import argparse
+import heapq
+import random
+import time
+
+from patterns.factory_method import analytics
+from patterns.factory_method.after import VPSFactory
+from patterns.factory_method.fleet import numpy
+
+
+PROVIDERS = ["aws", "azure", "gcp", "digitalocean"]
+CONFIGS = ["small", "medium", "large", "xlarge"]
+
+
+def specs(servers: int, seed: int = 7):
+    rng = random.Random(seed)
+    for i in range(servers):
+        yield rng.choice(PROVIDERS), f"server-{i}", rng.choice(CONFIGS)
+
+
+def loop_report(servers: list, months: int) -> tuple:
+    total = sum(vps.get_cost() for vps in servers)
+    by_provider = {}
+    for vps in servers:
+        by_provider[vps.provider] = by_provider.get(vps.provider, 0.0) + vps.get_cost()
+    top = heapq.nlargest(10, servers, key=lambda vps: vps.get_cost())
+    projection = [total * month for month in range(1, months + 1)]
+    return total, by_provider, top, projection
+
+
+def columnar_report(fleet, months: int, use_numpy: bool) -> tuple:
+    return (fleet.total_cost(),
+            analytics.cost_by_provider(fleet, use_numpy),
+            analytics.top_n(fleet, 10, use_numpy),
+            analytics.project_costs(fleet, months, cumulative=True, use_numpy=use_numpy))
+
+
+def timed(function, *args) -> tuple:
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", type=int, default=1_000_000)
+    parser.add_argument("--months", type=int, default=36)
+    parser.add_argument("--no-objects", action="store_true",
+                        help="skip the per-object loop (it needs ~200 bytes per server)")
+    args = parser.parse_args()
+    
+    build_fleet, fleet = timed(VPSFactory.create_many, specs(args.servers))
+    print(f"{args.servers:,} servers; Fleet built in {build_fleet:.2f} s\n")
+    print(f"{'Method':<24} {'Analytics s':>12} {'Total cost':>16}")
+    print("-" * 54)
+    
+    if not args.no_objects:
+        servers = [VPSFactory.create(*spec) for spec in specs(args.servers)]
+        seconds, (total, *_) = timed(loop_report, servers, args.months)
+        print(f"{'per-object loop':<24} {seconds:>12.3f} {total:>16,.0f}")
+        del servers
+    
+    paths = [("columnar, pair counts", False)]
+    if numpy is not None:
+        paths.append(("columnar, numpy", True))
+    for label, use_numpy in paths:
+        seconds, (total, *_) = timed(columnar_report, fleet, args.months, use_numpy)
+        print(f"{label:<24} {seconds:>12.4f} {total:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
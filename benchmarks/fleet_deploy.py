@@ -0,0 +1,63 @@
+"""Benchmark: wall-clock fleet deployment vs fleet size and concurrency.
+
+Every deployment waits ``--latency`` seconds of simulated provider time
+(the orchestrator's ``delay`` hook), then calls ``VPS.deploy()``. The
+fleet is spread over the four built-in providers; each backend (thread
+pool, asyncio) runs every fleet size at every concurrency level. The
+sequential column is what the one-at-a-time loop would take (servers x
+latency).
+
+    python -m benchmarks.fleet_deploy --sizes 1000 5000 --concurrency 16 64 256
+"""
+
+import argparse
+import asyncio
+import time
+
+from patterns.factory_method.deploy import DeploymentOrchestrator
+
+
+PROVIDERS = ["aws", "azure", "gcp", "digitalocean"]
+
+
+def specs(servers: int) -> list:
+    return [(PROVIDERS[i % len(PROVIDERS)], f"server-{i}", "standard") for i in range(servers)]
+
+
+def run(backend: str, orchestrator: DeploymentOrchestrator, fleet: list) -> float:
+    start = time.perf_counter()
+    if backend == "threads":
+        results = orchestrator.deploy(fleet)
+    else:
+        results = asyncio.run(orchestrator.adeploy(fleet))
+    seconds = time.perf_counter() - start
+    assert len(results) == len(fleet) and all(result.ok for result in results)
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per deployment")
+    args = parser.parse_args()
+    
+    latency = args.latency
+    print(f"Simulated provider latency: {latency * 1000:.0f} ms per deployment\n")
+    print(f"{'Backend':<9} {'Servers':>8} {'Concurrency':>12} {'Sequential s':>13} "
+          f"{'Wall s':>8} {'Deploys/s':>10}")
+    print("-" * 65)
+    for backend in ("threads", "asyncio"):
+        for size in args.sizes:
+            fleet = specs(size)
+            for concurrency in args.concurrency:
+                orchestrator = DeploymentOrchestrator(max_concurrency=concurrency,
+                                                      delay=lambda provider: latency)
+                seconds = run(backend, orchestrator, fleet)
+                print(f"{backend:<9} {size:>8,} {concurrency:>12} {size * latency:>13.1f} "
+                      f"{seconds:>8.2f} {size / seconds:>10,.0f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
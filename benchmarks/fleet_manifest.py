@@ -0,0 +1,92 @@
+"""Benchmark: loading a large server manifest, all at once vs streaming.
+
+Writes a JSONL and a CSV manifest of ``--servers`` servers, then computes
+the fleet's monthly cost from each: by reading the whole file and calling
+``VPSFactory.create`` per row (what scripts do today), and with
+``ManifestLoader`` streaming columnar batches - in process and with a
+``--processes`` parse stage. Peak memory is measured with tracemalloc in
+a separate pass, since tracing slows everything down.
+
+    python -m benchmarks.fleet_manifest --servers 1000000 --processes 4
+"""
+
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from patterns.factory_method.after import VPSFactory
+from patterns.factory_method.manifest import ManifestLoader
+
+
+PROVIDERS = ["aws", "azure", "gcp", "digitalocean"]
+CONFIGS = ["t2.micro", "t2.medium", "m5.large"]
+
+
+def write_manifests(directory: str, servers: int) -> dict:
+    rows = [(PROVIDERS[i % 4], f"server-{i}", CONFIGS[i % 3]) for i in range(servers)]
+    jsonl = os.path.join(directory, "fleet.jsonl")
+    with open(jsonl, "w", encoding="utf-8") as handle:
+        for provider, name, config in rows:
+            handle.write(json.dumps({"provider": provider, "name": name, "config": config}) + "\n")
+    path_csv = os.path.join(directory, "fleet.csv")
+    with open(path_csv, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["provider", "name", "config"])
+        writer.writerows(rows)
+    return {"jsonl": jsonl, "csv": path_csv}
+
+
+def load_all(path: str, fmt: str) -> float:
+    with open(path, newline="", encoding="utf-8") as handle:
+        if fmt == "jsonl":
+            records = [json.loads(line) for line in handle.readlines()]
+        else:
+            records = list(csv.DictReader(handle))
+    servers = [VPSFactory.create(record["provider"], record["name"], record["config"])
+               for record in records]
+    return sum(vps.get_cost() for vps in servers)
+
+
+def load_streaming(path: str, processes: int) -> float:
+    return sum(fleet.total_cost() for fleet in ManifestLoader(path, processes=processes).batches())
+
+
+def measure(load, *args) -> tuple:
+    start = time.perf_counter()
+    total = load(*args)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    load(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", type=int, default=200_000)
+    parser.add_argument("--processes", type=int, default=2)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_manifests(directory, args.servers)
+        print(f"{args.servers:,} servers; JSONL {os.path.getsize(paths['jsonl']) / 2**20:.1f} MiB, "
+              f"CSV {os.path.getsize(paths['csv']) / 2**20:.1f} MiB\n")
+        print(f"{'Format':<6} {'Method':<22} {'Seconds':>8} {'Peak MiB':>9} {'Cost':>14}")
+        print("-" * 63)
+        for fmt, path in paths.items():
+            methods = [("read all + create", load_all, (path, fmt)),
+                       ("streaming", load_streaming, (path, 0)),
+                       (f"streaming, {args.processes} procs", load_streaming,
+                        (path, args.processes))]
+            for label, load, load_args in methods:
+                seconds, peak, total = measure(load, *load_args)
+                print(f"{fmt:<6} {label:<22} {seconds:>8.2f} {peak / 2**20:>9.1f} {total:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark: full redeploy vs incremental reconciliation of a fleet.
+
+Applies a fleet of ``--servers`` servers once, then changes the config of
+``--changed`` of them (and adds and removes one server) and brings the
+fleet up to date twice: by re-creating and re-deploying everything, as
+the deploy scripts do today, and with ``Reconciler``, which diffs content
+hashes against the applied state and deploys only the plan - once from
+the whole desired fleet, once from just the edited servers.
+
+``deploy()`` of the built-in providers only formats a string; with real
+provider calls (seconds each) the "Deployed" column is what counts.
+
+    python -m benchmarks.fleet_reconcile --servers 100000 --changed 1
+"""
+
+import argparse
+import time
+
+from patterns.factory_method.after import VPSFactory
+from patterns.factory_method.reconcile import Reconciler
+
+
+PROVIDERS = ["aws", "azure", "gcp", "digitalocean"]
+CONFIGS = ["small", "medium", "large"]
+
+
+def fleet(servers: int) -> list:
+    return [(PROVIDERS[i % 4], f"server-{i}", CONFIGS[i % 3]) for i in range(servers)]
+
+
+def full_rebuild(specs: list) -> int:
+    return sum(1 for spec in specs if VPSFactory.create(*spec).deploy())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", type=int, default=100_000)
+    parser.add_argument("--changed", type=int, default=1)
+    args = parser.parse_args()
+    
+    specs = fleet(args.servers)
+    reconciler = Reconciler()
+    start = time.perf_counter()
+    reconciler.reconcile(specs)
+    print(f"Initial apply of {args.servers:,} servers: {time.perf_counter() - start:.2f} s\n")
+    
+    changed = list(specs)
+    edited = []
+    for i in range(0, args.servers, max(1, args.servers // args.changed))[:args.changed]:
+        provider, name, config = changed[i]
+        changed[i] = (provider, name, config + "-v2")
+        edited.append(changed[i])
+    removed = changed.pop()
+    added = ("gcp", "server-new", "small")
+    changed.append(added)
+    
+    start = time.perf_counter()
+    deployed = full_rebuild(changed)
+    rebuild = time.perf_counter() - start
+    print(f"{'Method':<22} {'Deployed':>9} {'Plan ms':>8} {'Total ms':>9}")
+    print("-" * 51)
+    print(f"{'full rebuild':<22} {deployed:>9,} {'-':>8} {rebuild * 1000:>9.1f}")
+    
+    for label, make_plan in (
+        ("reconcile, full diff", lambda: reconciler.plan(changed)),
+        ("reconcile, changes",
+         lambda: reconciler.plan_changes(edited + [added], [removed[:2]])),
+    ):
+        state = dict(reconciler.state)
+        start = time.perf_counter()
+        plan = make_plan()
+        planned = time.perf_counter() - start
+        results = reconciler.apply(plan)
+        total = time.perf_counter() - start
+        print(f"{label:<22} {len(results):>9,} {planned * 1000:>8.2f} {total * 1000:>9.2f}")
+        assert not reconciler.plan(changed)
+        reconciler.state = state
+    print(f"\nPlan: {plan.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Benchmark: cost of a disabled log call vs today's eager ``log(message)``.
+
+    python -m benchmarks.logger_levels --calls 1000000
+"""
+
+import argparse
+import os
+import timeit
+
+from patterns.singleton.after import DEBUG, INFO, Logger
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    args = parser.parse_args()
+    
+    with open(os.devnull, "w") as devnull:
+        logger = Logger(stream=devnull, history=0, level=INFO)
+        user, elapsed = {"id": 42, "name": "alice"}, 0.0123
+        fmt = "user=%s took %.3fs"
+        cases = {
+            "eager log(f-string)": lambda: logger.log(f"user={user} took {elapsed:.3f}s"),
+            "enabled info(fmt, *args)": lambda: logger.info(fmt, user, elapsed),
+            "disabled log(DEBUG, fmt)": lambda: logger.log(DEBUG, fmt, user, elapsed),
+            "disabled debug(fmt)": lambda: logger.debug(fmt, user, elapsed),
+            "is_enabled_for guard": lambda: logger.is_enabled_for(DEBUG) and logger.debug("x"),
+            "empty call (floor)": lambda: None,
+        }
+        
+        print(f"{args.calls:,} calls each, logger threshold INFO\n")
+        print(f"{'Call':<28} {'ns/call':>10}")
+        print("-" * 39)
+        for name, call in cases.items():
+            seconds = min(timeit.repeat(call, number=args.calls, repeat=3))
+            print(f"{name:<28} {seconds / args.calls * 1e9:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark: direct Logger vs buffered background-writer Logger.
+
+Logs N messages to a file and reports messages/sec seen by the caller and
+the total time until everything is on disk, for the direct ``print()``
+logger and for the ring-buffer writer with each overflow policy. The file
+is line-buffered by default, like ``sys.stdout`` on a terminal, so the
+direct logger pays one ``write`` syscall per message; ``--block-buffered``
+shows the case where the stream already batches writes.
+
+    python -m benchmarks.logger_throughput --messages 500000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from patterns.singleton.after import Logger
+from patterns.singleton.log_buffer import OVERFLOW_POLICIES, BufferedLogWriter
+
+
+def run_direct(path: str, messages: int, buffering: int) -> tuple:
+    with open(path, "w", buffering=buffering) as stream:
+        logger = Logger(stream=stream, history=0)
+        start = time.perf_counter()
+        for i in range(messages):
+            logger.log(f"request {i} handled")
+        caller = time.perf_counter() - start
+        stream.flush()
+        total = time.perf_counter() - start
+    return caller, total, 0
+
+
+def run_buffered(path: str, messages: int, overflow: str, capacity: int,
+                 buffering: int) -> tuple:
+    with open(path, "w", buffering=buffering) as stream:
+        writer = BufferedLogWriter(stream, capacity=capacity, overflow=overflow)
+        submit = writer.submit
+        start = time.perf_counter()
+        for i in range(messages):
+            submit(f"[LOG] request {i} handled\n")
+        caller = time.perf_counter() - start
+        writer.close()
+        stream.flush()
+        total = time.perf_counter() - start
+    return caller, total, writer.dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=500_000)
+    parser.add_argument("--capacity", type=int, default=8192)
+    parser.add_argument("--block-buffered", action="store_true")
+    args = parser.parse_args()
+    buffering = -1 if args.block_buffered else 1
+    
+    fd, path = tempfile.mkstemp(suffix=".log")
+    os.close(fd)
+    try:
+        results = {"direct print()": run_direct(path, args.messages, buffering)}
+        for overflow in OVERFLOW_POLICIES:
+            results[f"buffered {overflow}"] = run_buffered(
+                path, args.messages, overflow, args.capacity, buffering)
+    finally:
+        os.unlink(path)
+    
+    print(f"{args.messages:,} messages, ring buffer capacity {args.capacity:,}\n")
+    print(f"{'Mode':<24} {'Caller msg/s':>14} {'Total time':>12} {'Dropped':>10}")
+    print("-" * 63)
+    for name, (caller, total, dropped) in results.items():
+        print(f"{name:<24} {args.messages / caller:>14,.0f} {total:>11.3f}s {dropped:>10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark: keyed Singleton (multiton) lookups and eviction at 10k keys.
+
+    python -m benchmarks.singleton_multiton --keys 10000
+"""
+
+import argparse
+import gc
+import time
+
+from patterns.singleton.after import Singleton
+
+
+class WeakEndpoint(Singleton, keyed=True, weak=True):
+    """Keyed instance evicted once nothing references it."""
+    
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+
+
+class CappedEndpoint(Singleton, keyed=True, max_instances=1000):
+    """Keyed instance kept alive for the 1000 most recently used keys."""
+    
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+
+
+def timed(label: str, calls: int, fn) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<36} {elapsed * 1000:>9.1f}ms  {elapsed / calls * 1e9:>7.0f} ns/call")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    hosts = [(f"db-{i}.internal", 5432) for i in range(args.keys)]
+    calls = args.keys * args.rounds
+    
+    print(f"Weak-reference registry, {args.keys:,} distinct keys:")
+    held = []
+    timed("create (miss)", args.keys, lambda: held.extend(WeakEndpoint(*h) for h in hosts))
+    timed(f"lookup x{args.rounds} (hit, lock-free)", calls,
+          lambda: [WeakEndpoint(*h) for _ in range(args.rounds) for h in hosts])
+    print(f"  live instances while referenced:      {len(WeakEndpoint._registry):,}")
+    held.clear()
+    gc.collect()
+    print(f"  live instances after references drop: {len(WeakEndpoint._registry):,}")
+    
+    print(f"\nLRU-capped registry (max_instances=1000), {args.keys:,} distinct keys:")
+    timed("create (miss, evicting)", args.keys, lambda: [CappedEndpoint(*h) for h in hosts])
+    hot = hosts[-1000:]
+    timed(f"lookup hot 1000 x{args.rounds * 10} (hit)", 1000 * args.rounds * 10,
+          lambda: [CappedEndpoint(*h) for _ in range(args.rounds * 10) for h in hot])
+    print(f"  live instances:                       {len(CappedEndpoint._registry):,}")
+
+
+if __name__ == "__main__":
+    main()
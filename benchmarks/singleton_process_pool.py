@@ -0,0 +1,121 @@
+"""Benchmark: the singletons under a fork-based process pool.
+
+The parent warms the Cache, connects a DatabaseConnection and keeps a
+thread busy writing to the Cache and a buffered Logger while the pool
+forks its workers - the situation that used to deadlock children on locks
+held at fork time. Every task uses all three singletons and reports what
+it found, so the run also checks the fork policies: the Cache is kept with
+its entries, the DatabaseConnection is reset (never connected in a child)
+and the Logger keeps working with a writer thread of its own.
+
+    python -m benchmarks.singleton_process_pool --workers 1 2 4 8 --tasks 64
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from patterns.singleton.after import INFO, Cache, DatabaseConnection, Logger
+
+
+# The parent's connection; forked workers see this very object in the global
+parent_db = None
+
+
+def quiet_worker() -> None:
+    # Singleton constructors announce themselves; keep the table readable
+    sys.stdout = open(os.devnull, "w")
+
+
+def task(ops: int, entries: int) -> tuple:
+    cache = Cache()
+    logger = Logger()
+    db = DatabaseConnection("localhost", 5432, "pool")
+    # A worker's own connection, opened by an earlier task, does not count
+    inherited_connection = db is parent_db and db.is_connected
+    if not db.is_connected:
+        db.connect()
+    
+    hits = 0
+    for i in range(ops):
+        key = f"key:{i % entries}"
+        if cache.get(key) is not None:
+            hits += 1
+        cache.incr(f"count:{os.getpid()}")
+        db.execute_query("SELECT 1")
+        logger.debug("op %d", i)  # filtered by level, like most debug calls
+    logger.info("task done in %d", os.getpid())
+    return os.getpid(), hits, inherited_connection
+
+
+def background_writes(stop: threading.Event) -> None:
+    cache = Cache()
+    logger = Logger()
+    i = 0
+    while not stop.is_set():
+        cache.set(f"busy:{i % 1000}", i)
+        logger.debug("busy %d", i)
+        i += 1
+
+
+def run(workers: int, tasks: int, ops: int, entries: int, timeout: float) -> tuple:
+    ctx = multiprocessing.get_context("fork")
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers, mp_context=ctx, initializer=quiet_worker) as pool:
+        futures = [pool.submit(task, ops, entries) for _ in range(tasks)]
+        # A deadlocked child shows up as a timeout instead of a hang
+        results = [future.result(timeout=timeout) for future in futures]
+    elapsed = time.perf_counter() - start
+    
+    pids = {pid for pid, _, _ in results}
+    hit_rate = sum(hits for _, hits, _ in results) / (tasks * ops)
+    inherited = sum(1 for _, _, connected in results if connected)
+    return tasks * ops / elapsed, len(pids), hit_rate, inherited
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--tasks", type=int, default=64)
+    parser.add_argument("--ops", type=int, default=5_000)
+    parser.add_argument("--entries", type=int, default=10_000)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+    
+    cache = Cache(shards=16)
+    for i in range(args.entries):
+        cache.set(f"key:{i}", i)
+    # Held for the whole run, so the connection exists at every fork
+    global parent_db
+    parent_db = db = DatabaseConnection("localhost", 5432, "pool")
+    db.connect()
+    with open(os.devnull, "w") as sink:
+        logger = Logger(buffered=True, stream=sink, level=INFO)
+        stop = threading.Event()
+        writer = threading.Thread(target=background_writes, args=(stop,), daemon=True)
+        writer.start()
+        
+        print(f"{args.tasks} tasks x {args.ops:,} ops, {args.entries:,} cached entries, "
+              f"parent thread writing during forks\n")
+        print(f"{'Workers':<8} {'Ops/sec':>12} {'Processes':>10} {'Cache hits':>11} "
+              f"{'Inherited DB conn':>18}")
+        print("-" * 63)
+        try:
+            for workers in args.workers:
+                throughput, processes, hit_rate, inherited = run(
+                    workers, args.tasks, args.ops, args.entries, args.timeout)
+                print(f"{workers:<8} {throughput:>12,.0f} {processes:>10} "
+                      f"{hit_rate:>10.0%} {inherited:>18}")
+        finally:
+            stop.set()
+            writer.join()
+            logger.close()
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
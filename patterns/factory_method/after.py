@@ -1,15 +1,29 @@
 """Factory Method - AFTER: With pattern (centralized object creation)."""
 
+import sys
 from abc import ABC, abstractmethod
-from typing import Type, Dict, Any
+from contextlib import contextmanager
+from typing import Type, Dict, Any, Callable, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+from .fleet import Fleet, Spec
+from .plugins import ENTRY_POINT_GROUP, LazyProvider, entry_point_targets
+from .registry import ProviderRegistry, RegistryView
 
 
 class VPS(ABC):
-    """Abstract base class for VPS providers."""
+    """Abstract base class for VPS providers.
+
+    Instances are slotted (no per-instance ``__dict__``) and configs are
+    interned, so a large inventory shares one string per distinct config.
+    Subclasses that do not declare ``__slots__`` still work - they just
+    get a ``__dict__`` back.
+    """
+    
+    __slots__ = ("name", "config")
     
     def __init__(self, name: str, config: str):
         self.name = name
-        self.config = config
+        self.config = sys.intern(config) if type(config) is str else config
     
     @abstractmethod
     def deploy(self) -> str:
@@ -25,6 +39,7 @@ class VPS(ABC):
 class AWSVPS(VPS):
     """AWS VPS implementation."""
     provider = "AWS"
+    __slots__ = ()
     
     def deploy(self) -> str:
         return f"Deploying {self.name} on AWS with config {self.config}"
@@ -36,6 +51,7 @@ class AWSVPS(VPS):
 class AzureVPS(VPS):
     """Azure VPS implementation."""
     provider = "Azure"
+    __slots__ = ()
     
     def deploy(self) -> str:
         return f"Deploying {self.name} on Azure with config {self.config}"
@@ -47,6 +63,7 @@ class AzureVPS(VPS):
 class GCPVPS(VPS):
     """GCP VPS implementation."""
     provider = "GCP"
+    __slots__ = ()
     
     def deploy(self) -> str:
         return f"Deploying {self.name} on GCP with config {self.config}"
@@ -58,6 +75,7 @@ class GCPVPS(VPS):
 class DigitalOceanVPS(VPS):
     """DigitalOcean VPS implementation (easy to add now!)."""
     provider = "DigitalOcean"
+    __slots__ = ()
     
     def deploy(self) -> str:
         return f"Deploying {self.name} on DigitalOcean with config {self.config}"
@@ -66,33 +84,140 @@ class DigitalOceanVPS(VPS):
         return 45.0
 
 
+class FrozenVPS(NamedTuple):
+    """Immutable, hashable form of a VPS - usable as a dict key or set member.
+
+    Two frozen servers are equal when provider type, name and config are.
+    """
+    provider_type: str
+    name: str
+    config: str
+    
+    def thaw(self, factory: Optional[Type["VPSFactory"]] = None) -> VPS:
+        """Create the live VPS object."""
+        return (factory or VPSFactory).create(*self)
+
+
 class VPSFactory:
-    """✅ Factory Method: Encapsulates object creation logic."""
+    """✅ Factory Method: Encapsulates object creation logic.
+
+    Providers live in a copy-on-write ``ProviderRegistry``: ``create`` reads
+    it without locking while ``register`` calls are serialized. Every
+    subclass gets its own registry on top of its parent's, so it sees the
+    parent's providers but its registrations stay its own - ``namespace()``
+    and ``scoped()`` build on that for tenants and tests.
+    """
     
-    _creators: Dict[str, Type[VPS]] = {
+    # Values are VPS classes, or LazyProvider placeholders swapped for the
+    # class on first create()
+    _registry = ProviderRegistry({
         "aws": AWSVPS,
         "azure": AzureVPS,
         "gcp": GCPVPS,
         "digitalocean": DigitalOceanVPS,
-    }
+    })
+    # Read-only Mapping view of the registry, kept for existing callers;
+    # also keeps ``_lookup``, the registry's current ``get``, on the class
+    _creators = RegistryView()
+    _lookup: Callable[[str], Any]
+    _namespaces: Dict[str, Type["VPSFactory"]] = {}
+    
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._registry = ProviderRegistry(parent=cls._registry)
+        cls._registry.publish_to(cls, "_lookup")
+        cls._namespaces = {}
     
     @classmethod
     def create(cls, provider_type: str, name: str, config: str) -> VPS:
         """Create VPS instance based on provider type."""
-        if provider_type not in cls._creators:
+        vps_class = cls._lookup(provider_type)
+        if vps_class is None:
             raise ValueError(f"Unknown provider: {provider_type}")
         
-        vps_class = cls._creators[provider_type]
+        if isinstance(vps_class, LazyProvider):
+            vps_class = cls._load_provider(provider_type, vps_class)
         return vps_class(name, config)
     
     @classmethod
-    def register(cls, provider_type: str, vps_class: Type[VPS]) -> None:
-        """Register new provider (allows runtime extension)."""
-        cls._creators[provider_type] = vps_class
+    def _load_provider(cls, provider_type: str, lazy: LazyProvider) -> Type[VPS]:
+        vps_class = lazy.load()
+        if not (isinstance(vps_class, type) and issubclass(vps_class, VPS)):
+            raise TypeError(f"Provider {provider_type!r} ({lazy.target}) is not a VPS class")
+        # Concurrent first calls may both import; either result is the same class
+        cls._registry.replace(provider_type, lazy, vps_class)
+        return vps_class
+    
+    @classmethod
+    def freeze(cls, vps: VPS) -> FrozenVPS:
+        """Immutable form of ``vps`` (its class must be registered)."""
+        for provider_type, vps_class in cls._creators.items():
+            if type(vps) is vps_class:
+                return FrozenVPS(provider_type, vps.name, vps.config)
+        raise ValueError(f"Unregistered VPS class: {type(vps).__name__}")
+    
+    @classmethod
+    def create_many(cls, specs: Iterable[Spec]) -> Fleet:
+        """Create a fleet from (provider_type, name, config) specs.
+
+        The servers are kept in columns and become VPS objects only when
+        accessed - much cheaper than ``create`` per server for large fleets.
+        """
+        return Fleet.build(cls, specs)
+    
+    @classmethod
+    def register(cls, provider_type: str, vps_class: Union[Type[VPS], str]) -> None:
+        """Register new provider (allows runtime extension).
+
+        ``vps_class`` may also be a ``"package.module:ClassName"`` path: the
+        module is then imported only when the provider is first created.
+        """
+        if isinstance(vps_class, str):
+            vps_class = LazyProvider(vps_class)
+        cls._registry.register(provider_type, vps_class)
+    
+    @classmethod
+    def unregister(cls, provider_type: str) -> bool:
+        """Remove a provider registered on this factory class."""
+        return cls._registry.unregister(provider_type)
+    
+    @classmethod
+    def namespace(cls, name: str) -> Type["VPSFactory"]:
+        """Factory for one tenant: sees this factory's providers, keeps its own.
+
+        The same name always returns the same factory.
+        """
+        factory = cls._namespaces.get(name)
+        if factory is None:
+            factory = cls._namespaces.setdefault(
+                name, type(f"{cls.__name__}[{name}]", (cls,), {}))
+        return factory
+    
+    @classmethod
+    @contextmanager
+    def scoped(cls) -> Iterator[Type["VPSFactory"]]:
+        """Throwaway factory for a ``with`` block (e.g. a test).
+
+        Registrations made on it disappear with it.
+        """
+        yield type(f"{cls.__name__}[scoped]", (cls,), {})
+    
+    @classmethod
+    def discover_providers(cls, group: str = ENTRY_POINT_GROUP) -> List[str]:
+        """Register, lazily, the providers installed packages declare as entry points.
+
+        Providers already registered under the same name are kept.
+        """
+        added = []
+        for provider_type, target in entry_point_targets(group).items():
+            if provider_type not in cls._creators:
+                cls.register(provider_type, target)
+                added.append(provider_type)
+        return added
     
     @classmethod
     def get_providers(cls) -> list:
-        """Get list of available providers."""
+        """Get list of available providers (lazy ones are not imported)."""
         return list(cls._creators.keys())
 
 
@@ -138,3 +263,22 @@ if __name__ == "__main__":
     vps5 = VPSFactory.create("linode", "gpu-server", "Linode 32GB")
     print(f"New provider registered: {vps5.provider}")
     print(f"Updated providers: {VPSFactory.get_providers()}")
+    
+    # Lazy plugin: the module is imported on first create(), not here
+    VPSFactory.register("oracle", "oracle_vps_plugin:OracleVPS")
+    print(f"Lazy provider listed: {VPSFactory.get_providers()[-1]}, "
+          f"imported: {'oracle_vps_plugin' in sys.modules}")
+    
+    # Immutable form: hashable, so servers can be deduplicated or used as keys
+    inventory = {VPSFactory.freeze(vps) for vps in servers + [vps1, vps5]}
+    print(f"Unique servers in inventory: {len(inventory)}")
+    
+    # Bulk creation
+    print("\n📦 Bulk Creation:")
+    fleet = VPSFactory.create_many(
+        (provider, f"node-{i}", "standard")
+        for i in range(100_000)
+        for provider in ("aws", "gcp")
+    )
+    print(f"{fleet}: ${fleet.total_cost():,.0f}/month")
+    print(f"First server: {fleet[0].deploy()}")
@@ -0,0 +1,111 @@
+"""Cost analytics over a ``Fleet`` without touching VPS objects.
+
+Adding up ``vps.get_cost()`` is one Python call per server. A ``Fleet``
+already holds costs in a column, and every server with the same
+(provider, config) pair costs the same, so here:
+
+* with NumPy, group totals are ``bincount`` over the code columns
+  weighted by the cost column, and top-N is an ``argpartition``;
+* without it, totals come from the per-pair row counts the fleet keeps,
+  which costs as much for 10M servers as for ten.
+
+Every function takes ``use_numpy`` (default: when installed) to force
+either path.
+"""
+
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+from .fleet import Fleet, numpy
+
+
+Row = Tuple[str, str, str, float]  # (provider_type, name, config, cost)
+
+
+def _numpy(use_numpy: Optional[bool]) -> bool:
+    return numpy is not None if use_numpy is None else use_numpy
+
+
+def _grouped(fleet: Fleet, codes: str, labels: List[str], position: int,
+             use_numpy: Optional[bool]) -> Dict[str, float]:
+    if _numpy(use_numpy):
+        sums = numpy.bincount(fleet.column(codes), weights=fleet.column("costs"),
+                              minlength=len(labels))
+        return {label: float(total) for label, total in zip(labels, sums)}
+    totals = dict.fromkeys(labels, 0.0)
+    for pair, cost in fleet.pair_costs.items():
+        totals[labels[pair[position]]] += cost * fleet.pair_counts[pair]
+    return totals
+
+
+def cost_by_provider(fleet: Fleet, use_numpy: Optional[bool] = None) -> Dict[str, float]:
+    """Monthly cost per provider type."""
+    return _grouped(fleet, "provider_codes", fleet.provider_keys, 0, use_numpy)
+
+
+def cost_by_config(fleet: Fleet, use_numpy: Optional[bool] = None) -> Dict[str, float]:
+    """Monthly cost per config."""
+    return _grouped(fleet, "config_codes", fleet.configs, 1, use_numpy)
+
+
+def top_n(fleet: Fleet, n: int, use_numpy: Optional[bool] = None) -> List[Row]:
+    """The ``n`` most expensive servers, dearest first."""
+    n = min(n, len(fleet))
+    if n <= 0:
+        return []
+    if _numpy(use_numpy):
+        costs = fleet.column("costs")
+        rows = numpy.argpartition(-costs, n - 1)[:n] if n < len(fleet) else numpy.arange(n)
+        rows = sorted(rows.tolist(), key=lambda row: (-costs[row], row))
+    else:
+        # Take whole pairs from the dearest down, then one pass over the
+        # code columns collects their rows in order
+        quotas: Dict[Tuple[int, int], int] = {}
+        needed = n
+        for pair, _ in sorted(fleet.pair_costs.items(), key=lambda item: -item[1]):
+            quotas[pair] = min(needed, fleet.pair_counts[pair])
+            needed -= quotas[pair]
+            if not needed:
+                break
+        rows = []
+        for row, pair in enumerate(zip(fleet.provider_codes, fleet.config_codes)):
+            if quotas.get(pair):
+                quotas[pair] -= 1
+                rows.append(row)
+                if len(rows) == n:
+                    break
+        rows.sort(key=lambda row: -fleet.costs[row])
+    return [(fleet.provider_keys[fleet.provider_codes[row]], fleet.names[row],
+             fleet.configs[fleet.config_codes[row]], fleet.costs[row]) for row in rows]
+
+
+def project_costs(fleet: Fleet, months: int, growth: float = 0.0,
+                  cumulative: bool = False,
+                  use_numpy: Optional[bool] = None) -> List[float]:
+    """Fleet cost for each of the next ``months`` months.
+
+    ``growth`` is the fleet's size change per month (0.05 = +5%), applied
+    from the second month on; ``cumulative`` returns running totals.
+    """
+    if months < 0:
+        raise ValueError("months must be non-negative")
+    monthly = fleet.total_cost()
+    if _numpy(use_numpy):
+        costs = monthly * (1.0 + growth) ** numpy.arange(months)
+        return (numpy.cumsum(costs) if cumulative else costs).tolist()
+    costs = [monthly * (1.0 + growth) ** month for month in range(months)]
+    return list(accumulate(costs)) if cumulative else costs
+
+
+def fleet_report(fleet: Fleet, months: int = 12, growth: float = 0.0,
+                 top: int = 5) -> dict:
+    """All of the above in one dict."""
+    projection = project_costs(fleet, months, growth, cumulative=True)
+    return {
+        "servers": len(fleet),
+        "monthly_cost": fleet.total_cost(),
+        "by_provider": cost_by_provider(fleet),
+        "by_config": cost_by_config(fleet),
+        "top": top_n(fleet, top),
+        "projected_total": projection[-1] if projection else 0.0,
+    }
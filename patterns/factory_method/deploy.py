@@ -0,0 +1,213 @@
+"""Concurrent fleet deployment over ``VPSFactory``.
+
+``DeploymentOrchestrator`` creates and deploys many servers at once,
+on a thread pool (``deploy``/``stream``) or on asyncio (``adeploy``/
+``astream``). Concurrency is bounded overall and per provider type, each
+provider can be rate limited, and results stream back as deployments
+finish. Provider latency can be simulated with an injected ``delay``.
+"""
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from threading import Lock
+from typing import (Any, AsyncIterator, Callable, Deque, Dict, Iterable, Iterator,
+                    List, NamedTuple, Optional)
+
+from .after import VPSFactory
+from .fleet import Fleet, Spec
+
+
+class DeploymentResult(NamedTuple):
+    provider_type: str
+    name: str
+    message: Optional[str]
+    error: Optional[BaseException]
+    seconds: float
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class TokenBucket:
+    """Rate limiter: ``rate`` operations per second, bursts of ``burst``.
+
+    ``reserve()`` takes a token and returns how long the caller has to
+    wait before using it, so the same bucket serves threads (``sleep``)
+    and coroutines (``asyncio.sleep``). Reservations queue up fairly.
+    """
+    
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = Lock()
+    
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class _Scheduler:
+    """Hands out specs whose provider has a free slot, oldest first."""
+    
+    def __init__(self, specs: Iterable[Spec], max_concurrency: int,
+                 provider_limits: Dict[str, int]):
+        self._queues: Dict[str, Deque[Spec]] = {}
+        for spec in specs:
+            self._queues.setdefault(spec[0], deque()).append(spec)
+        self.total = sum(len(queue) for queue in self._queues.values())
+        self._max = max_concurrency
+        self._limits = provider_limits
+        self._running: Dict[str, int] = dict.fromkeys(self._queues, 0)
+        self.in_flight = 0
+    
+    def ready(self) -> Iterator[Spec]:
+        # Round-robin over providers, so one big provider cannot hog the slots
+        while self.in_flight < self._max:
+            started = False
+            for provider_type, queue in self._queues.items():
+                limit = self._limits.get(provider_type)
+                if queue and (limit is None or self._running[provider_type] < limit):
+                    self._running[provider_type] += 1
+                    self.in_flight += 1
+                    started = True
+                    yield queue.popleft()
+                    if self.in_flight >= self._max:
+                        return
+            if not started:
+                return
+    
+    def finished(self, provider_type: str) -> None:
+        self._running[provider_type] -= 1
+        self.in_flight -= 1
+
+
+class DeploymentOrchestrator:
+    """Deploys fleets with bounded parallelism.
+
+    ``max_concurrency`` caps deployments in flight, ``provider_limits``
+    caps them per provider type and ``rate_limits`` gives providers a
+    deploys-per-second budget; limits and rates must be positive.
+    ``delay(provider_type)`` returns seconds of simulated provider latency
+    added to every deployment.
+
+    Failures do not stop the run: they come back as results with
+    ``error`` set. Specs are ``(provider_type, name, config)`` tuples or a
+    ``Fleet``. On asyncio, ``VPS.deploy()`` itself runs on the event loop,
+    so use the thread backend when it blocks.
+    """
+    
+    def __init__(self, factory: Any = VPSFactory, max_concurrency: int = 32,
+                 provider_limits: Optional[Dict[str, int]] = None,
+                 rate_limits: Optional[Dict[str, float]] = None,
+                 delay: Optional[Callable[[str], float]] = None):
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        # A provider that can never start would strand its specs silently
+        for option, limits in (("provider_limits", provider_limits),
+                               ("rate_limits", rate_limits)):
+            for provider_type, limit in (limits or {}).items():
+                if not limit > 0:
+                    raise ValueError(f"{option}[{provider_type!r}] must be positive")
+        self.factory = factory
+        self.max_concurrency = max_concurrency
+        self.provider_limits = dict(provider_limits or {})
+        self.delay = delay
+        self._buckets = {provider_type: TokenBucket(rate)
+                         for provider_type, rate in (rate_limits or {}).items()}
+    
+    def _scheduler(self, specs: Any) -> _Scheduler:
+        if isinstance(specs, Fleet):
+            specs = (row[:3] for row in specs.rows())
+        return _Scheduler(specs, self.max_concurrency, self.provider_limits)
+    
+    def _wait_before(self, provider_type: str) -> float:
+        bucket = self._buckets.get(provider_type)
+        wait_for = bucket.reserve() if bucket is not None else 0.0
+        if self.delay is not None:
+            wait_for += self.delay(provider_type)
+        return wait_for
+    
+    def _finish(self, spec: Spec, started: float) -> DeploymentResult:
+        try:
+            message, error = self.factory.create(*spec).deploy(), None
+        except Exception as exc:
+            message, error = None, exc
+        return DeploymentResult(spec[0], spec[1], message, error, time.perf_counter() - started)
+    
+    # ---- thread pool backend ----
+    
+    def deploy_one(self, spec: Spec) -> DeploymentResult:
+        """Create and deploy one spec on the calling thread.
+
+        Its provider's rate limit and ``delay`` apply; the concurrency caps
+        do not, since nothing else is scheduled.
+        """
+        started = time.perf_counter()
+        try:
+            time.sleep(self._wait_before(spec[0]))
+        except Exception as exc:  # a failing delay hook fails only this deploy
+            return DeploymentResult(spec[0], spec[1], None, exc, time.perf_counter() - started)
+        return self._finish(spec, started)
+    
+    def stream(self, specs: Any) -> Iterator[DeploymentResult]:
+        """Deploy on a thread pool, yielding results as they complete."""
+        scheduler = self._scheduler(specs)
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, max(scheduler.total, 1)),
+                                thread_name_prefix="deploy") as pool:
+            running = set()
+            while True:
+                running.update(pool.submit(self.deploy_one, spec)
+                               for spec in scheduler.ready())
+                if not running:
+                    return
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    scheduler.finished(result.provider_type)
+                    yield result
+    
+    def deploy(self, specs: Any) -> List[DeploymentResult]:
+        return list(self.stream(specs))
+    
+    # ---- asyncio backend ----
+    
+    async def _adeploy_one(self, spec: Spec) -> DeploymentResult:
+        started = time.perf_counter()
+        try:
+            await asyncio.sleep(self._wait_before(spec[0]))
+        except Exception as exc:
+            return DeploymentResult(spec[0], spec[1], None, exc, time.perf_counter() - started)
+        return self._finish(spec, started)
+    
+    async def astream(self, specs: Any) -> AsyncIterator[DeploymentResult]:
+        """Deploy as asyncio tasks, yielding results as they complete."""
+        scheduler = self._scheduler(specs)
+        running = set()
+        try:
+            while True:
+                running.update(asyncio.ensure_future(self._adeploy_one(spec))
+                               for spec in scheduler.ready())
+                if not running:
+                    return
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    scheduler.finished(result.provider_type)
+                    yield result
+        finally:
+            for task in running:
+                task.cancel()
+    
+    async def adeploy(self, specs: Any) -> List[DeploymentResult]:
+        return [result async for result in self.astream(specs)]
@@ -0,0 +1,121 @@
+"""Columnar fleet of VPS instances for bulk creation.
+
+``VPSFactory.create_many`` returns a ``Fleet``: instead of one Python
+object per server it keeps one row per server in parallel columns -
+provider and config as small integer codes into a table of distinct
+values, names as a list, monthly cost as ``array('d')``. ``VPS`` objects
+are built only when a row is indexed or iterated, and fleet-wide sums run
+over the cost column (with NumPy when it is installed).
+"""
+
+import math
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy
+except ImportError:  # optional: aggregates fall back to array.array
+    numpy = None
+
+
+Spec = Tuple[str, str, str]  # (provider_type, name, config)
+
+
+class Fleet:
+    """Servers stored column by column; ``VPS`` objects made on access.
+
+    The cost of a row is asked once per distinct (provider, config) pair -
+    from one materialized instance - and reused for every row with that
+    pair, so provider classes must price by config, not by name. Rows per
+    pair are counted as well, which lets aggregates skip the rows.
+    """
+    
+    def __init__(self, factory: Any):
+        self._factory = factory
+        self.provider_keys: List[str] = []
+        self.configs: List[str] = []
+        self.provider_codes = array("H")
+        self.config_codes = array("I")
+        self.names: List[str] = []
+        self.costs = array("d")
+        self._provider_index: Dict[str, int] = {}
+        self._config_index: Dict[str, int] = {}
+        # (provider code, config code) -> cost of one server / number of servers
+        self.pair_costs: Dict[Tuple[int, int], float] = {}
+        self.pair_counts: Dict[Tuple[int, int], int] = {}
+    
+    @classmethod
+    def build(cls, factory: Any, specs: Iterable[Spec]) -> "Fleet":
+        fleet = cls(factory)
+        providers, configs = fleet._provider_index, fleet._config_index
+        pair_costs, pair_counts = fleet.pair_costs, fleet.pair_counts
+        creators = factory._creators
+        provider_codes, config_codes = fleet.provider_codes, fleet.config_codes
+        names, costs = fleet.names, fleet.costs
+        for provider_type, name, config in specs:
+            provider = providers.get(provider_type)
+            if provider is None:
+                if provider_type not in creators:
+                    raise ValueError(f"Unknown provider: {provider_type}")
+                provider = providers[provider_type] = len(fleet.provider_keys)
+                fleet.provider_keys.append(provider_type)
+            code = configs.get(config)
+            if code is None:
+                code = configs[config] = len(fleet.configs)
+                fleet.configs.append(config)
+            pair = (provider, code)
+            cost = pair_costs.get(pair)
+            if cost is None:
+                cost = pair_costs[pair] = factory.create(provider_type, name, config).get_cost()
+                pair_counts[pair] = 0
+            pair_counts[pair] += 1
+            provider_codes.append(provider)
+            config_codes.append(code)
+            names.append(name)
+            costs.append(cost)
+        return fleet
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def _materialize(self, row: int) -> Any:
+        return self._factory.create(self.provider_keys[self.provider_codes[row]],
+                                    self.names[row], self.configs[self.config_codes[row]])
+    
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self._materialize(row) for row in range(*index.indices(len(self)))]
+        return self._materialize(range(len(self))[index])
+    
+    def __iter__(self) -> Iterator[Any]:
+        for row in range(len(self)):
+            yield self._materialize(row)
+    
+    def rows(self) -> Iterator[Tuple[str, str, str, float]]:
+        """(provider_type, name, config, cost) per server, without objects."""
+        providers, configs = self.provider_keys, self.configs
+        for provider, name, config, cost in zip(self.provider_codes, self.names,
+                                                self.config_codes, self.costs):
+            yield providers[provider], name, configs[config], cost
+    
+    def column(self, name: str, use_numpy: Optional[bool] = None) -> Sequence:
+        """A numeric column (``costs``, ``provider_codes``, ``config_codes``).
+
+        With NumPy the result is a zero-copy view of the column.
+        """
+        values = getattr(self, name)
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        if not use_numpy:
+            return values
+        return numpy.frombuffer(values, dtype=values.typecode)
+    
+    def total_cost(self) -> float:
+        """Monthly cost of the whole fleet."""
+        if numpy is not None:
+            return float(self.column("costs").sum())
+        counts = self.pair_counts
+        return math.fsum(cost * counts[pair] for pair, cost in self.pair_costs.items())
+    
+    def __repr__(self) -> str:
+        return f"<Fleet of {len(self):,} servers, {len(self.provider_keys)} providers>"
@@ -0,0 +1,180 @@
+"""Streaming loader for large JSONL/CSV server inventories.
+
+A manifest has one server per record with ``provider``, ``name`` and
+``config`` fields - JSON objects one per line, or CSV with a header row.
+``ManifestLoader`` runs it through a generator pipeline::
+
+    read lines in chunks -> parse + validate a chunk -> specs / VPS / Fleet
+
+so memory stays bounded by the chunk size, whatever the file size.
+Provider types are checked against ``VPSFactory._creators`` while
+parsing. With ``processes`` the parse stage runs in worker processes,
+a few chunks ahead of the consumer.
+"""
+
+import csv
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import (Any, Callable, Deque, FrozenSet, Iterable, Iterator, List, Optional,
+                    TextIO, Tuple)
+
+from .after import VPS, VPSFactory
+from .fleet import Fleet, Spec
+
+
+FIELDS = ("provider", "name", "config")
+FORMATS = ("jsonl", "csv")
+
+Chunk = Tuple[int, List[str]]  # (number of the first line, raw lines)
+
+
+def _spec(fmt: str, columns: Tuple[int, int, int], record: Any,
+          providers: FrozenSet[str]) -> Optional[Spec]:
+    if fmt == "jsonl":
+        if not record.strip():
+            return None
+        data = json.loads(record)
+        if not isinstance(data, dict):
+            raise ValueError("record is not a JSON object")
+        provider, name, config = data.get("provider"), data.get("name"), data.get("config")
+    else:
+        if not record:
+            return None
+        if len(record) <= max(columns):
+            raise ValueError(f"expected {max(columns) + 1} columns, got {len(record)}")
+        provider, name, config = record[columns[0]], record[columns[1]], record[columns[2]]
+    if provider not in providers:
+        raise ValueError(f"unknown provider {provider!r}")
+    if not isinstance(name, str) or not isinstance(config, str):
+        raise ValueError("name and config must be strings")
+    return provider, name, config
+
+
+def _csv_rows(lines: List[str], first_line: int) -> Iterator[Tuple[int, List[str]]]:
+    reader = csv.reader(lines)
+    try:
+        for row in reader:
+            yield first_line + reader.line_num - 1, row
+    except csv.Error as error:
+        raise ValueError(f"line {first_line + reader.line_num - 1}: {error}") from None
+
+
+def parse_chunk(fmt: str, columns: Tuple[int, int, int], providers: FrozenSet[str],
+                skip_invalid: bool, chunk: Chunk) -> Tuple[List[Spec], int]:
+    """Validated specs of one chunk and the number of records skipped."""
+    first_line, lines = chunk
+    rows = enumerate(lines, first_line) if fmt == "jsonl" else _csv_rows(lines, first_line)
+    specs: List[Spec] = []
+    skipped = 0
+    for line, record in rows:
+        try:
+            spec = _spec(fmt, columns, record, providers)
+        except ValueError as error:
+            if not skip_invalid:
+                raise ValueError(f"line {line}: {error}") from None
+            skipped += 1
+            continue
+        if spec is not None:
+            specs.append(spec)
+    return specs, skipped
+
+
+class ManifestLoader:
+    """Streams servers out of a JSONL or CSV manifest.
+
+    Iterate ``specs()`` for ``(provider_type, name, config)`` tuples, the
+    loader itself for ``VPS`` objects or ``batches()`` for one columnar
+    ``Fleet`` per chunk. ``errors="skip"`` drops invalid records (counted
+    in ``skipped``) instead of raising ``ValueError``; either way a chunk
+    is validated whole before any of its servers is yielded. ``processes``
+    > 0 parses in that many worker processes. Chunks are cut at line
+    breaks, so CSV fields must not contain any.
+    """
+    
+    def __init__(self, path: str, factory: Any = VPSFactory, format: Optional[str] = None,
+                 chunk_size: int = 10_000, processes: int = 0, errors: str = "raise"):
+        if format is None:
+            format = "csv" if path.endswith(".csv") else "jsonl"
+        if format not in FORMATS:
+            raise ValueError(f"Unknown manifest format: {format}")
+        if errors not in ("raise", "skip"):
+            raise ValueError("errors must be 'raise' or 'skip'")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.path = path
+        self.factory = factory
+        self.format = format
+        self.chunk_size = chunk_size
+        self.processes = processes
+        self.skip_invalid = errors == "skip"
+        self.loaded = 0
+        self.skipped = 0
+    
+    def _chunks(self, handle: TextIO, first_line: int) -> Iterator[Chunk]:
+        while True:
+            lines = list(islice(handle, self.chunk_size))
+            if not lines:
+                return
+            yield first_line, lines
+            first_line += len(lines)
+    
+    def _columns(self, handle: TextIO) -> Tuple[int, int, int]:
+        if self.format == "jsonl":
+            return (0, 1, 2)
+        header = next(csv.reader([handle.readline()]), [])
+        missing = [field for field in FIELDS if field not in header]
+        if missing:
+            raise ValueError(f"{self.path}: CSV header lacks {', '.join(missing)}")
+        return tuple(header.index(field) for field in FIELDS)
+    
+    def _parsed(self, parse: Callable[[Chunk], Tuple[List[Spec], int]],
+                chunks: Iterable[Chunk]) -> Iterator[Tuple[List[Spec], int]]:
+        if not self.processes:
+            yield from map(parse, chunks)
+            return
+        # A bounded window of chunks in flight keeps memory constant
+        # (Pool.imap would read the whole file ahead)
+        window = 2 * self.processes
+        with ProcessPoolExecutor(self.processes) as pool:
+            pending: Deque[Any] = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(parse, chunk))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    
+    def spec_chunks(self) -> Iterator[List[Spec]]:
+        """Validated specs, one list per chunk."""
+        with open(self.path, newline="" if self.format == "csv" else None,
+                  encoding="utf-8") as handle:
+            columns = self._columns(handle)
+            first_line = 1 if self.format == "jsonl" else 2
+            # A partial of a module-level function pickles into worker processes
+            parse = partial(parse_chunk, self.format, columns,
+                            frozenset(self.factory._creators), self.skip_invalid)
+            for specs, skipped in self._parsed(parse, self._chunks(handle, first_line)):
+                self.loaded += len(specs)
+                self.skipped += skipped
+                yield specs
+    
+    def specs(self) -> Iterator[Spec]:
+        for chunk in self.spec_chunks():
+            yield from chunk
+    
+    def __iter__(self) -> Iterator[VPS]:
+        create = self.factory.create
+        for provider_type, name, config in self.specs():
+            yield create(provider_type, name, config)
+    
+    def batches(self) -> Iterator[Fleet]:
+        for chunk in self.spec_chunks():
+            yield self.factory.create_many(chunk)
+    
+    def __repr__(self) -> str:
+        return f"<ManifestLoader {os.path.basename(self.path)} ({self.format})>"
+
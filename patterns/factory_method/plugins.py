@@ -0,0 +1,46 @@
+"""Lazily imported provider plugins for VPSFactory.
+
+A provider can be registered by *where* its class lives - a
+``"package.module:ClassName"`` path, or an entry point in the
+``vps_factory.providers`` group of an installed distribution - instead of
+the class itself. Nothing is imported until the first ``create()`` for
+that provider, so a factory with dozens of SDK-backed providers starts as
+fast as one with none.
+"""
+
+import importlib
+from typing import Any, Dict
+
+
+ENTRY_POINT_GROUP = "vps_factory.providers"
+
+
+class LazyProvider:
+    """Placeholder in ``VPSFactory._creators`` for a class not imported yet."""
+    
+    __slots__ = ("target",)
+    
+    def __init__(self, target: str):
+        module, _, attribute = target.partition(":")
+        if not module or not attribute:
+            raise ValueError(f"Provider path must look like 'package.module:Class': {target!r}")
+        self.target = target
+    
+    def load(self) -> Any:
+        module, _, attribute = self.target.partition(":")
+        loaded = importlib.import_module(module)
+        for name in attribute.split("."):
+            loaded = getattr(loaded, name)
+        return loaded
+    
+    def __repr__(self) -> str:
+        return f"<LazyProvider {self.target}>"
+
+
+def entry_point_targets(group: str = ENTRY_POINT_GROUP) -> Dict[str, str]:
+    """``{provider_type: "module:Class"}`` declared by installed distributions.
+
+    Reads package metadata only; the providers themselves stay unimported.
+    """
+    from importlib.metadata import entry_points  # not needed unless discovering
+    return {entry.name: entry.value for entry in entry_points(group=group)}
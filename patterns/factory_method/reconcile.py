@@ -0,0 +1,149 @@
+"""Incremental fleet reconciliation: redeploy only what changed.
+
+The last applied state maps ``(provider_type, name)`` to a content hash
+of the server's config. ``diff`` compares a desired fleet against it and
+returns a ``Plan`` of creates, updates and deletes; ``Reconciler`` runs
+only that plan through ``VPSFactory`` and records the new state. Hashes
+are memoized per config string, and fleets reuse a few configs, so a
+full diff is dict work, not hashing work; when the caller knows which
+servers an edit touched, ``diff_changes`` skips even that and costs
+O(changes).
+"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .after import VPSFactory
+from .deploy import DeploymentOrchestrator, DeploymentResult
+from .fleet import Fleet, Spec
+
+
+Key = Tuple[str, str]  # (provider_type, name)
+State = Dict[Key, str]  # key -> content hash
+
+
+@lru_cache(maxsize=65536)
+def content_hash(config: str) -> str:
+    return hashlib.blake2b(config.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class Plan(NamedTuple):
+    create: List[Spec]
+    update: List[Spec]
+    delete: List[Key]
+    
+    def __bool__(self) -> bool:
+        return bool(self.create or self.update or self.delete)
+    
+    def summary(self) -> str:
+        return (f"{len(self.create)} to create, {len(self.update)} to update, "
+                f"{len(self.delete)} to delete")
+
+
+def _desired(specs: Any) -> Dict[Key, Spec]:
+    if isinstance(specs, Fleet):
+        specs = (row[:3] for row in specs.rows())
+    desired: Dict[Key, Spec] = {}
+    for spec in specs:
+        key = (spec[0], spec[1])
+        if key in desired:
+            raise ValueError(f"Duplicate server in desired fleet: {key}")
+        desired[key] = spec
+    return desired
+
+
+def _upserts(specs: Iterable[Spec], applied: State) -> Tuple[List[Spec], List[Spec]]:
+    create, update = [], []
+    for spec in specs:
+        old = applied.get((spec[0], spec[1]))
+        if old is None:
+            create.append(spec)
+        elif old != content_hash(spec[2]):
+            update.append(spec)
+    return create, update
+
+
+def diff(specs: Any, applied: State) -> Plan:
+    """Plan turning ``applied`` into the fleet described by ``specs``."""
+    desired = _desired(specs)
+    create, update = _upserts(desired.values(), applied)
+    delete = [key for key in applied if key not in desired]
+    return Plan(create, update, delete)
+
+
+def diff_changes(upserts: Iterable[Spec], removed: Iterable[Key], applied: State) -> Plan:
+    """Plan for a known set of changed servers; costs O(changes), not O(fleet).
+
+    ``upserts`` are servers that may have been added or edited (unchanged
+    ones are left out of the plan), ``removed`` the keys taken out of the
+    fleet.
+    """
+    create, update = _upserts(_desired(upserts).values(), applied)
+    return Plan(create, update, [key for key in dict.fromkeys(removed) if key in applied])
+
+
+class Reconciler:
+    """Keeps a fleet's applied state and brings it to a desired spec.
+
+    ``apply`` deploys creates and updates - on ``orchestrator`` when one
+    is given, one by one otherwise - and records only successful ones, so
+    a failed server shows up in the next plan again. Deletes just drop
+    the server from the state: ``VPS`` has no teardown operation.
+    """
+    
+    def __init__(self, factory: Any = VPSFactory,
+                 orchestrator: Optional[DeploymentOrchestrator] = None,
+                 state: Optional[State] = None):
+        self.factory = factory
+        self.orchestrator = orchestrator
+        self.state: State = dict(state or {})
+    
+    def plan(self, specs: Any) -> Plan:
+        """Plan against the whole desired fleet."""
+        return diff(specs, self.state)
+    
+    def plan_changes(self, upserts: Iterable[Spec] = (), removed: Iterable[Key] = ()) -> Plan:
+        """Plan for just the servers an edit touched."""
+        return diff_changes(upserts, removed, self.state)
+    
+    def _deploy(self, specs: List[Spec]) -> List[DeploymentResult]:
+        if self.orchestrator is not None:
+            return self.orchestrator.deploy(specs)
+        # One by one, through the same create-and-deploy step the orchestrator runs
+        deploy_one = DeploymentOrchestrator(self.factory).deploy_one
+        return [deploy_one(spec) for spec in specs]
+    
+    def apply(self, plan: Plan) -> List[DeploymentResult]:
+        specs = plan.create + plan.update
+        configs = {(spec[0], spec[1]): spec[2] for spec in specs}
+        results = self._deploy(specs)
+        for result in results:
+            if result.ok:
+                key = (result.provider_type, result.name)
+                self.state[key] = content_hash(configs[key])
+        for key in plan.delete:
+            self.state.pop(key, None)
+        return results
+    
+    def reconcile(self, specs: Any) -> Tuple[Plan, List[DeploymentResult]]:
+        plan = self.plan(specs)
+        return plan, self.apply(plan)
+    
+    def save(self, path: str) -> None:
+        """Write the state as JSON, atomically."""
+        partial = f"{path}.{os.getpid()}.tmp"
+        with open(partial, "w", encoding="utf-8") as handle:
+            json.dump([[provider, name, digest]
+                       for (provider, name), digest in self.state.items()], handle)
+        os.replace(partial, path)
+    
+    @classmethod
+    def load(cls, path: str, **kwargs: Any) -> "Reconciler":
+        state: State = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                state = {(provider, name): digest for provider, name, digest in json.load(handle)}
+        return cls(state=state, **kwargs)
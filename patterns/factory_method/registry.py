@@ -0,0 +1,144 @@
+"""Copy-on-write provider registry for VPSFactory.
+
+Reads vastly outnumber writes: every ``create()`` looks a provider up,
+registrations happen at startup or in tests. So readers never lock -
+they look into an immutable snapshot (a ``MappingProxyType`` over a dict
+nobody mutates) - and writers, serialized by one lock, build a new dict
+and swap the snapshot in with a single attribute assignment.
+
+Registries nest: a child sees its parent's providers, live, plus its own,
+which shadow the parent's and never leak back into it. ``VPSFactory``
+gives each subclass a child registry, so subclasses, namespaces and
+test scopes stay isolated.
+"""
+
+from threading import RLock
+from types import MappingProxyType
+from typing import (Any, Callable, Dict, ItemsView, Iterator, KeysView, Mapping, Optional,
+                    Tuple)
+from weakref import WeakSet
+
+
+# One writer lock for all registries: a write rebuilds the whole subtree
+_write_lock = RLock()
+
+
+class ProviderRegistry(Mapping):
+    """Read-only ``Mapping`` of provider type -> VPS class, changed only via methods."""
+    
+    # Registries are compared and hashed by identity (parents keep a WeakSet of children)
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+    
+    def __init__(self, entries: Optional[Mapping[str, Any]] = None,
+                 parent: Optional["ProviderRegistry"] = None):
+        self._parent = parent
+        self._local: Dict[str, Any] = dict(entries or {})
+        self._children: "WeakSet[ProviderRegistry]" = WeakSet()
+        self._published: Optional[Tuple[Any, str]] = None
+        with _write_lock:
+            if parent is not None:
+                parent._children.add(self)
+            self._rebuild()
+    
+    def _rebuild(self) -> None:
+        merged = dict(self._parent._snapshot) if self._parent is not None else {}
+        merged.update(self._local)
+        # Both views are of a dict nobody mutates again, so readers need no lock
+        self._snapshot = MappingProxyType(merged)
+        self.lookup = merged.get
+        if self._published is not None:
+            owner, attribute = self._published
+            setattr(owner, attribute, self.lookup)
+        for child in list(self._children):
+            child._rebuild()
+    
+    # ---- lock-free reads ----
+    
+    # ``lookup(provider_type)`` is the bound ``get`` of the current
+    # snapshot's dict: the cheapest read there is, for ``create()``
+    lookup: Callable[[str], Any]
+    
+    @property
+    def snapshot(self) -> Mapping[str, Any]:
+        """The current immutable contents; stays unchanged while held."""
+        return self._snapshot
+    
+    def __getitem__(self, provider_type: str) -> Any:
+        return self._snapshot[provider_type]
+    
+    def get(self, provider_type: str, default: Any = None) -> Any:
+        return self._snapshot.get(provider_type, default)
+    
+    def __contains__(self, provider_type: object) -> bool:
+        return provider_type in self._snapshot
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._snapshot)
+    
+    def __len__(self) -> int:
+        return len(self._snapshot)
+    
+    def keys(self) -> KeysView:
+        return self._snapshot.keys()
+    
+    def items(self) -> ItemsView:
+        return self._snapshot.items()
+    
+    def publish_to(self, owner: Any, attribute: str) -> None:
+        """Keep ``owner.<attribute>`` set to the current ``lookup``.
+
+        Saves hot readers the hop through the registry: the factory's
+        ``create()`` reads its own class attribute.
+        """
+        with _write_lock:
+            self._published = (owner, attribute)
+            setattr(owner, attribute, self.lookup)
+    
+    # ---- serialized writes ----
+    
+    def register(self, provider_type: str, vps_class: Any) -> None:
+        with _write_lock:
+            self._local[provider_type] = vps_class
+            self._rebuild()
+    
+    def unregister(self, provider_type: str) -> bool:
+        """Drop a provider registered here (a parent's one stays visible)."""
+        with _write_lock:
+            if provider_type not in self._local:
+                return False
+            del self._local[provider_type]
+            self._rebuild()
+            return True
+    
+    def replace(self, provider_type: str, expected: Any, vps_class: Any) -> bool:
+        """Swap in ``vps_class`` where the entry still is ``expected``.
+
+        The swap happens in the registry (this one or an ancestor) the
+        entry was registered in, so every registry sharing it benefits.
+        """
+        with _write_lock:
+            owner = self
+            while owner is not None and owner._local.get(provider_type) is not expected:
+                owner = owner._parent
+            if owner is None:
+                return False
+            owner._local[provider_type] = vps_class
+            owner._rebuild()
+            return True
+    
+    def __repr__(self) -> str:
+        return f"<ProviderRegistry {list(self._snapshot)}>"
+
+
+class RegistryView:
+    """Class attribute exposing the owning factory's registry (``_creators``).
+
+    Also publishes the registry's ``lookup`` on the owner as ``_lookup``.
+    """
+    
+    def __set_name__(self, owner: type, name: str) -> None:
+        owner._registry.publish_to(owner, "_lookup")
+    
+    def __get__(self, instance: Any, owner: type) -> ProviderRegistry:
+        return owner._registry
@@ -0,0 +1,109 @@
+"""Admission filters for the bounded Cache singleton.
+
+An eviction policy picks *which* key to drop when the cache is full; an
+admission filter decides whether a new key is worth dropping it for.
+``TinyLFU`` keeps approximate access frequencies of recently seen keys
+(cached or not) in a count-min sketch and only admits a newcomer that has
+been seen more often than the victim, so one-hit wonders cannot flush
+hot keys out of the cache.
+"""
+
+from typing import Any, Hashable, Optional, Tuple
+
+
+_MASK64 = (1 << 64) - 1
+# Maps every counter byte to half its value in one C-level pass
+_HALVE = bytes(value >> 1 for value in range(256))
+
+
+class CountMinSketch:
+    """Approximate frequency counter in fixed memory.
+
+    Four rows of ``width`` saturating counters (at most ``limit``); the
+    estimate of a key is the smallest of its four counters, so it can only
+    overshoot. Increments are conservative (only the smallest counters
+    grow) and after ``sample_size`` increments every counter is halved,
+    which lets old popularity fade.
+    """
+    
+    def __init__(self, width: int, sample_size: Optional[int] = None, limit: int = 15):
+        if width <= 0:
+            raise ValueError("width must be positive")
+        size = 16
+        while size < width:
+            size *= 2
+        self.width = size
+        self.limit = limit
+        self.sample_size = sample_size or 10 * size
+        self.additions = 0
+        self._mask = size - 1
+        self._table = bytearray(4 * size)
+    
+    def _slots(self, key: Hashable) -> Tuple[int, int, int, int]:
+        # Double hashing: row i uses h1 + i * h2, one multiply per key
+        h1 = hash(key) & _MASK64
+        h2 = (h1 * 0x9E3779B97F4A7C15 & _MASK64) >> 32 | 1
+        mask, width = self._mask, self.width
+        return (h1 & mask,
+                width + ((h1 + h2) & mask),
+                2 * width + ((h1 + 2 * h2) & mask),
+                3 * width + ((h1 + 3 * h2) & mask))
+    
+    def increment(self, key: Hashable) -> None:
+        table = self._table
+        a, b, c, d = self._slots(key)
+        smallest = min(table[a], table[b], table[c], table[d])
+        if smallest >= self.limit:
+            return
+        for slot in (a, b, c, d):
+            if table[slot] == smallest:
+                table[slot] = smallest + 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.age()
+    
+    def estimate(self, key: Hashable) -> int:
+        table = self._table
+        a, b, c, d = self._slots(key)
+        return min(table[a], table[b], table[c], table[d])
+    
+    def age(self) -> None:
+        """Halve every counter."""
+        self._table = bytearray(self._table.translate(_HALVE))
+        self.additions //= 2
+    
+    def clear(self) -> None:
+        self._table = bytearray(len(self._table))
+        self.additions = 0
+
+
+class TinyLFU:
+    """Frequency-based admission: a newcomer must beat the eviction victim.
+
+    Every access of a key, hit or miss, is ``record``-ed. When the cache is
+    full, ``admit(candidate, victim)`` lets the new key in only if its
+    estimated frequency is higher than the victim's.
+    """
+    
+    def __init__(self, capacity: int, sample_factor: int = 10):
+        self.sketch = CountMinSketch(capacity, sample_size=sample_factor * max(capacity, 16))
+    
+    def record(self, key: Hashable) -> None:
+        self.sketch.increment(key)
+    
+    def admit(self, candidate: Hashable, victim: Hashable) -> bool:
+        return self.sketch.estimate(candidate) > self.sketch.estimate(victim)
+    
+    def clear(self) -> None:
+        self.sketch.clear()
+
+
+def create_admission(admission: Any, capacity: Optional[int]) -> Any:
+    """Admission filter from a name (``"tinylfu"``) or a ready instance."""
+    if not isinstance(admission, str):
+        return admission
+    if admission != "tinylfu":
+        raise ValueError(f"Unknown admission filter: {admission}")
+    if capacity is None:
+        raise ValueError("tinylfu admission needs a capacity to size its sketch")
+    return TinyLFU(capacity)
@@ -1,88 +1,899 @@
 """Singleton - AFTER: With pattern (single instance)."""
 
-from threading import Lock
-from typing import Optional
+import asyncio
+import inspect
+import os
+import sys
+import time
+from collections import OrderedDict, deque
+from threading import Lock, RLock
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, TextIO
+from weakref import WeakKeyDictionary, WeakSet, WeakValueDictionary
 
+from .async_db import FakeDatabaseServer, Pipeline, QueryBatcher
+from .caching import _MISSING, BoundedCache, ShardedCache
+from .compact import CompactCache
+from .cursor import ResultCursor
+from .loading import AsyncSingleFlight, SingleFlight, WriteBehindBuffer
+from .log_buffer import BufferedLogWriter
+from .log_store import LogRecord, SegmentedLogStore
+from .snapshot import PeriodicSnapshot, SnapshotReader, write_snapshot
+from .stats import CacheStats
+from .statements import StatementCache
 
-class Singleton:
-    """Base Singleton metaclass for thread-safe implementation."""
+
+FORK_POLICIES = ("reset", "recreate", "keep")
+
+
+class SingletonMeta(type):
+    """Metaclass behind Singleton: serves cached instances from ``__call__``.
+
+    A repeat call is one attribute check and a return; ``__new__`` and
+    ``__init__`` run exactly once per instance, under a per-class lock.
+    """
     _instances = {}
-    _lock = Lock()
+    _classes = WeakSet()
+    _forking = []
+    
+    def __init__(cls, name, bases, namespace, **kwargs):
+        super().__init__(name, bases, namespace, **kwargs)
+        # Own attributes on every class, so a subclass never sees its parent's
+        cls._instance = None
+        cls._lock = RLock()
+        cls._init_args = {}
+        SingletonMeta._classes.add(cls)
+    
+    def __call__(cls, *args, **kwargs):
+        instance = cls._instance
+        if instance is not None:
+            return instance
+        if cls._keyed:
+            return cls._keyed_instance(args, kwargs)
+        with cls._lock:
+            if cls._instance is None:
+                instance = super().__call__(*args, **kwargs)
+                if cls._fork_policy == "recreate":
+                    cls._init_args[None] = (args, kwargs)
+                SingletonMeta._instances[cls] = instance
+                cls._instance = instance
+                if cls._direct:
+                    cls.instance = instance
+        return cls._instance
+    
+    def _keyed_instance(cls, args, kwargs):
+        key = cls._instance_key(*args, **kwargs)
+        registry = cls._registry
+        instance = registry.get(key)
+        if instance is not None:
+            if cls._max_instances:
+                try:
+                    registry.move_to_end(key)
+                except KeyError:
+                    pass  # evicted concurrently; the caller still gets it
+            return instance
+        with cls._lock:
+            instance = registry.get(key)
+            if instance is None:
+                instance = super().__call__(*args, **kwargs)
+                registry[key] = instance
+                if cls._fork_policy == "recreate":
+                    cls._init_args[key] = (args, kwargs)
+                if cls._max_instances and len(registry) > cls._max_instances:
+                    evicted, _ = registry.popitem(last=False)
+                    cls._init_args.pop(evicted, None)
+        return instance
+    
+    # ---- fork handling ----
     
-    def __new__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            with cls._lock:
-                if cls not in cls._instances:
-                    instance = super().__new__(cls)
-                    cls._instances[cls] = instance
-        return cls._instances[cls]
+    def _live_instances(cls) -> list:
+        if cls._keyed:
+            return list(cls._registry.values())
+        return [cls._instance] if cls._instance is not None else []
+    
+    def _reset_after_fork(cls) -> None:
+        """Child side of a fork: fresh lock, then apply ``_fork_policy``."""
+        cls._lock = RLock()
+        for instance in cls._live_instances():
+            hook = getattr(instance, "_after_fork_child", None)
+            if hook is not None:
+                hook()
+        if cls._fork_policy == "keep":
+            return
+        if cls._keyed:
+            keys = list(cls._registry.keys())
+            cls._registry.clear()
+        else:
+            keys = [None] if cls._instance is not None else []
+            cls._instance = None
+            SingletonMeta._instances.pop(cls, None)
+            if cls._direct:
+                cls.instance = None
+        init_args, cls._init_args = cls._init_args, {}
+        if cls._fork_policy == "recreate":
+            for key in keys:
+                if key in init_args:
+                    args, kwargs = init_args[key]
+                    cls(*args, **kwargs)
+
+
+def _before_fork() -> None:
+    # Instances quiesce (take their locks, flush buffers) so the child
+    # starts from a consistent copy and never re-emits the parent's output
+    SingletonMeta._forking = [
+        instance for cls in list(SingletonMeta._classes)
+        for instance in cls._live_instances()
+    ]
+    for instance in SingletonMeta._forking:
+        hook = getattr(instance, "_before_fork", None)
+        if hook is not None:
+            hook()
+
+
+def _after_fork_in_parent() -> None:
+    for instance in reversed(SingletonMeta._forking):
+        hook = getattr(instance, "_after_fork_parent", None)
+        if hook is not None:
+            hook()
+    SingletonMeta._forking = []
+
+
+def _after_fork_in_child() -> None:
+    SingletonMeta._forking = []
+    for cls in list(SingletonMeta._classes):
+        cls._reset_after_fork()
 
 
-class DatabaseConnection(Singleton):
-    """Database connection WITH Singleton pattern."""
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=_before_fork,
+                        after_in_parent=_after_fork_in_parent,
+                        after_in_child=_after_fork_in_child)
+
+
+class Singleton(metaclass=SingletonMeta):
+    """Base class for thread-safe singletons (see ``SingletonMeta``).
+
+    ``Foo()`` creates the instance on first use and afterwards returns it
+    straight from the metaclass, without re-running ``__init__``. With
+    ``class Foo(Singleton, direct=True)`` the instance is also published as
+    ``Foo.instance`` once created, which costs no more than a global lookup.
+
+    ``class Foo(Singleton, keyed=True)`` switches a class to keyed-instance
+    (multiton) mode: one instance per distinct constructor key, as computed
+    by ``_instance_key(*args, **kwargs)``. Hits are served without taking
+    the lock. Instances are held strongly, like the plain singleton's, until
+    the process ends; pass ``max_instances`` to keep only the most recently
+    used keys (LRU eviction beyond the cap), or ``weak=True`` to drop an
+    instance as soon as nobody references it any more.
+
+    ``fork_policy`` decides what a child process created by ``os.fork`` (or
+    a fork-based process pool) gets for the class:
+
+    * ``"reset"`` (default) - instances are dropped and the next call
+      constructs a new one in the child;
+    * ``"recreate"`` - instances are constructed again right away, with the
+      arguments they were first created with;
+    * ``"keep"`` - the parent's instances stay in place.
+
+    Every class gets a fresh lock in the child. Instances may define
+    ``_before_fork``, ``_after_fork_parent`` and ``_after_fork_child`` to
+    quiesce their own locks, buffers and threads around the fork; the child
+    hook runs whatever the policy, since code in the child may still hold a
+    reference to a dropped instance.
+    """
+    _keyed = False
+    _direct = False
+    _fork_policy = "reset"
     
-    def __init__(self, host: str, port: int, database: str):
-        # Prevent re-initialization
-        if hasattr(self, 'host'):
-            return
-        
+    def __init_subclass__(cls, keyed: Optional[bool] = None,
+                          max_instances: Optional[int] = None,
+                          weak: Optional[bool] = None,
+                          direct: Optional[bool] = None,
+                          fork_policy: Optional[str] = None, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if fork_policy is not None:
+            if fork_policy not in FORK_POLICIES:
+                raise ValueError(f"Unknown fork policy: {fork_policy}")
+            cls._fork_policy = fork_policy
+        if keyed is None:
+            # Subclasses of a keyed class are keyed too, with their own registry
+            keyed = cls._keyed
+            max_instances = max_instances or getattr(cls, '_max_instances', None)
+            if weak is None:
+                weak = getattr(cls, '_weak', False)
+        if direct is None:
+            direct = cls._direct
+        cls._keyed = keyed
+        cls._direct = direct and not keyed
+        if cls._direct:
+            cls.instance = None
+        if keyed:
+            cls._max_instances = max_instances
+            cls._weak = bool(weak) and not max_instances
+            if max_instances:
+                cls._registry = OrderedDict()
+            elif cls._weak:
+                cls._registry = WeakValueDictionary()
+            else:
+                cls._registry = {}
+    
+    @classmethod
+    def _instance_key(cls, *args, **kwargs) -> Hashable:
+        """Key identifying the keyed instance a constructor call refers to."""
+        return args + tuple(sorted(kwargs.items()))
+
+
+class DatabaseConnection(Singleton, keyed=True, fork_policy="reset"):
+    """Database connection WITH Singleton pattern.
+
+    Keyed by ``(host, port, database)``: asking for the same database
+    returns the same connection object, a different database gets its own.
+    A forked child never shares the parent's connection: it opens its own.
+
+    ``server`` (e.g. a ``FakeDatabaseServer``) makes ``execute_query`` a
+    real round trip; like a socket, the connection carries one query at a
+    time.
+
+    ``driver`` is a DB-API connection factory (e.g. ``sqlite_connector``)
+    opened by ``connect()``. ``execute(sql, params)`` runs parameterized
+    queries through a per-connection LRU of prepared statements keyed by
+    normalized SQL, each run on a driver cursor of its own; its hit/miss
+    counters live on ``statements``.
+    ``cursor(sql, params)`` streams large results instead of returning them.
+    """
+    
+    def __init__(self, host: str, port: int, database: str,
+                 server: Optional[FakeDatabaseServer] = None,
+                 driver: Optional[Callable[[], Any]] = None,
+                 statement_cache_size: int = 128):
         self.host = host
         self.port = port
         self.database = database
         self.is_connected = False
-        print(f"Creating SINGLE database connection")
+        self._server = server
+        self._driver = driver
+        self._db = None
+        self._wire = Lock()
+        self.statements = StatementCache(statement_cache_size)
+        print(f"Creating SINGLE database connection to {host}:{port}/{database}")
+    
+    @classmethod
+    def _instance_key(cls, host: str, port: int, database: str,
+                      *args, **kwargs) -> Hashable:
+        # Other options only apply when the connection is first created
+        return (host, port, database)
     
     def connect(self):
+        if self._driver is not None and self._db is None:
+            self._db = self._driver()
         self.is_connected = True
         return f"Connected to {self.host}:{self.port}/{self.database}"
     
+    def close(self):
+        with self._wire:
+            if self._db is not None:
+                self.statements.release()
+                self._db.close()
+                self._db = None
+            self.is_connected = False
+    
     def execute_query(self, query: str):
         if not self.is_connected:
             return "Error: Not connected"
-        return f"Executing: {query}"
+        if self._server is None:
+            return f"Executing: {query}"
+        with self._wire:
+            return self._server.query(query)
+    
+    def execute(self, sql: str, params=()):
+        """Run a parameterized query; returns the result rows.
+
+        Without a ``driver`` the query is only echoed, like ``execute_query``.
+        """
+        if not self.is_connected:
+            return "Error: Not connected"
+        with self._wire:
+            statement = self.statements.get(sql)
+            statement.executions += 1
+            if self._db is None:
+                return f"Executing: {statement.sql} {tuple(params)}"
+            if statement.handle is None:
+                statement.handle = self._db.cursor()
+            return statement.handle.execute(statement.sql, params).fetchall()
+    
+    def cursor(self, sql: str, params=(), arraysize: int = 1000) -> ResultCursor:
+        """Run a query and stream its rows ``arraysize`` at a time."""
+        if not self.is_connected or self._db is None:
+            raise RuntimeError("cursor() needs a connection opened through a driver")
+        with self._wire:
+            statement = self.statements.get(sql)
+            statement.executions += 1
+            cursor = self._db.execute(statement.sql, params)
+        return ResultCursor(cursor, self._wire, arraysize)
+    
+    def _after_fork_child(self):
+        # A parent thread may have been mid-query at fork time, and the
+        # driver connection belongs to the parent: a child must reconnect
+        self._wire = Lock()
+        if self._db is not None:
+            self.statements.release(close=False)
+            self._db = None
+            self.is_connected = False
     
     @classmethod
     def get_instance(cls, host: str = "localhost", 
                      port: int = 5432, 
                      database: str = "myapp") -> 'DatabaseConnection':
-        """Get or create the single instance."""
+        """Get or create the instance for these connection parameters."""
         return cls(host, port, database)
 
 
-class Logger(Singleton):
-    """Logger service - another example of Singleton."""
+class AsyncDatabaseConnection(DatabaseConnection):
+    """asyncio flavour of DatabaseConnection with pipelined execution.
+
+    ``await conn.aexecute(sql, params)`` is cheap to call from many
+    coroutines at once: queries issued in the same event loop iteration are
+    coalesced into one round trip of up to ``max_batch`` queries, and at
+    most ``max_in_flight`` batches are sent concurrently. ``aexecute_many``
+    and ``pipeline()`` send a known group of queries together. Every query
+    goes through the same prepared-statement cache as ``execute``.
+
+    Without ``server`` a ``FakeDatabaseServer`` with default latency is
+    used. Keyed like DatabaseConnection, with a registry of its own. The
+    blocking ``execute_query`` still works; ``execute`` and ``cursor``,
+    which need a driver connection, raise ``TypeError``.
+    """
     
-    def __init__(self):
-        if hasattr(self, 'logs'):
-            return
-        self.logs = []
+    def __init__(self, host: str, port: int, database: str,
+                 server: Optional[FakeDatabaseServer] = None,
+                 max_batch: int = 128, max_in_flight: int = 8,
+                 statement_cache_size: int = 128):
+        super().__init__(host, port, database, server or FakeDatabaseServer(),
+                         statement_cache_size=statement_cache_size)
+        self.max_batch = max_batch
+        self.max_in_flight = max_in_flight
+        self._batchers = WeakKeyDictionary()
+    
+    def _submit(self, sql: str, params=()) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        if not self.is_connected:
+            future = loop.create_future()
+            future.set_result("Error: Not connected")
+            return future
+        statement = self.statements.get(sql)
+        statement.executions += 1
+        # The fake server has no parameter binding: it gets the text sync execute() echoes
+        query = f"{statement.sql} {tuple(params)}" if params else statement.sql
+        batcher = self._batchers.get(loop)
+        if batcher is None:
+            batcher = self._batchers[loop] = QueryBatcher(
+                self._server.query_batch, self.max_batch, self.max_in_flight)
+        return batcher.submit(query)
+    
+    async def aexecute(self, sql: str, params=()):
+        """Run a parameterized query in the next batched round trip."""
+        return await self._submit(sql, params)
+    
+    async def aexecute_many(self, queries: List[str]) -> List[Any]:
+        """Run ``queries`` as one pipeline; results come back in order."""
+        return list(await asyncio.gather(*[self._submit(query) for query in queries]))
+    
+    def execute(self, sql: str, params=()):
+        raise TypeError("AsyncDatabaseConnection has no driver: use 'await aexecute()'")
+    
+    def cursor(self, sql: str, params=(), arraysize: int = 1000) -> ResultCursor:
+        raise TypeError("AsyncDatabaseConnection has no driver to stream a cursor from")
+    
+    def pipeline(self) -> Pipeline:
+        """``async with conn.pipeline() as pipe:`` - queue now, send together."""
+        return Pipeline(self._submit)
+
+
+DEBUG, INFO, WARNING, ERROR, CRITICAL = 10, 20, 30, 40, 50
+
+LEVEL_NAMES = {
+    DEBUG: "DEBUG",
+    INFO: "INFO",
+    WARNING: "WARNING",
+    ERROR: "ERROR",
+    CRITICAL: "CRITICAL",
+}
+
+
+class Logger(Singleton, fork_policy="keep"):
+    """Logger service - another example of Singleton.
+
+    By default every message is printed immediately. With ``buffered=True``
+    ``log()`` only queues the line in a bounded ring buffer and a background
+    thread writes it to ``stream`` in batches; ``overflow`` picks what
+    happens when the buffer is full ("block", "drop-oldest", "drop-newest").
+    ``history`` caps how many messages ``get_logs()`` keeps (unlimited in
+    direct mode and none in buffered or store mode unless given).
+
+    ``store`` names a directory where every record is also persisted to
+    rotating binary segments; ``query()`` then streams matching records
+    back from disk instead of keeping them all in memory.
+
+    ``log(level, fmt, *args)`` drops records below ``level`` with a single
+    integer comparison and only runs ``fmt % args`` for records that are
+    emitted. ``log(message)`` keeps working and logs at INFO.
+
+    A forked child keeps the logger: it restarts the background writer
+    without the parent's queued lines and persists to segments of its own.
+    """
+    
+    def __init__(self, buffered: bool = False,
+                 stream: Optional[TextIO] = None,
+                 capacity: int = 8192,
+                 overflow: str = "block",
+                 flush_interval: float = 0.5,
+                 history: Optional[int] = None,
+                 level: int = DEBUG,
+                 store: Optional[str] = None,
+                 segment_bytes: int = 64 * 1024 * 1024):
+        self.level = level
+        self._stream = stream
+        self._writer = None
+        self._store = SegmentedLogStore(store, segment_bytes) if store else None
+        if buffered:
+            self._writer = BufferedLogWriter(stream, capacity, overflow, flush_interval)
+        if history is not None:
+            self.logs = deque(maxlen=history)
+        elif buffered or store:
+            self.logs = deque(maxlen=0)
+        else:
+            self.logs = []
         print("Creating SINGLE logger instance")
     
-    def log(self, message: str):
+    def log(self, level, fmt: Optional[str] = None, *args):
+        if fmt is None:
+            # Legacy form: log(message), at INFO
+            if INFO >= self.level:
+                self._emit(INFO, level, "LOG")
+        elif level >= self.level:
+            self._emit(level, fmt % args if args else fmt)
+    
+    def debug(self, fmt: str, *args):
+        if DEBUG >= self.level:
+            self._emit(DEBUG, fmt % args if args else fmt)
+    
+    def info(self, fmt: str, *args):
+        if INFO >= self.level:
+            self._emit(INFO, fmt % args if args else fmt)
+    
+    def warning(self, fmt: str, *args):
+        if WARNING >= self.level:
+            self._emit(WARNING, fmt % args if args else fmt)
+    
+    def error(self, fmt: str, *args):
+        if ERROR >= self.level:
+            self._emit(ERROR, fmt % args if args else fmt)
+    
+    def is_enabled_for(self, level: int) -> bool:
+        """Guard for callers that must do expensive work to build ``args``."""
+        return level >= self.level
+    
+    def set_level(self, level: int):
+        self.level = level
+    
+    def child(self, name: str, level: Optional[int] = None) -> 'LogChannel':
+        """Named view of this logger with its own threshold."""
+        return LogChannel(self, name, level)
+    
+    def _emit(self, level: int, message: str, label: Optional[str] = None):
+        if label is None:
+            label = LEVEL_NAMES.get(level, str(level))
         self.logs.append(message)
-        print(f"[LOG] {message}")
+        if self._store is not None:
+            self._store.append(message, level)
+        if self._writer is not None:
+            self._writer.submit(f"[{label}] {message}\n")
+        else:
+            print(f"[{label}] {message}", file=self._stream)
     
     def get_logs(self):
-        return self.logs
+        return list(self.logs)
+    
+    def query(self, start: Optional[float] = None, end: Optional[float] = None,
+              level: Optional[int] = None,
+              contains: Optional[str] = None) -> Iterator[LogRecord]:
+        """Stream persisted records by time range, minimum level and substring."""
+        if self._store is None:
+            raise RuntimeError("Logger was created without a store directory")
+        return self._store.query(start, end, level, contains)
+    
+    def flush(self):
+        """Block until every buffered message has been written."""
+        if self._writer is not None:
+            self._writer.flush()
+        if self._store is not None:
+            self._store.flush()
+    
+    def close(self):
+        """Stop the background writer after flushing it."""
+        if self._writer is not None:
+            self._writer.close()
+        if self._store is not None:
+            self._store.close()
+    
+    def _before_fork(self):
+        if self._writer is not None:
+            self._writer._before_fork()
+        if self._store is not None:
+            self._store._before_fork()
+    
+    def _after_fork_parent(self):
+        if self._store is not None:
+            self._store._after_fork_parent()
+        if self._writer is not None:
+            self._writer._after_fork_parent()
+    
+    def _after_fork_child(self):
+        if self._writer is not None:
+            self._writer._after_fork_child()
+        if self._store is not None:
+            self._store._after_fork_child()
 
 
-class Cache(Singleton):
-    """Cache service - another example of Singleton."""
+class LogChannel:
+    """Per-component logger: own name and threshold, shared Logger output.
+
+    A record must pass both the channel threshold and the Logger's.
+    """
     
-    def __init__(self):
-        if hasattr(self, 'data'):
-            return
-        self.data = {}
+    def __init__(self, logger: Logger, name: str, level: Optional[int] = None):
+        self.logger = logger
+        self.name = name
+        self.level = level if level is not None else logger.level
+    
+    def log(self, level: int, fmt: str, *args):
+        if level >= self.level and level >= self.logger.level:
+            message = fmt % args if args else fmt
+            self.logger._emit(level, f"{self.name}: {message}")
+    
+    def debug(self, fmt: str, *args):
+        self.log(DEBUG, fmt, *args)
+    
+    def info(self, fmt: str, *args):
+        self.log(INFO, fmt, *args)
+    
+    def warning(self, fmt: str, *args):
+        self.log(WARNING, fmt, *args)
+    
+    def error(self, fmt: str, *args):
+        self.log(ERROR, fmt, *args)
+    
+    def is_enabled_for(self, level: int) -> bool:
+        return level >= self.level and level >= self.logger.level
+    
+    def set_level(self, level: int):
+        self.level = level
+
+
+class Cache(Singleton, fork_policy="keep"):
+    """Cache service - another example of Singleton.
+
+    The first construction decides the limits: ``capacity`` (entries) and/or
+    ``max_bytes`` bound the cache, ``policy`` picks LRU or LFU eviction and
+    ``ttl`` expires entries. Without limits it behaves like a plain dict.
+    ``admission="tinylfu"`` puts a frequency-sketch admission filter in
+    front of eviction, so keys seen only once cannot push out hot ones.
+    ``storage="compact"`` keeps entries in a ``CompactCache`` instead:
+    ``str``/``bytes`` keys and ``int``/``float``/``str``/``bytes`` values
+    packed into flat arrays, several times smaller per entry when there are
+    millions of them. Only ``capacity`` (CLOCK eviction) applies there;
+    ``max_bytes``, ``policy``, ``ttl``, ``shards`` or ``admission`` raise
+    ``ValueError``.
+
+    ``stats=True`` counts hits and misses (also per key prefix) and times
+    loads; ``stats()`` reports them together with evictions.
+
+    Access is thread-safe: entries are spread over ``shards`` lock-striped
+    segments, so raise ``shards`` when many worker threads share the cache.
+
+    Passing ``write_behind`` (a bulk writer taking a ``{key: value}`` dict)
+    mirrors every write - ``set``, ``get_or_set``, ``incr`` and a successful
+    ``compare_and_set`` - to a backing store in batches; ``delete`` cancels
+    the key's pending write.
+
+    ``backend`` replaces the in-process storage with any object offering
+    the same operations, e.g. a ``SharedMemoryCache`` shared by all worker
+    processes of a pre-fork server; the sizing arguments are then ignored.
+
+    ``snapshot(path)`` saves the entries to a compact binary file and
+    ``restore(path)`` warm-starts from one: the file is memory-mapped and
+    entries move into the cache as they are first asked for. With
+    ``snapshot_path`` and ``snapshot_interval`` a background thread
+    snapshots periodically (and once more at exit); writers are only held
+    up while their own segment is copied.
+
+    A forked child keeps the cached entries (copy-on-write) with fresh
+    locks; loads in flight, unwritten write-behind entries and periodic
+    snapshots stay with the parent.
+    """
+    
+    def __init__(self, capacity: Optional[int] = None,
+                 max_bytes: Optional[int] = None,
+                 policy: str = "lru",
+                 ttl: Optional[float] = None,
+                 sweep_interval: Optional[float] = None,
+                 shards: int = 1,
+                 write_behind: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 write_batch_size: int = 500,
+                 write_interval: float = 1.0,
+                 backend: Optional[Any] = None,
+                 snapshot_path: Optional[str] = None,
+                 snapshot_interval: Optional[float] = None,
+                 admission: Optional[Any] = None,
+                 stats: bool = False,
+                 storage: str = "dict"):
+        if storage not in ("dict", "compact"):
+            raise ValueError(f"Unknown storage: {storage}")
+        if backend is not None:
+            self._store = backend
+        elif storage == "compact":
+            unsupported = [name for name, given in (
+                ("max_bytes", max_bytes is not None), ("policy", policy != "lru"),
+                ("ttl", ttl is not None), ("sweep_interval", sweep_interval is not None),
+                ("shards", shards != 1), ("admission", admission is not None)) if given]
+            if unsupported:
+                raise ValueError(f"storage='compact' does not support {', '.join(unsupported)}")
+            self._store = CompactCache(capacity)
+        else:
+            self._store = ShardedCache(shards, capacity, max_bytes, policy=policy,
+                                       ttl=ttl, sweep_interval=sweep_interval,
+                                       admission=admission)
+        self._stats = CacheStats() if stats else None
+        self._loads = SingleFlight()
+        self._async_loads = AsyncSingleFlight()
+        self._write_behind = None
+        if write_behind is not None:
+            self._write_behind = WriteBehindBuffer(write_behind, write_batch_size,
+                                                   write_interval)
+        self._snapshot: Optional[SnapshotReader] = None
+        self._snapshots = None
+        if snapshot_path is not None and snapshot_interval is not None:
+            self._snapshots = PeriodicSnapshot(lambda: self.snapshot(snapshot_path),
+                                               snapshot_interval)
         print("Creating SINGLE cache instance")
     
     def set(self, key: str, value):
-        self.data[key] = value
+        if self._snapshot is not None:
+            self._discard_restored(key)
+        self._store.set(key, value)
+        if self._write_behind is not None:
+            self._write_behind.put(key, value)
+    
+    def get(self, key: str, default=None):
+        value = self._store.get(key, _MISSING)
+        if value is _MISSING and self._snapshot is not None:
+            value = self._take_restored(key)
+        if self._stats is not None:
+            self._record_lookup(key, value)
+        return default if value is _MISSING else value
+    
+    def _lookup(self, key: str, peek: bool = False):
+        # ``peek`` re-checks a key without counting another access
+        get = getattr(self._store, "peek", self._store.get) if peek else self._store.get
+        value = get(key, _MISSING)
+        if value is _MISSING and self._snapshot is not None:
+            value = self._take_restored(key)
+        return value
+    
+    def get_or_load(self, key: str, loader: Callable[[str], Any]):
+        """Read-through get: on a miss, ``loader(key)`` runs once per key.
+
+        Concurrent callers missing the same key wait for that single load
+        instead of stampeding the backend.
+        """
+        value = self._lookup(key)
+        if self._stats is not None:
+            self._record_lookup(key, value)
+        if value is not _MISSING:
+            return value
+        return self._loads.do(key, lambda: self._load(key, loader))
+    
+    async def aget_or_load(self, key: str, loader: Callable[[str], Any]):
+        """Async ``get_or_load``; ``loader`` may return a value or an awaitable."""
+        value = self._lookup(key)
+        if self._stats is not None:
+            self._record_lookup(key, value)
+        if value is not _MISSING:
+            return value
+        return await self._async_loads.do(key, lambda: self._aload(key, loader))
+    
+    def _load(self, key: str, loader: Callable[[str], Any]):
+        # Another flight may have filled the key between our miss and now.
+        # Loaded values come from the backing store, so skip write-behind.
+        value = self._lookup(key, peek=True)
+        if value is _MISSING:
+            started = time.perf_counter()
+            try:
+                value = loader(key)
+            finally:
+                if self._stats is not None:
+                    self._record_load(started)
+            self._store.set(key, value)
+        return value
+    
+    async def _aload(self, key: str, loader: Callable[[str], Any]):
+        value = self._lookup(key, peek=True)
+        if value is _MISSING:
+            started = time.perf_counter()
+            try:
+                value = loader(key)
+                if inspect.isawaitable(value):
+                    value = await value
+            finally:
+                if self._stats is not None:
+                    self._record_load(started)
+            self._store.set(key, value)
+        return value
+    
+    def _record_lookup(self, key: str, value) -> None:
+        if value is _MISSING:
+            self._stats.miss(key)
+        else:
+            self._stats.hit(key)
+    
+    def _record_load(self, started: float) -> None:
+        # Called from a finally block: a pending exception means the load failed
+        failed = sys.exc_info()[0] is not None
+        self._stats.load(time.perf_counter() - started, failed)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/load counters, per-prefix breakdown and evictions."""
+        if self._stats is None:
+            raise RuntimeError("Cache was created without stats=True")
+        report = self._stats.as_dict()
+        report["evictions"] = getattr(self._store, "evictions", 0)
+        report["rejections"] = getattr(self._store, "rejections", 0)
+        report["size"] = len(self)
+        return report
+    
+    def flush(self) -> int:
+        """Push pending write-behind entries to the backing store now."""
+        if self._write_behind is None:
+            return 0
+        return self._write_behind.flush()
+    
+    def delete(self, key: str) -> bool:
+        restored = self._snapshot is not None and self._discard_restored(key)
+        if self._write_behind is not None:
+            self._write_behind.discard(key)
+        return self._store.delete(key) or restored
+    
+    def get_or_set(self, key: str, value):
+        """Atomically return the cached value or store ``value``."""
+        if self._snapshot is not None:
+            self._take_restored(key)
+        result = self._store.get_or_set(key, value)
+        if self._write_behind is not None and result is value:
+            self._write_behind.put(key, value)
+        return result
     
-    def get(self, key: str):
-        return self.data.get(key)
+    def incr(self, key: str, delta: int = 1, initial: int = 0) -> int:
+        """Atomically increment a counter entry."""
+        if self._snapshot is not None:
+            self._take_restored(key)
+        result = self._store.incr(key, delta, initial)
+        if self._write_behind is not None:
+            self._write_behind.put(key, result)
+        return result
+    
+    def compare_and_set(self, key: str, expected, value) -> bool:
+        """Atomically replace the value if it still equals ``expected``."""
+        if self._snapshot is not None:
+            self._take_restored(key)
+        replaced = self._store.compare_and_set(key, expected, value)
+        if self._write_behind is not None and replaced:
+            self._write_behind.put(key, value)
+        return replaced
+    
+    # ---- snapshots ----
+    
+    def snapshot(self, path: str) -> int:
+        """Write every entry to ``path``; returns how many were written."""
+        items = getattr(self._store, "items", None)
+        if items is None:
+            raise TypeError(f"{type(self._store).__name__} backend does not support snapshots")
+        entries = items()
+        restored = self._snapshot
+        if restored is not None:
+            entries.extend(restored.items())
+        return write_snapshot(path, entries)
+    
+    def restore(self, path: str, lazy: bool = True) -> int:
+        """Replace the contents with the snapshot at ``path``.
+
+        Lazily, the snapshot stays memory-mapped and each entry is decoded
+        when first requested; ``lazy=False`` loads everything now.
+        Returns the number of entries restored.
+        """
+        reader = SnapshotReader(path)
+        self.clear()
+        if lazy:
+            if reader.remaining:
+                self._snapshot = reader
+            else:
+                reader.close()
+            return reader.entries
+        try:
+            for key, value in reader.items():
+                self._store.set(key, value)
+        finally:
+            reader.close()
+        return reader.entries
+    
+    def _take_restored(self, key: str):
+        """Move ``key`` from the restored snapshot into the live store."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return _MISSING
+        value = snapshot.take(key)
+        if not snapshot.remaining:
+            self._drop_restored(snapshot)
+        if value is _MISSING:
+            return value
+        # A concurrent set wins over the snapshot's older value
+        return self._store.get_or_set(key, value)
+    
+    def _discard_restored(self, key: str) -> bool:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return False
+        discarded = snapshot.discard(key)
+        if not snapshot.remaining:
+            self._drop_restored(snapshot)
+        return discarded
+    
+    def _drop_restored(self, snapshot: SnapshotReader) -> None:
+        """Forget a used-up or superseded snapshot and unmap its file."""
+        if self._snapshot is snapshot:
+            self._snapshot = None
+        snapshot.close()
+    
+    def sweep(self) -> int:
+        """Remove expired entries now instead of waiting for the next sweep."""
+        return self._store.sweep()
     
     def clear(self):
-        self.data.clear()
+        snapshot = self._snapshot
+        if snapshot is not None:
+            self._drop_restored(snapshot)
+        self._store.clear()
+    
+    def __len__(self) -> int:
+        snapshot = self._snapshot
+        return len(self._store) + (snapshot.remaining if snapshot is not None else 0)
+    
+    def __contains__(self, key: str) -> bool:
+        if key in self._store:
+            return True
+        snapshot = self._snapshot
+        return snapshot is not None and key in snapshot
+    
+    def _before_fork(self):
+        hook = getattr(self._store, "_before_fork", None)
+        if hook is not None:
+            hook()
+    
+    def _after_fork_parent(self):
+        hook = getattr(self._store, "_after_fork_parent", None)
+        if hook is not None:
+            hook()
+    
+    def _after_fork_child(self):
+        hook = getattr(self._store, "_after_fork_child", None)
+        if hook is not None:
+            hook()
+        self._loads = SingleFlight()
+        self._async_loads = AsyncSingleFlight()
+        if self._write_behind is not None:
+            self._write_behind._after_fork_child()
+        if self._snapshot is not None:
+            self._snapshot._after_fork_child()
+        if self._snapshots is not None:
+            self._snapshots._after_fork_child()
 
 
 if __name__ == "__main__":
@@ -125,6 +936,14 @@ if __name__ == "__main__":
     cache1.set("user:1", {"name": "Alice", "age": 30})
     print(f"cache2.get('user:1'): {cache2.get('user:1')}")
     
+    # Bounded cache: capacity + eviction policy keep memory in check
+    bounded = BoundedCache(capacity=2, policy="lru")
+    bounded.set("a", 1)
+    bounded.set("b", 2)
+    bounded.get("a")
+    bounded.set("c", 3)
+    print(f"LRU with capacity=2 keeps: {sorted(bounded.data)}  # 'b' evicted")
+    
     print("\n✨ BENEFITS:")
     print("  ✅ Only one instance exists")
     print("  ✅ Global point of access")
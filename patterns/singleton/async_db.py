@@ -0,0 +1,144 @@
+"""Pipelined, batched query execution for the async DatabaseConnection.
+
+``FakeDatabaseServer`` stands in for a real database: every round trip
+costs a fixed latency, so sending many queries in one batch is what makes
+a connection fast. ``QueryBatcher`` coalesces queries submitted by many
+coroutines into such batches and bounds how many are in flight at once.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, List, Set, Tuple
+
+
+class FakeDatabaseServer:
+    """In-process database stand-in with artificial latency.
+
+    A round trip takes ``latency`` seconds plus ``per_query`` seconds for
+    every query it carries. ``query()`` is the blocking one-query round
+    trip used by the sync API, ``query_batch()`` the async batched one.
+    """
+    
+    def __init__(self, latency: float = 0.001, per_query: float = 0.00001):
+        self.latency = latency
+        self.per_query = per_query
+        self.round_trips = 0
+        self.queries = 0
+    
+    def query(self, sql: str) -> str:
+        time.sleep(self.latency + self.per_query)
+        self.round_trips += 1
+        self.queries += 1
+        return f"Executing: {sql}"
+    
+    async def query_batch(self, queries: List[str]) -> List[str]:
+        await asyncio.sleep(self.latency + self.per_query * len(queries))
+        self.round_trips += 1
+        self.queries += len(queries)
+        return [f"Executing: {sql}" for sql in queries]
+
+
+class QueryBatcher:
+    """Coalesces queries from concurrent coroutines into batched round trips.
+
+    ``submit()`` queues a query and returns a future for its result. The
+    queue is sent once the submitting coroutines yield to the event loop,
+    or as soon as ``max_batch`` queries are waiting. At most
+    ``max_in_flight`` batches are on the wire; while all slots are busy new
+    queries keep collecting into the next batch. A failed round trip fails
+    every query in its batch, a reply with too few results the queries it
+    has no result for.
+
+    A batcher belongs to the event loop it is first used on.
+    """
+    
+    def __init__(self, send_batch: Callable[[List[str]], Awaitable[List[Any]]],
+                 max_batch: int = 128, max_in_flight: int = 8):
+        if max_batch <= 0 or max_in_flight <= 0:
+            raise ValueError("max_batch and max_in_flight must be positive")
+        self._send_batch = send_batch
+        self.max_batch = max_batch
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._scheduled = False
+        self._sender_waiting = False
+        self._senders: Set[asyncio.Task] = set()
+        self.batches = 0
+    
+    def submit(self, sql: str) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((sql, future))
+        if len(self._pending) >= self.max_batch:
+            self._dispatch()
+        elif not self._scheduled:
+            # Let every coroutine that is ready this iteration join the batch
+            self._scheduled = True
+            loop.call_soon(self._dispatch)
+        return future
+    
+    def _dispatch(self) -> None:
+        self._scheduled = False
+        # A sender already waiting for a slot will pick up what is pending
+        if self._pending and not self._sender_waiting:
+            self._sender_waiting = True
+            sender = asyncio.get_running_loop().create_task(self._send_next())
+            self._senders.add(sender)
+            sender.add_done_callback(self._senders.discard)
+    
+    async def _send_next(self) -> None:
+        async with self._slots:
+            self._sender_waiting = False
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+            if self._pending:
+                self._dispatch()
+            if not batch:
+                return
+            try:
+                results = await self._send_batch([sql for sql, _ in batch])
+            except BaseException as error:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                if isinstance(error, asyncio.CancelledError):
+                    raise
+                return
+        self.batches += 1
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+        # A short reply must not leave the remaining queries waiting forever
+        for _, future in batch[len(results):]:
+            if not future.done():
+                future.set_exception(RuntimeError(
+                    f"send_batch returned {len(results)} results for {len(batch)} queries"))
+
+
+class Pipeline:
+    """Explicit pipeline: queue several queries, send them together.
+
+    ``execute()`` returns a future right away; leaving the ``async with``
+    block waits for all of them, and ``results`` lists their values in
+    submission order.
+    """
+    
+    def __init__(self, submit: Callable[..., asyncio.Future]):
+        self._submit = submit
+        self._futures: List[asyncio.Future] = []
+    
+    def execute(self, sql: str, params=()) -> asyncio.Future:
+        future = self._submit(sql, params)
+        self._futures.append(future)
+        return future
+    
+    async def __aenter__(self) -> "Pipeline":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._futures:
+            await asyncio.gather(*self._futures, return_exceptions=exc_type is not None)
+    
+    @property
+    def results(self) -> List[Any]:
+        return [future.result() for future in self._futures]
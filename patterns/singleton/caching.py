@@ -0,0 +1,387 @@
+"""Bounded cache storage used behind the Cache singleton.
+
+``BoundedCache`` is a plain (non-singleton) class so benchmarks and other
+backends can create as many independent caches as they need.
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from .admission import create_admission
+from .eviction import EvictionPolicy, create_policy
+
+
+_MISSING = object()
+
+
+def approximate_size(key: Hashable, value: Any) -> int:
+    """Shallow size estimate of a cache entry in bytes."""
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class BoundedCache:
+    """Dict-backed cache with capacity limits, eviction and TTL expiry.
+
+    * ``capacity`` - maximum number of entries.
+    * ``max_bytes`` - approximate memory budget, measured by ``sizeof``.
+    * ``policy`` - eviction policy name (``"lru"``/``"lfu"``) or instance.
+    * ``ttl`` - seconds an entry stays valid after its last ``set``.
+    * ``admission`` - optional admission filter (``"tinylfu"`` or an
+      instance): when the cache is full, a new key only gets in through
+      ``set`` if the filter prefers it over the eviction victim; refusals
+      are counted in ``rejections``. Every lookup is recorded once, so the
+      usual miss-then-``set`` counts as a single access; ``peek`` and
+      ``set`` record nothing. ``get_or_set``, ``incr`` and
+      ``compare_and_set`` return what they stored, so they always store it.
+
+    Expired entries are dropped lazily on read and by a periodic sweep that
+    runs from ``set`` at most once per ``sweep_interval`` seconds. Because
+    the TTL is the same for every entry, expiry deadlines are ordered by
+    insertion, so a sweep only visits entries that actually expired.
+    """
+    
+    def __init__(self, capacity: Optional[int] = None,
+                 max_bytes: Optional[int] = None,
+                 policy: Any = "lru",
+                 ttl: Optional[float] = None,
+                 sweep_interval: Optional[float] = None,
+                 admission: Any = None,
+                 sizeof: Callable[[Hashable, Any], int] = approximate_size,
+                 clock: Callable[[], float] = time.monotonic):
+        if capacity is not None and capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        
+        self.data: Dict[Hashable, Any] = {}
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.evictions = 0
+        self.rejections = 0
+        self._clock = clock
+        self._sizeof = sizeof
+        self._sizes: Dict[Hashable, int] = {}
+        self._bytes = 0
+        
+        # Unbounded caches skip usage tracking entirely
+        if capacity is None and max_bytes is None:
+            self._policy: Optional[EvictionPolicy] = None
+        elif isinstance(policy, EvictionPolicy):
+            self._policy = policy
+        else:
+            self._policy = create_policy(policy)
+        if admission is not None and self._policy is None:
+            raise ValueError("admission needs a bounded cache (capacity or max_bytes)")
+        self._admission = create_admission(admission, capacity) if admission is not None else None
+        
+        self._expires: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._sweep_interval = sweep_interval if sweep_interval is not None else ttl
+        self._next_sweep = clock() + self._sweep_interval if ttl else 0.0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if self._admission is not None:
+            self._admission.record(key)
+        value = self.data.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        if self.ttl is not None and self._expires[key] <= self._clock():
+            self._remove(key)
+            return default
+        if self._policy is not None:
+            self._policy.access(key)
+        return value
+    
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Like ``get``, but not counted as an access by admission or eviction."""
+        value = self.data.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        if self.ttl is not None and self._expires[key] <= self._clock():
+            return default
+        return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        exists = key in self.data
+        if self._admission is not None and not exists and not self._admit(key, value):
+            self.rejections += 1
+            return
+        self._write(key, value, exists)
+    
+    def _write(self, key: Hashable, value: Any, exists: bool) -> None:
+        """Store an entry that got past admission (or does not need it)."""
+        size = self._sizeof(key, value) if self.max_bytes is not None else 0
+        if not exists and self._policy is not None:
+            # Evict before inserting: under LFU a new key starts with the
+            # lowest count and would otherwise be picked as its own victim
+            while self.data and self._full_for(size):
+                if not self._evict_one():
+                    break
+        self.data[key] = value
+        
+        if self.max_bytes is not None:
+            self._bytes += size - self._sizes.get(key, 0)
+            self._sizes[key] = size
+        
+        if self._policy is not None:
+            if exists:
+                self._policy.access(key)
+            else:
+                self._policy.insert(key)
+        
+        if self.ttl is not None:
+            now = self._clock()
+            self._expires[key] = now + self.ttl
+            self._expires.move_to_end(key)
+            if now >= self._next_sweep:
+                self.sweep(now)
+        
+        if self._policy is not None:
+            self._evict()
+    
+    def get_or_set(self, key: Hashable, value: Any) -> Any:
+        """Return the cached value, storing ``value`` first if the key is absent."""
+        current = self.get(key, _MISSING)
+        if current is _MISSING:
+            self._write(key, value, False)
+            return value
+        return current
+    
+    def incr(self, key: Hashable, delta: int = 1, initial: int = 0) -> int:
+        """Add ``delta`` to a numeric entry (``initial`` if absent) and return it."""
+        current = self.get(key, _MISSING)
+        value = (initial if current is _MISSING else current) + delta
+        self._write(key, value, current is not _MISSING)
+        return value
+    
+    def compare_and_set(self, key: Hashable, expected: Any, value: Any) -> bool:
+        """Store ``value`` only if the current value equals ``expected``.
+
+        An absent or expired key compares as ``None``.
+        """
+        current = self.get(key, _MISSING)
+        if (None if current is _MISSING else current) != expected:
+            return False
+        self._write(key, value, current is not _MISSING)
+        return True
+    
+    def delete(self, key: Hashable) -> bool:
+        if key not in self.data:
+            return False
+        self._remove(key)
+        return True
+    
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Drop every expired entry; returns how many were removed."""
+        if self.ttl is None:
+            return 0
+        if now is None:
+            now = self._clock()
+        removed = 0
+        expires = self._expires
+        while expires:
+            key, deadline = next(iter(expires.items()))
+            if deadline > now:
+                break
+            self._remove(key)
+            removed += 1
+        self._next_sweep = now + self._sweep_interval
+        return removed
+    
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Copy of the live (unexpired) entries."""
+        if self.ttl is None:
+            return list(self.data.items())
+        now = self._clock()
+        expires = self._expires
+        return [(key, value) for key, value in self.data.items() if expires[key] > now]
+    
+    def clear(self) -> None:
+        self.data.clear()
+        self._sizes.clear()
+        self._expires.clear()
+        self._bytes = 0
+        if self._policy is not None:
+            self._policy.clear()
+    
+    @property
+    def size_bytes(self) -> int:
+        """Approximate bytes held (tracked only when ``max_bytes`` is set)."""
+        return self._bytes
+    
+    def __len__(self) -> int:
+        return len(self.data)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        if key not in self.data:
+            return False
+        return self.ttl is None or self._expires[key] > self._clock()
+    
+    def _over_budget(self) -> bool:
+        if self.capacity is not None and len(self.data) > self.capacity:
+            return True
+        return self.max_bytes is not None and self._bytes > self.max_bytes
+    
+    def _full_for(self, size: int) -> bool:
+        """Whether a new entry of ``size`` bytes needs an eviction first."""
+        if self.capacity is not None and len(self.data) >= self.capacity:
+            return True
+        return self.max_bytes is not None and self._bytes + size > self.max_bytes
+    
+    def _admit(self, key: Hashable, value: Any) -> bool:
+        size = self._sizeof(key, value) if self.max_bytes is not None else 0
+        if not self._full_for(size):
+            return True  # room left, nothing has to be evicted
+        victim = self._policy.victim()
+        return victim is None or self._admission.admit(key, victim)
+    
+    def _evict_one(self) -> bool:
+        victim = self._policy.victim()
+        if victim is None:
+            return False
+        self._remove(victim)
+        self.evictions += 1
+        return True
+    
+    def _evict(self) -> None:
+        while self._over_budget() and self._evict_one():
+            pass
+    
+    def _remove(self, key: Hashable) -> None:
+        del self.data[key]
+        if self.max_bytes is not None:
+            self._bytes -= self._sizes.pop(key, 0)
+        if self._policy is not None:
+            self._policy.remove(key)
+        if self.ttl is not None:
+            self._expires.pop(key, None)
+
+
+def _split(total: Optional[int], parts: int) -> List[Optional[int]]:
+    """Split ``total`` into ``parts`` near-equal integers that sum to it."""
+    if total is None:
+        return [None] * parts
+    share, extra = divmod(total, parts)
+    return [share + (index < extra) for index in range(parts)]
+
+
+class ShardedCache:
+    """Lock-striped cache for multi-threaded access.
+
+    Keys are routed by hash to one of ``shards`` independent
+    ``BoundedCache`` segments, each guarded by its own lock, so threads
+    working on different keys rarely wait for each other. Limits are split
+    between segments so that they add up to the requested total (with
+    fewer segments than ``shards`` if the limit is smaller), which makes
+    eviction per-segment rather than global. Every operation, including ``get_or_set``, ``incr`` and
+    ``compare_and_set``, runs atomically under its segment lock.
+    """
+    
+    def __init__(self, shards: int = 16, capacity: Optional[int] = None,
+                 max_bytes: Optional[int] = None, **options: Any):
+        if shards <= 0:
+            raise ValueError("shards must be positive")
+        if capacity is not None and capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        # Never more segments than entries (or bytes): each needs a positive limit
+        shards = min(limit for limit in (shards, capacity, max_bytes) if limit is not None)
+        capacities = _split(capacity, shards)
+        budgets = _split(max_bytes, shards)
+        self._shards: List[Tuple[Lock, BoundedCache]] = [
+            (Lock(), BoundedCache(per_capacity, per_bytes, **options))
+            for per_capacity, per_bytes in zip(capacities, budgets)
+        ]
+        self._count = shards
+    
+    def _before_fork(self) -> None:
+        # Fork with every segment consistent, never halfway through an update
+        for lock, _ in self._shards:
+            lock.acquire()
+    
+    def _after_fork_parent(self) -> None:
+        for lock, _ in reversed(self._shards):
+            lock.release()
+    
+    def _after_fork_child(self) -> None:
+        self._shards = [(Lock(), segment) for _, segment in self._shards]
+    
+    def _route(self, key: Hashable) -> Tuple[Lock, BoundedCache]:
+        return self._shards[hash(key) % self._count]
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        lock, segment = self._route(key)
+        with lock:
+            return segment.get(key, default)
+    
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        lock, segment = self._route(key)
+        with lock:
+            return segment.peek(key, default)
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        lock, segment = self._route(key)
+        with lock:
+            segment.set(key, value)
+    
+    def delete(self, key: Hashable) -> bool:
+        lock, segment = self._route(key)
+        with lock:
+            return segment.delete(key)
+    
+    def get_or_set(self, key: Hashable, value: Any) -> Any:
+        lock, segment = self._route(key)
+        with lock:
+            return segment.get_or_set(key, value)
+    
+    def incr(self, key: Hashable, delta: int = 1, initial: int = 0) -> int:
+        lock, segment = self._route(key)
+        with lock:
+            return segment.incr(key, delta, initial)
+    
+    def compare_and_set(self, key: Hashable, expected: Any, value: Any) -> bool:
+        lock, segment = self._route(key)
+        with lock:
+            return segment.compare_and_set(key, expected, value)
+    
+    def sweep(self) -> int:
+        removed = 0
+        for lock, segment in self._shards:
+            with lock:
+                removed += segment.sweep()
+        return removed
+    
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Copy of every entry; each segment is locked only while copied."""
+        entries = []
+        for lock, segment in self._shards:
+            with lock:
+                entries.extend(segment.items())
+        return entries
+    
+    def clear(self) -> None:
+        for lock, segment in self._shards:
+            with lock:
+                segment.clear()
+    
+    @property
+    def evictions(self) -> int:
+        return sum(segment.evictions for _, segment in self._shards)
+    
+    @property
+    def rejections(self) -> int:
+        return sum(segment.rejections for _, segment in self._shards)
+    
+    def __len__(self) -> int:
+        return sum(len(segment) for _, segment in self._shards)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        lock, segment = self._route(key)
+        with lock:
+            return key in segment
@@ -0,0 +1,341 @@
+"""Memory-compact Cache backend for millions of small entries.
+
+A ``dict`` of ``str -> int`` pays for a key object, a value object and a
+hash-table entry per item - well over 100 bytes for a short key. Here the
+table is laid out like CPython's own compact dict, but without objects: a
+sparse ``array`` of int32 indices (open addressing, linear probing) points
+into dense ``array`` columns, one row per entry. Keys live back to back in
+one ``bytearray`` arena, and values are stored unboxed: ints and floats in
+the row itself, bytes and str in the arena right after their key.
+
+Per entry: hash (u32), arena offset (u64), key length (u16), kind (u8),
+value or payload length (i64) and a CLOCK reference bit (u8), plus 4 to 8
+bytes of index and the key and payload bytes.
+"""
+
+import struct
+from array import array
+from threading import Lock
+from typing import Any, Hashable, List, Optional, Tuple
+
+
+_EMPTY, _DELETED = -1, -2
+_INT, _FLOAT, _BYTES, _STR, _REMOVED = range(5)
+_BYTES_KEY = 0x80
+_MAX_LOAD = 0.75
+_MAX_KEY = 0xFFFF  # key lengths live in an array("H") column
+_DOUBLE = struct.Struct("<d")
+_INT64 = struct.Struct("<q")
+
+
+def _encode_key(key: Hashable) -> Tuple[bytes, int]:
+    # Checked before any column is touched: a half-written row would
+    # leave the columns misaligned
+    if isinstance(key, str):
+        raw, flag = key.encode("utf-8"), 0
+    elif isinstance(key, bytes):
+        raw, flag = key, _BYTES_KEY
+    else:
+        raise TypeError(f"CompactCache keys must be str or bytes, not {type(key).__name__}")
+    if len(raw) > _MAX_KEY:
+        raise ValueError(f"CompactCache keys must be at most {_MAX_KEY} bytes, got {len(raw)}")
+    return raw, flag
+
+
+class CompactCache:
+    """Open-addressing cache over ``array`` columns and a key/value arena.
+
+    Keys are ``str`` or ``bytes`` (up to 65535 bytes encoded, longer ones
+    raise ``ValueError``); values are ``int`` (64-bit), ``float``, ``bytes``
+    or ``str`` and come back as the same type. Other types raise
+    ``TypeError`` - keep those in the dict-based cache.
+
+    ``capacity`` bounds the number of entries; beyond it the CLOCK
+    algorithm (one reference bit per entry, set on every hit) picks the
+    victim, a close and almost free approximation of LRU. TTLs are not
+    supported. Rows and arena space left behind by deleted or overwritten
+    entries are reclaimed when the index is rebuilt, which also happens
+    once they make up half of the store.
+
+    All operations take one lock, so the backend is safe to share between
+    threads. It trades speed for memory: a lookup costs a few times a dict
+    lookup.
+    """
+    
+    def __init__(self, capacity: Optional[int] = None):
+        if capacity is not None and capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.evictions = 0
+        self._lock = Lock()
+        self._reset(8)
+    
+    def _reset(self, slots: int) -> None:
+        self._index = array("i", [_EMPTY]) * slots
+        self._mask = slots - 1
+        self._filled = 0  # index slots ever used since the last rebuild
+        self._hashes = array("I")
+        self._offsets = array("Q")
+        self._key_lengths = array("H")
+        self._kinds = array("B")
+        self._values = array("q")
+        self._referenced = bytearray()
+        self._arena = bytearray()
+        self._used = 0
+        self._garbage = 0  # arena bytes of removed records
+        self._hand = 0
+    
+    # ---- row helpers ----
+    
+    def _find(self, h: int, raw: bytes, flag: int) -> Tuple[int, int]:
+        """(index slot, row) of the key; row is -1 and slot the insert position if absent."""
+        index, hashes, lengths, kinds = self._index, self._hashes, self._key_lengths, self._kinds
+        mask = self._mask
+        slot = h & mask
+        free = -1
+        while True:
+            row = index[slot]
+            if row == _EMPTY:
+                return (free if free >= 0 else slot), -1
+            if row == _DELETED:
+                if free < 0:
+                    free = slot
+            elif hashes[row] == h and lengths[row] == len(raw) and kinds[row] & _BYTES_KEY == flag:
+                start = self._offsets[row]
+                if self._arena[start:start + len(raw)] == raw:
+                    return slot, row
+            slot = (slot + 1) & mask
+    
+    def _read(self, row: int) -> Any:
+        kind = self._kinds[row] & ~_BYTES_KEY
+        if kind == _INT:
+            return self._values[row]
+        if kind == _FLOAT:
+            return _DOUBLE.unpack(_INT64.pack(self._values[row]))[0]
+        start = self._offsets[row] + self._key_lengths[row]
+        payload = bytes(self._arena[start:start + self._values[row]])
+        return payload if kind == _BYTES else payload.decode("utf-8")
+    
+    def _record_size(self, row: int) -> int:
+        size = self._key_lengths[row]
+        if self._kinds[row] & ~_BYTES_KEY in (_BYTES, _STR):
+            size += self._values[row]
+        return size
+    
+    def _write(self, h: int, raw: bytes, flag: int, slot: int, row: int,
+               value: Any) -> None:
+        if isinstance(value, bool) or not isinstance(value, (int, float, bytes, str)):
+            raise TypeError(f"CompactCache cannot store {type(value).__name__} values")
+        payload = None
+        if isinstance(value, int):
+            if not -2**63 <= value < 2**63:
+                raise TypeError("CompactCache ints must fit in 64 bits")
+            kind, number = _INT, value
+        elif isinstance(value, float):
+            kind, number = _FLOAT, _INT64.unpack(_DOUBLE.pack(value))[0]
+        else:
+            kind = _BYTES if isinstance(value, bytes) else _STR
+            payload = value if kind == _BYTES else value.encode("utf-8")
+            number = len(payload)
+        
+        if row < 0:
+            if self.capacity is not None and self._used >= self.capacity:
+                self._evict_one()
+            if self._filled + 1 > _MAX_LOAD * (self._mask + 1):
+                self._rebuild()
+                slot, _ = self._find(h, raw, flag)
+            if self._index[slot] == _EMPTY:
+                self._filled += 1
+            row = len(self._kinds)
+            self._index[slot] = row
+            self._hashes.append(h)
+            self._offsets.append(len(self._arena))
+            self._key_lengths.append(len(raw))
+            self._kinds.append(kind | flag)
+            self._values.append(number)
+            self._referenced.append(1)
+            self._arena += raw
+            self._used += 1
+        else:
+            if payload is not None:
+                # New payload: re-append the record, the old one becomes garbage
+                self._garbage += self._record_size(row)
+                self._offsets[row] = len(self._arena)
+                self._arena += raw
+            else:
+                self._garbage += self._record_size(row) - len(raw)
+            self._kinds[row] = kind | flag
+            self._values[row] = number
+            self._referenced[row] = 1
+        if payload is not None:
+            self._arena += payload
+    
+    def _remove(self, slot: int, row: int) -> None:
+        self._garbage += self._record_size(row)
+        self._index[slot] = _DELETED
+        self._kinds[row] = _REMOVED
+        self._referenced[row] = 0
+        self._used -= 1
+    
+    def _evict_one(self) -> None:
+        kinds, referenced = self._kinds, self._referenced
+        rows = len(kinds)
+        while True:
+            row = self._hand
+            self._hand = (row + 1) % rows
+            if kinds[row] == _REMOVED:
+                continue
+            if referenced[row]:
+                referenced[row] = 0
+                continue
+            start = self._offsets[row]
+            raw = self._arena[start:start + self._key_lengths[row]]
+            slot, _ = self._find(self._hashes[row], raw, kinds[row] & _BYTES_KEY)
+            self._remove(slot, row)
+            self.evictions += 1
+            return
+    
+    def _rebuild(self) -> None:
+        """Re-index live rows into fresh columns, dropping removed rows and garbage."""
+        slots = 8
+        while slots * _MAX_LOAD < 2 * self._used + 1:
+            slots *= 2
+        hashes, offsets, lengths = self._hashes, self._offsets, self._key_lengths
+        kinds, values, referenced = self._kinds, self._values, self._referenced
+        arena, hand = self._arena, self._hand
+        self._reset(slots)
+        new_index, mask = self._index, self._mask
+        new_arena = self._arena
+        for row, kind in enumerate(kinds):
+            if kind == _REMOVED:
+                if row < hand:
+                    hand -= 1
+                continue
+            h = hashes[row]
+            slot = h & mask
+            while new_index[slot] != _EMPTY:
+                slot = (slot + 1) & mask
+            new_index[slot] = len(self._kinds)
+            start = offsets[row]
+            end = start + lengths[row]
+            if kind & ~_BYTES_KEY in (_BYTES, _STR):
+                end += values[row]
+            self._hashes.append(h)
+            self._offsets.append(len(new_arena))
+            self._key_lengths.append(lengths[row])
+            self._kinds.append(kind)
+            self._values.append(values[row])
+            self._referenced.append(referenced[row])
+            new_arena += arena[start:end]
+        self._used = self._filled = len(self._kinds)
+        self._hand = hand if hand < self._used else 0
+    
+    def _maybe_compact(self) -> None:
+        if len(self._kinds) > 1024 and (self._used * 2 < len(self._kinds)
+                                        or self._garbage * 2 > len(self._arena)):
+            self._rebuild()
+    
+    # ---- cache interface ----
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        raw, flag = _encode_key(key)
+        with self._lock:
+            _, row = self._find(hash(key) & 0xFFFFFFFF, raw, flag)
+            if row < 0:
+                return default
+            self._referenced[row] = 1
+            return self._read(row)
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        raw, flag = _encode_key(key)
+        h = hash(key) & 0xFFFFFFFF
+        with self._lock:
+            slot, row = self._find(h, raw, flag)
+            self._write(h, raw, flag, slot, row, value)
+            if row >= 0:
+                self._maybe_compact()
+    
+    def delete(self, key: Hashable) -> bool:
+        raw, flag = _encode_key(key)
+        h = hash(key) & 0xFFFFFFFF
+        with self._lock:
+            slot, row = self._find(h, raw, flag)
+            if row < 0:
+                return False
+            self._remove(slot, row)
+            self._maybe_compact()
+            return True
+    
+    def get_or_set(self, key: Hashable, value: Any) -> Any:
+        raw, flag = _encode_key(key)
+        h = hash(key) & 0xFFFFFFFF
+        with self._lock:
+            slot, row = self._find(h, raw, flag)
+            if row >= 0:
+                self._referenced[row] = 1
+                return self._read(row)
+            self._write(h, raw, flag, slot, row, value)
+            return value
+    
+    def incr(self, key: Hashable, delta: int = 1, initial: int = 0) -> int:
+        raw, flag = _encode_key(key)
+        h = hash(key) & 0xFFFFFFFF
+        with self._lock:
+            slot, row = self._find(h, raw, flag)
+            value = (self._read(row) if row >= 0 else initial) + delta
+            self._write(h, raw, flag, slot, row, value)
+            return value
+    
+    def compare_and_set(self, key: Hashable, expected: Any, value: Any) -> bool:
+        raw, flag = _encode_key(key)
+        h = hash(key) & 0xFFFFFFFF
+        with self._lock:
+            slot, row = self._find(h, raw, flag)
+            if (self._read(row) if row >= 0 else None) != expected:
+                return False
+            self._write(h, raw, flag, slot, row, value)
+            return True
+    
+    def sweep(self) -> int:
+        return 0  # no TTLs
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._reset(8)
+    
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        with self._lock:
+            entries = []
+            for row, kind in enumerate(self._kinds):
+                if kind == _REMOVED:
+                    continue
+                start = self._offsets[row]
+                raw = bytes(self._arena[start:start + self._key_lengths[row]])
+                key = raw if kind & _BYTES_KEY else raw.decode("utf-8")
+                entries.append((key, self._read(row)))
+            return entries
+    
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes used by the index, the row columns and the arena."""
+        columns = (self._index, self._hashes, self._offsets, self._key_lengths,
+                   self._kinds, self._values)
+        return (sum(column.itemsize * len(column) for column in columns)
+                + len(self._referenced) + len(self._arena))
+    
+    def __len__(self) -> int:
+        return self._used
+    
+    def __contains__(self, key: Hashable) -> bool:
+        raw, flag = _encode_key(key)
+        with self._lock:
+            return self._find(hash(key) & 0xFFFFFFFF, raw, flag)[1] >= 0
+    
+    def _before_fork(self) -> None:
+        self._lock.acquire()
+    
+    def _after_fork_parent(self) -> None:
+        self._lock.release()
+    
+    def _after_fork_child(self) -> None:
+        self._lock = Lock()
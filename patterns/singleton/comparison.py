@@ -96,30 +96,34 @@ def compare_implementations():
     print("\n\n⚡ Performance Test:")
     print("-" * 70)
     
+    # Same workload for both: 1000 requests spread over 10 databases
     # Without Singleton
     start = time.perf_counter()
     for i in range(1000):
-        db = before.DatabaseConnection("localhost", 5432, f"db{i}")
+        db = before.DatabaseConnection("localhost", 5432, f"db{i % 10}")
     before_time = time.perf_counter() - start
     before_instances = before.DatabaseConnection._instance_count
     
-    # With Singleton
+    # With Singleton (one instance per distinct host/port/database key)
     start = time.perf_counter()
-    for i in range(1000):
-        db = after.DatabaseConnection("localhost", 5432, f"db{i}")
+    connections = [
+        after.DatabaseConnection("localhost", 5432, f"db{i % 10}")
+        for i in range(1000)
+    ]
     after_time = time.perf_counter() - start
+    after_instances = len({id(db) for db in connections})
     
-    print(f"\nCreating 1000 database connections:")
+    print(f"\nRequesting 1000 database connections to 10 databases:")
     print(f"  Without Singleton:")
     print(f"    - Time: {before_time*1000:.2f}ms")
     print(f"    - Instances created: {before_instances}")
     print(f"    - Memory: ~{before_instances * 100}MB (estimate)")
-    print(f"\n  With Singleton:")
+    print(f"\n  With Singleton (keyed by connection parameters):")
     print(f"    - Time: {after_time*1000:.2f}ms")
-    print(f"    - Instances created: 1")
-    print(f"    - Memory: ~100MB (estimate)")
+    print(f"    - Instances created: {after_instances}")
+    print(f"    - Memory: ~{after_instances * 100}MB (estimate)")
     print(f"\n  Efficiency: {before_time / after_time:.0f}x faster with Singleton")
-    print(f"  Memory saved: ~{(before_instances - 1) * 100}MB")
+    print(f"  Memory saved: ~{(before_instances - after_instances) * 100}MB")
     
     # ============ CONCLUSION ============
     print("\n\n🎯 CONCLUSION:")
@@ -0,0 +1,112 @@
+"""Streaming result cursor for DatabaseConnection.
+
+``ResultCursor`` reads a query's rows from the driver ``arraysize`` at a
+time, so walking a result of any size keeps only one batch in memory.
+Batches can also come back column by column: numeric columns as NumPy
+arrays when NumPy is installed, ``array.array`` otherwise.
+"""
+
+from array import array
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+try:
+    import numpy
+except ImportError:  # optional: columnar batches fall back to array.array
+    numpy = None
+
+
+ColumnBatch = Dict[str, Sequence]
+
+
+def _column(values: tuple, use_numpy: bool) -> Sequence:
+    if use_numpy:
+        return numpy.asarray(values)
+    first = next((value for value in values if value is not None), None)
+    typecode = {int: "q", float: "d"}.get(type(first))
+    if typecode is not None:
+        try:
+            return array(typecode, values)
+        except (TypeError, OverflowError):
+            pass  # NULLs, mixed types or big ints stay a plain list
+    return list(values)
+
+
+def to_columns(names: List[str], rows: List[tuple],
+               use_numpy: Optional[bool] = None) -> ColumnBatch:
+    """Transpose ``rows`` into ``{column name: values}``."""
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    columns = zip(*rows) if rows else [()] * len(names)
+    return {name: _column(values, use_numpy) for name, values in zip(names, columns)}
+
+
+class ResultCursor:
+    """Iterates over the rows of one query without materializing them.
+
+    ``fetchone``/``fetchmany``/``fetchall`` follow DB-API; iterating yields
+    rows, and ``iter_batches(columnar=True)`` yields ``ColumnBatch`` dicts.
+    Every fetch holds the connection's lock only for that one batch.
+    """
+    
+    def __init__(self, cursor: Any, lock: Lock, arraysize: int = 1000):
+        if arraysize <= 0:
+            raise ValueError("arraysize must be positive")
+        self._cursor = cursor
+        self._lock = lock
+        self.arraysize = arraysize
+        self.rowcount = 0
+    
+    @property
+    def columns(self) -> List[str]:
+        return [column[0] for column in self._cursor.description or ()]
+    
+    def fetchone(self) -> Optional[tuple]:
+        with self._lock:
+            row = self._cursor.fetchone()
+        if row is not None:
+            self.rowcount += 1
+        return row
+    
+    def fetchmany(self, size: Optional[int] = None) -> List[tuple]:
+        with self._lock:
+            rows = self._cursor.fetchmany(size or self.arraysize)
+        self.rowcount += len(rows)
+        return rows
+    
+    def fetchall(self) -> List[tuple]:
+        """Everything that is left, in memory at once - prefer iterating."""
+        with self._lock:
+            rows = self._cursor.fetchall()
+        self.rowcount += len(rows)
+        return rows
+    
+    def fetch_columns(self, size: Optional[int] = None,
+                      use_numpy: Optional[bool] = None) -> Optional[ColumnBatch]:
+        """Next batch as columns, or None once the result is exhausted."""
+        rows = self.fetchmany(size)
+        if not rows:
+            return None
+        return to_columns(self.columns, rows, use_numpy)
+    
+    def iter_batches(self, size: Optional[int] = None,
+                     columnar: bool = False) -> Iterator[Any]:
+        while True:
+            rows = self.fetchmany(size)
+            if not rows:
+                return
+            yield to_columns(self.columns, rows) if columnar else rows
+    
+    def __iter__(self) -> Iterator[tuple]:
+        for rows in self.iter_batches():
+            yield from rows
+    
+    def close(self) -> None:
+        with self._lock:
+            self._cursor.close()
+    
+    def __enter__(self) -> "ResultCursor":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
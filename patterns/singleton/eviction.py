@@ -0,0 +1,144 @@
+"""Eviction policies for the bounded Cache singleton.
+
+Every policy only tracks keys; values live in the cache itself. All
+operations are O(1), so plugging a policy into ``Cache`` keeps
+``get``/``set`` constant time.
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Type
+
+
+class EvictionPolicy(ABC):
+    """Decides which key leaves the cache when it is over capacity."""
+    
+    @abstractmethod
+    def insert(self, key: Hashable) -> None:
+        """Start tracking a newly stored key."""
+        pass
+    
+    @abstractmethod
+    def access(self, key: Hashable) -> None:
+        """Record a hit (or an overwrite) of a tracked key."""
+        pass
+    
+    @abstractmethod
+    def remove(self, key: Hashable) -> None:
+        """Stop tracking a key (deleted, expired or evicted)."""
+        pass
+    
+    @abstractmethod
+    def victim(self) -> Optional[Hashable]:
+        """Return the next key to evict without removing it."""
+        pass
+    
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+
+class LRUPolicy(EvictionPolicy):
+    """Least Recently Used: evicts the key untouched for the longest time."""
+    
+    def __init__(self):
+        self._order: "OrderedDict[Hashable, None]" = OrderedDict()
+    
+    def insert(self, key: Hashable) -> None:
+        self._order[key] = None
+    
+    def access(self, key: Hashable) -> None:
+        self._order.move_to_end(key)
+    
+    def remove(self, key: Hashable) -> None:
+        self._order.pop(key, None)
+    
+    def victim(self) -> Optional[Hashable]:
+        return next(iter(self._order), None)
+    
+    def clear(self) -> None:
+        self._order.clear()
+
+
+class _FrequencyNode:
+    """Bucket of keys sharing one access count (doubly linked, ascending)."""
+    
+    __slots__ = ("count", "keys", "prev", "next")
+    
+    def __init__(self, count: int):
+        self.count = count
+        self.keys: "OrderedDict[Hashable, None]" = OrderedDict()
+        self.prev: Optional["_FrequencyNode"] = None
+        self.next: Optional["_FrequencyNode"] = None
+
+
+class LFUPolicy(EvictionPolicy):
+    """Least Frequently Used with O(1) frequency buckets.
+
+    Keys with the same access count share a bucket; buckets form a linked
+    list ordered by count, so bumping a key and finding the victim never
+    scan. Ties are broken by recency (oldest key in the lowest bucket).
+    """
+    
+    def __init__(self):
+        self._head = _FrequencyNode(0)
+        self._head.prev = self._head.next = self._head
+        self._nodes: Dict[Hashable, _FrequencyNode] = {}
+    
+    def _link_after(self, node: _FrequencyNode, count: int) -> _FrequencyNode:
+        new = _FrequencyNode(count)
+        new.prev, new.next = node, node.next
+        node.next.prev = new
+        node.next = new
+        return new
+    
+    def _unlink_if_empty(self, node: _FrequencyNode) -> None:
+        if not node.keys:
+            node.prev.next = node.next
+            node.next.prev = node.prev
+    
+    def insert(self, key: Hashable) -> None:
+        first = self._head.next
+        if first.count != 1:
+            first = self._link_after(self._head, 1)
+        first.keys[key] = None
+        self._nodes[key] = first
+    
+    def access(self, key: Hashable) -> None:
+        node = self._nodes[key]
+        target = node.next
+        if target.count != node.count + 1:
+            target = self._link_after(node, node.count + 1)
+        del node.keys[key]
+        target.keys[key] = None
+        self._nodes[key] = target
+        self._unlink_if_empty(node)
+    
+    def remove(self, key: Hashable) -> None:
+        node = self._nodes.pop(key, None)
+        if node is not None:
+            del node.keys[key]
+            self._unlink_if_empty(node)
+    
+    def victim(self) -> Optional[Hashable]:
+        first = self._head.next
+        if first is self._head:
+            return None
+        return next(iter(first.keys))
+    
+    def clear(self) -> None:
+        self._head.prev = self._head.next = self._head
+        self._nodes.clear()
+
+
+POLICIES: Dict[str, Type[EvictionPolicy]] = {
+    "lru": LRUPolicy,
+    "lfu": LFUPolicy,
+}
+
+
+def create_policy(name: str) -> EvictionPolicy:
+    """Create an eviction policy by its registered name."""
+    if name not in POLICIES:
+        raise ValueError(f"Unknown eviction policy: {name}")
+    return POLICIES[name]()
@@ -0,0 +1,177 @@
+"""Read-through loading and write-behind helpers for the Cache singleton."""
+
+import asyncio
+import atexit
+import inspect
+from threading import Condition, Event, Lock, Thread
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    """One in-flight load shared by every caller of the same key."""
+    
+    __slots__ = ("done", "result", "error")
+    
+    def __init__(self):
+        self.done = Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Collapses concurrent loads of the same key into a single call.
+
+    The first caller for a key runs the loader; callers arriving while it is
+    running block and receive the same result (or exception).
+    """
+    
+    def __init__(self):
+        self._lock = Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+    
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = fn()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight:
+    """``SingleFlight`` for coroutines: concurrent awaiters share one task."""
+    
+    def __init__(self):
+        self._tasks: Dict[Any, "asyncio.Future"] = {}
+    
+    async def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        slot = (loop, key)
+        task = self._tasks.get(slot)
+        if task is None:
+            task = self._tasks[slot] = loop.create_task(self._run(fn))
+            task.add_done_callback(lambda _: self._tasks.pop(slot, None))
+        # Shield so one cancelled waiter does not cancel the shared load
+        return await asyncio.shield(task)
+    
+    @staticmethod
+    async def _run(fn: Callable[[], Any]) -> Any:
+        result = fn()
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+
+class WriteBehindBuffer:
+    """Batches cache writes and flushes them to a backing store.
+
+    ``writer`` receives a ``{key: value}`` dict per batch. Repeated writes
+    of a key before a flush are coalesced, so only the latest value is
+    written. A daemon thread flushes when ``batch_size`` entries are pending
+    or every ``flush_interval`` seconds; ``flush()`` drains synchronously
+    and ``close()`` stops the thread (also run at interpreter exit).
+
+    If the writer raises, the batch is put back (without overwriting newer
+    values) and retried on the next flush. The writer only ever receives
+    values: ``discard()`` cancels a pending write but deletes nothing.
+    """
+    
+    def __init__(self, writer: Callable[[Dict[Hashable, Any]], None],
+                 batch_size: int = 500, flush_interval: float = 1.0):
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        self._writer = writer
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._pending: Dict[Hashable, Any] = {}
+        self._cond = Condition(Lock())
+        self._flush_lock = Lock()
+        self._closed = False
+        self.batches_written = 0
+        self.last_error: Optional[BaseException] = None
+        self._thread = Thread(target=self._run, name="cache-write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._cond:
+            self._pending[key] = value
+            if len(self._pending) >= self._batch_size:
+                self._cond.notify()
+    
+    def discard(self, key: Hashable) -> bool:
+        """Cancel a pending write of ``key`` (e.g. the entry was deleted)."""
+        with self._cond:
+            if key not in self._pending:
+                return False
+            del self._pending[key]
+            return True
+    
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+    
+    def flush(self) -> int:
+        """Write everything pending now; returns the number of entries written."""
+        with self._flush_lock:
+            with self._cond:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            try:
+                self._writer(batch)
+            except BaseException as error:
+                self.last_error = error
+                with self._cond:
+                    for key, value in batch.items():
+                        self._pending.setdefault(key, value)
+                raise
+            self.batches_written += 1
+            return len(batch)
+    
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+    
+    def _after_fork_child(self) -> None:
+        # The parent still owns (and writes) what was pending at fork time
+        self._pending = {}
+        self._cond = Condition(Lock())
+        self._flush_lock = Lock()
+        if not self._closed:
+            self._thread = Thread(target=self._run, name="cache-write-behind", daemon=True)
+            self._thread.start()
+    
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._closed and len(self._pending) < self._batch_size:
+                    self._cond.wait(self._flush_interval)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception:
+                # Kept in last_error; the batch is retried on the next round
+                pass
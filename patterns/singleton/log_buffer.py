@@ -0,0 +1,124 @@
+"""Bounded ring buffer with a background writer for the Logger singleton."""
+
+import atexit
+import sys
+from collections import deque
+from threading import Condition, Lock, Thread
+from typing import Deque, Optional, TextIO
+
+
+OVERFLOW_POLICIES = ("block", "drop-oldest", "drop-newest")
+
+
+class BufferedLogWriter:
+    """Moves log output off the caller's thread.
+
+    ``submit()`` only appends a line to a bounded ring buffer. A daemon
+    thread drains the buffer in batches and issues one ``write`` per batch.
+    When the buffer is full, ``overflow`` decides what happens:
+
+    * ``"block"`` - the caller waits until the writer frees space;
+    * ``"drop-oldest"`` - the oldest buffered line is discarded;
+    * ``"drop-newest"`` - the new line is discarded.
+
+    Dropped lines are counted in ``dropped``.
+    """
+    
+    def __init__(self, stream: Optional[TextIO] = None, capacity: int = 8192,
+                 overflow: str = "block", flush_interval: float = 0.5):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self._stream = stream
+        self._capacity = capacity
+        self._overflow = overflow
+        self._flush_interval = flush_interval
+        self._buffer: Deque[str] = deque()
+        self._cond = Condition(Lock())
+        self._write_lock = Lock()
+        self._closed = False
+        self.dropped = 0
+        self.batches = 0
+        self._thread = Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def submit(self, line: str) -> None:
+        """Queue one line (including its newline) for writing."""
+        with self._cond:
+            if len(self._buffer) >= self._capacity:
+                if self._overflow == "drop-newest":
+                    self.dropped += 1
+                    return
+                if self._overflow == "drop-oldest":
+                    self._buffer.popleft()
+                    self.dropped += 1
+                else:
+                    self._cond.notify_all()
+                    while len(self._buffer) >= self._capacity and not self._closed:
+                        self._cond.wait()
+            self._buffer.append(line)
+            if len(self._buffer) == self._capacity // 2 + 1:
+                self._cond.notify_all()
+    
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+    
+    def flush(self) -> None:
+        """Write everything submitted so far before returning."""
+        self._drain()
+        stream = self._stream or sys.stdout
+        stream.flush()
+    
+    def close(self) -> None:
+        """Stop the writer thread and flush what is left."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        self.flush()
+    
+    def _before_fork(self) -> None:
+        # No batch half-written and nothing left in the stream's own buffer,
+        # which the child would otherwise write a second time
+        self._write_lock.acquire()
+        (self._stream or sys.stdout).flush()
+    
+    def _after_fork_parent(self) -> None:
+        self._write_lock.release()
+    
+    def _after_fork_child(self) -> None:
+        # Lines queued before the fork are written by the parent
+        self._buffer = deque()
+        self._cond = Condition(Lock())
+        self._write_lock = Lock()
+        if not self._closed:
+            self._thread = Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+    
+    def _drain(self) -> int:
+        # The write lock spans pop + write so batches reach the stream in order
+        with self._write_lock:
+            with self._cond:
+                if not self._buffer:
+                    return 0
+                batch = self._buffer
+                self._buffer = deque()
+                self._cond.notify_all()
+            (self._stream or sys.stdout).write("".join(batch))
+            self.batches += 1
+            return len(batch)
+    
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                # Write on a timer, or early once the buffer is half full
+                if not self._closed and len(self._buffer) <= self._capacity // 2:
+                    self._cond.wait(self._flush_interval)
+                if self._closed:
+                    return
+            self._drain()
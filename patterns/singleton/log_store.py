@@ -0,0 +1,210 @@
+"""Append-only, segmented binary log store for the Logger singleton.
+
+Records are framed as a fixed header followed by the UTF-8 message::
+
+    length:u32  crc32:u32  timestamp:f64  level:u8  message:bytes[length]
+
+Segments rotate once they reach ``segment_bytes``. Every segment has a
+sparse ``.idx`` file with one ``(timestamp, offset)`` pair per
+``index_interval`` bytes, so a time-range query can jump close to its
+start instead of scanning from the beginning. Reads go through ``mmap``
+and yield matching records one by one, never loading a whole segment.
+
+Segment names are claimed with exclusive creates, so forked processes can
+share a directory: each one appends to segments of its own.
+"""
+
+import mmap
+import os
+import struct
+import time
+import zlib
+from bisect import bisect_left
+from threading import Lock
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+
+_HEADER = struct.Struct("<IIdB")
+_INDEX_ENTRY = struct.Struct("<dQ")
+
+
+class LogRecord(NamedTuple):
+    timestamp: float
+    level: int
+    message: str
+
+
+class SegmentedLogStore:
+    """Persists log records to size-rotated segment files in ``directory``.
+
+    Timestamps are kept non-decreasing in write order (a clock step back
+    reuses the previous timestamp), which is what makes the per-segment
+    index and early termination of range scans valid.
+    """
+    
+    def __init__(self, directory: str, segment_bytes: int = 64 * 1024 * 1024,
+                 index_interval: int = 64 * 1024):
+        if segment_bytes <= _HEADER.size:
+            raise ValueError("segment_bytes is too small")
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.index_interval = index_interval
+        self._lock = Lock()
+        os.makedirs(directory, exist_ok=True)
+        
+        self._segments: List[str] = self._list_segments()
+        self._file = None
+        self._index_file = None
+        self._size = 0
+        self._last_indexed = -index_interval
+        self._last_ts = 0.0
+        if self._segments:
+            entries = self._read_index(self._segments[-1])
+            if entries:
+                self._last_ts = entries[-1][0]
+        # Always append to a fresh segment: a torn tail left by a crash then
+        # only cuts short the segment it is in
+        self._rotate()
+    
+    # ---- writing ----
+    
+    def _path(self, segment: str, suffix: str) -> str:
+        return os.path.join(self.directory, segment + suffix)
+    
+    def _list_segments(self) -> List[str]:
+        return sorted(
+            name[:-4] for name in os.listdir(self.directory) if name.endswith(".log")
+        )
+    
+    def _rotate(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._index_file.close()
+        # Zero-padded sequence numbers keep segments sorted by name; another
+        # process may take a number first, so claim it with an exclusive create
+        number = int(self._segments[-1]) + 1 if self._segments else 0
+        while True:
+            segment = f"{number:010d}"
+            try:
+                self._file = open(self._path(segment, ".log"), "xb")
+                break
+            except FileExistsError:
+                number += 1
+        self._index_file = open(self._path(segment, ".idx"), "wb")
+        self._segments.append(segment)
+        self._size = 0
+        self._last_indexed = -self.index_interval
+    
+    def append(self, message: str, level: int = 20,
+               timestamp: Optional[float] = None) -> None:
+        payload = message.encode("utf-8")
+        with self._lock:
+            ts = max(timestamp if timestamp is not None else time.time(), self._last_ts)
+            self._last_ts = ts
+            frame_size = _HEADER.size + len(payload)
+            if self._size and self._size + frame_size > self.segment_bytes:
+                self._rotate()
+            if self._size - self._last_indexed >= self.index_interval:
+                self._index_file.write(_INDEX_ENTRY.pack(ts, self._size))
+                self._last_indexed = self._size
+            self._file.write(_HEADER.pack(len(payload), zlib.crc32(payload), ts, level) + payload)
+            self._size += frame_size
+    
+    def flush(self) -> None:
+        with self._lock:
+            if self._file.closed:
+                return  # closed stores stay queryable
+            self._file.flush()
+            self._index_file.flush()
+    
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+            self._index_file.close()
+    
+    def _before_fork(self) -> None:
+        # Empty write buffers at fork time, so the child cannot repeat them
+        self._lock.acquire()
+        if not self._file.closed:
+            self._file.flush()
+            self._index_file.flush()
+    
+    def _after_fork_parent(self) -> None:
+        self._lock.release()
+    
+    def _after_fork_child(self) -> None:
+        # The parent keeps appending to the current segment; move to a new one
+        self._lock = Lock()
+        self._segments = self._list_segments()
+        if not self._file.closed:
+            self._rotate()
+    
+    @property
+    def segments(self) -> List[str]:
+        return [self._path(segment, ".log") for segment in self._list_segments()]
+    
+    # ---- reading ----
+    
+    def _read_index(self, segment: str) -> List[Tuple[float, int]]:
+        try:
+            with open(self._path(segment, ".idx"), "rb") as index:
+                data = index.read()
+        except FileNotFoundError:
+            return []
+        usable = len(data) - len(data) % _INDEX_ENTRY.size
+        return list(_INDEX_ENTRY.iter_unpack(data[:usable]))
+    
+    def _scan(self, segment: str, start: Optional[float], end: Optional[float],
+              min_level: Optional[int], needle: Optional[bytes]) -> Iterator[LogRecord]:
+        path = self._path(segment, ".log")
+        if os.path.getsize(path) == 0:
+            return
+        offset = 0
+        if start is not None:
+            entries = self._read_index(segment)
+            # Last indexed record before ``start``: records stamped exactly
+            # ``start`` may precede the first index entry that carries it
+            position = bisect_left([ts for ts, _ in entries], start) - 1
+            if position >= 0:
+                offset = entries[position][1]
+        
+        with open(path, "rb") as handle, \
+                mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            limit = len(view)
+            while offset + _HEADER.size <= limit:
+                length, crc, ts, level = _HEADER.unpack_from(view, offset)
+                body = offset + _HEADER.size
+                if body + length > limit:
+                    break  # torn tail of an interrupted write
+                offset = body + length
+                if end is not None and ts > end:
+                    return
+                if start is not None and ts < start:
+                    continue
+                if min_level is not None and level < min_level:
+                    continue
+                payload = view[body:offset]
+                if needle is not None and needle not in payload:
+                    continue
+                if zlib.crc32(payload) != crc:
+                    break
+                yield LogRecord(ts, level, payload.decode("utf-8"))
+    
+    def query(self, start: Optional[float] = None, end: Optional[float] = None,
+              level: Optional[int] = None,
+              contains: Optional[str] = None) -> Iterator[LogRecord]:
+        """Stream records with ``start <= timestamp <= end``, ``level`` or
+        higher and ``contains`` in the message, segment by segment.
+
+        Within a segment records are oldest first. Segments written by
+        different processes can overlap in time, so each one is searched on
+        its own: the index bisect skips what precedes ``start`` and a scan
+        stops at the first record past ``end``.
+        """
+        self.flush()
+        needle = contains.encode("utf-8") if contains is not None else None
+        for segment in self._list_segments():
+            first = self._read_index(segment)[:1]
+            if end is not None and first and first[0][0] > end:
+                continue
+            yield from self._scan(segment, start, end, level, needle)
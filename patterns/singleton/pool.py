@@ -0,0 +1,225 @@
+"""Connection pool - the multi-connection counterpart of DatabaseConnection.
+
+The singleton ``DatabaseConnection`` funnels every thread through one
+connection. ``ConnectionPool`` keeps between ``min_size`` and ``max_size``
+real connections, hands them out with a checkout timeout, validates idle
+connections before reuse, closes connections that stayed idle too long and
+prefers giving a thread back the connection it used last.
+"""
+
+import sqlite3
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import partial
+from threading import Condition, Lock, local
+from typing import Any, Callable, Dict, Iterator, Optional
+
+
+class PoolTimeoutError(TimeoutError):
+    """Raised when no connection becomes available within the timeout."""
+
+
+def default_health_check(connection: Any) -> bool:
+    """DB-API health check: a trivial query must succeed."""
+    try:
+        connection.execute("SELECT 1").fetchone()
+        return True
+    except Exception:
+        return False
+
+
+def sqlite_connector(path: str, **options: Any) -> Callable[[], sqlite3.Connection]:
+    """Connection factory for the sqlite3 demo backend.
+
+    ``options`` go to ``sqlite3.connect``, e.g. ``cached_statements``.
+    """
+    return partial(sqlite3.connect, path, check_same_thread=False, **options)
+
+
+class _Pooled:
+    __slots__ = ("connection", "last_used")
+    
+    def __init__(self, connection: Any):
+        self.connection = connection
+        self.last_used = time.monotonic()
+
+
+class ConnectionPool:
+    """Thread-safe pool of connections created by ``connect()``.
+
+    * ``timeout`` - default seconds ``checkout`` waits for a free connection.
+    * ``max_idle`` - idle connections older than this are closed (the pool
+      never shrinks below ``min_size``); reaping runs from ``checkin`` at
+      most once per ``reap_interval`` seconds, or on ``reap_idle()``.
+    * ``check_after`` - an idle connection is health-checked before reuse
+      when it has been idle at least this long.
+    """
+    
+    def __init__(self, connect: Callable[[], Any], min_size: int = 1,
+                 max_size: int = 10, timeout: float = 30.0,
+                 max_idle: float = 300.0, reap_interval: float = 30.0,
+                 check_after: float = 1.0,
+                 health_check: Callable[[Any], bool] = default_health_check,
+                 close: Callable[[Any], None] = lambda connection: connection.close()):
+        if min_size < 0 or max_size <= 0 or min_size > max_size:
+            raise ValueError("require 0 <= min_size <= max_size and max_size > 0")
+        self._connect = connect
+        self._close = close
+        self._health_check = health_check
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.check_after = check_after
+        self._reap_interval = reap_interval
+        self._next_reap = time.monotonic() + reap_interval
+        
+        self._cond = Condition(Lock())
+        # Most recently returned connections sit at the end (LIFO reuse), so
+        # rarely needed ones age at the front where the reaper looks
+        self._idle: "OrderedDict[int, _Pooled]" = OrderedDict()
+        self._in_use: Dict[int, _Pooled] = {}
+        self._size = 0
+        self._closed = False
+        self._affinity = local()
+        
+        for _ in range(min_size):
+            pooled = _Pooled(connect())
+            self._idle[id(pooled.connection)] = pooled
+            self._size += 1
+    
+    # ---- checkout / checkin ----
+    
+    def checkout(self, timeout: Optional[float] = None) -> Any:
+        """Borrow a connection; raises ``PoolTimeoutError`` after ``timeout``."""
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        while True:
+            pooled = self._acquire(deadline)
+            if pooled is None:
+                # A slot was reserved for a new connection; connect unlocked
+                try:
+                    pooled = _Pooled(self._connect())
+                except BaseException:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif time.monotonic() - pooled.last_used >= self.check_after \
+                    and not self._healthy(pooled):
+                self._discard(pooled)
+                continue
+            with self._cond:
+                self._in_use[id(pooled.connection)] = pooled
+            self._affinity.last = id(pooled.connection)
+            return pooled.connection
+    
+    def _healthy(self, pooled: _Pooled) -> bool:
+        # A check that raises counts as failed; its slot must not leak
+        try:
+            return self._health_check(pooled.connection)
+        except Exception:
+            return False
+    
+    def _acquire(self, deadline: float) -> Optional[_Pooled]:
+        """Take an idle connection, or return None after reserving a new slot."""
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                if self._idle:
+                    preferred = getattr(self._affinity, "last", None)
+                    if preferred in self._idle:
+                        return self._idle.pop(preferred)
+                    return self._idle.popitem(last=True)[1]
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(
+                        f"No connection available within timeout (max_size={self.max_size})")
+                self._cond.wait(remaining)
+    
+    def checkin(self, connection: Any) -> None:
+        """Return a borrowed connection to the pool."""
+        now = time.monotonic()
+        with self._cond:
+            pooled = self._in_use.pop(id(connection), None)
+            if pooled is None:
+                raise ValueError("Connection does not belong to this pool")
+            closed = self._closed
+            if closed:
+                self._size -= 1
+            else:
+                pooled.last_used = now
+                self._idle[id(connection)] = pooled
+            self._cond.notify()
+            reap = now >= self._next_reap
+        if closed:
+            self._close(connection)
+        elif reap:
+            self.reap_idle()
+    
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """``with pool.connection() as conn:`` - checkout and guaranteed checkin."""
+        conn = self.checkout(timeout)
+        try:
+            yield conn
+        finally:
+            self.checkin(conn)
+    
+    # ---- maintenance ----
+    
+    def _discard(self, pooled: _Pooled) -> None:
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+        try:
+            self._close(pooled.connection)
+        except Exception:
+            pass
+    
+    def reap_idle(self) -> int:
+        """Close connections idle longer than ``max_idle``; returns how many."""
+        now = time.monotonic()
+        expired = []
+        with self._cond:
+            self._next_reap = now + self._reap_interval
+            while self._idle and self._size > self.min_size:
+                key, pooled = next(iter(self._idle.items()))
+                if now - pooled.last_used < self.max_idle:
+                    break
+                del self._idle[key]
+                self._size -= 1
+                expired.append(pooled)
+        for pooled in expired:
+            try:
+                self._close(pooled.connection)
+            except Exception:
+                pass
+        return len(expired)
+    
+    def close(self) -> None:
+        """Close idle connections now and borrowed ones when they come back."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle.values())
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for pooled in idle:
+            self._close(pooled.connection)
+    
+    @property
+    def size(self) -> int:
+        return self._size
+    
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+    
+    @property
+    def in_use(self) -> int:
+        return len(self._in_use)
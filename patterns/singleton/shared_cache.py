@@ -0,0 +1,306 @@
+"""Cross-process Cache backend stored in shared memory.
+
+A pre-fork server (gunicorn-style) normally warms one ``Cache`` per worker.
+``SharedMemoryCache`` keeps the entries in one ``multiprocessing``
+shared-memory block instead, so every process reads and writes the same
+table directly, with no server process and no extra copies.
+
+Layout: a set-associative hash table. The key hash selects one bucket of
+``ways`` fixed-size slots; a full bucket replaces its oldest slot, so the
+table never needs rehashing or probing across buckets. Each bucket starts
+with a sequence counter used as a seqlock: writers take a striped
+process-shared lock and bump the counter before and after writing, readers
+take no lock and retry if the counter moved while they were copying.
+"""
+
+import multiprocessing
+import pickle
+import struct
+import time
+import zlib
+from multiprocessing import shared_memory
+from multiprocessing.context import BaseContext
+from typing import Any, Hashable, Optional, Tuple
+
+
+_SEQ = struct.Struct("<Q")
+_HASH = struct.Struct("<I")
+# stamp, value length, key length, value type
+_SLOT = struct.Struct("<QIHBx")
+
+_BYTES, _STR, _INT, _FLOAT, _PICKLE = range(5)
+_NUMBER = struct.Struct("<q")
+_DOUBLE = struct.Struct("<d")
+
+
+def _encode_key(key: Hashable) -> bytes:
+    if isinstance(key, bytes):
+        return key
+    if isinstance(key, str):
+        return key.encode("utf-8")
+    raise TypeError(f"SharedMemoryCache keys must be str or bytes, not {type(key).__name__}")
+
+
+def _encode_value(value: Any) -> Tuple[int, bytes]:
+    if isinstance(value, bytes):
+        return _BYTES, value
+    if isinstance(value, str):
+        return _STR, value.encode("utf-8")
+    if isinstance(value, int) and not isinstance(value, bool) and -2**63 <= value < 2**63:
+        return _INT, _NUMBER.pack(value)
+    if isinstance(value, float):
+        return _FLOAT, _DOUBLE.pack(value)
+    return _PICKLE, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _decode_value(kind: int, raw: bytes) -> Any:
+    if kind == _BYTES:
+        return raw
+    if kind == _STR:
+        return raw.decode("utf-8")
+    if kind == _INT:
+        return _NUMBER.unpack(raw)[0]
+    if kind == _FLOAT:
+        return _DOUBLE.unpack(raw)[0]
+    return pickle.loads(raw)
+
+
+class SharedMemoryCache:
+    """Fixed-capacity cache shared by every process that inherits or attaches it.
+
+    Create it in the parent before forking (or pass it to
+    ``multiprocessing.Process``); children see the same entries. Keys are
+    ``str``/``bytes`` of at most ``key_size`` bytes; values are stored as
+    typed bytes (bytes, str, int, float, anything else pickled) of at most
+    ``value_size`` bytes. The creating process should call ``unlink()``
+    when the cache is no longer needed.
+
+    The writer locks come from ``context`` (default: the global
+    ``multiprocessing`` context); use the same context that starts the
+    worker processes.
+    """
+    
+    def __init__(self, capacity: int = 65536, key_size: int = 64,
+                 value_size: int = 256, ways: int = 8, lock_stripes: int = 64,
+                 context: Optional[BaseContext] = None):
+        if capacity <= 0 or ways <= 0 or lock_stripes <= 0:
+            raise ValueError("capacity, ways and lock_stripes must be positive")
+        self.key_size = key_size
+        self.value_size = value_size
+        self.ways = ways
+        self.buckets = max(1, -(-capacity // ways))
+        # Bucket header: seqlock counter followed by the key hash of every way
+        self._header = struct.Struct(f"<Q{ways}I")
+        self._header_size = -(-self._header.size // 8) * 8
+        self._slot_size = -(-(_SLOT.size + key_size + value_size) // 8) * 8
+        self._bucket_size = self._header_size + ways * self._slot_size
+        self._shm = shared_memory.SharedMemory(create=True, size=self.buckets * self._bucket_size)
+        self._buf = self._shm.buf
+        context = context or multiprocessing.get_context()
+        self._locks = [context.Lock() for _ in range(lock_stripes)]
+        self._owner = True
+    
+    @property
+    def capacity(self) -> int:
+        return self.buckets * self.ways
+    
+    @property
+    def name(self) -> str:
+        return self._shm.name
+    
+    # ---- pickling: re-attach to the same block in a spawned child ----
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_shm"], state["_buf"], state["_header"]
+        state["_name"] = self._shm.name
+        state["_owner"] = False
+        return state
+    
+    def __setstate__(self, state):
+        name = state.pop("_name")
+        self.__dict__.update(state)
+        # Child processes share the parent's resource tracker, so attaching
+        # here does not unlink the block when the child exits
+        self._shm = shared_memory.SharedMemory(name=name)
+        self._buf = self._shm.buf
+        self._header = struct.Struct(f"<Q{self.ways}I")
+    
+    # ---- table access ----
+    
+    def _locate(self, raw_key: bytes) -> Tuple[int, int]:
+        # Hash 0 marks an empty slot in the bucket header
+        key_hash = zlib.crc32(raw_key) or 1
+        return key_hash, key_hash % self.buckets
+    
+    def _slot(self, base: int, way: int) -> int:
+        return base + self._header_size + way * self._slot_size
+    
+    def _find(self, base: int, key_hash: int, raw_key: bytes) -> int:
+        """Return the way holding the key in a bucket, or -1."""
+        buf = self._buf
+        hashes = self._header.unpack_from(buf, base)
+        way = 0
+        key_len = len(raw_key)
+        while True:
+            try:
+                way = hashes.index(key_hash, way + 1) - 1
+            except ValueError:
+                return -1
+            start = self._slot(base, way) + _SLOT.size
+            if buf[start:start + key_len] == raw_key and \
+                    _SLOT.unpack_from(buf, start - _SLOT.size)[2] == key_len:
+                return way
+            way += 1
+    
+    def _read_slot(self, offset: int) -> Tuple[int, bytes]:
+        _, value_len, _, kind = _SLOT.unpack_from(self._buf, offset)
+        start = offset + _SLOT.size + self.key_size
+        return kind, bytes(self._buf[start:start + value_len])
+    
+    def _read(self, raw_key: bytes) -> Optional[Tuple[int, bytes]]:
+        """Lock-free seqlock read of one key."""
+        key_hash, bucket = self._locate(raw_key)
+        base = bucket * self._bucket_size
+        buf = self._buf
+        while True:
+            before = _SEQ.unpack_from(buf, base)[0]
+            if before & 1:
+                # A writer is mid-update; let it finish
+                time.sleep(0)
+                continue
+            way = self._find(base, key_hash, raw_key)
+            found = self._read_slot(self._slot(base, way)) if way >= 0 else None
+            if _SEQ.unpack_from(buf, base)[0] == before:
+                return found
+    
+    def _write(self, base: int, key_hash: int, raw_key: bytes, kind: int, raw: bytes) -> None:
+        """Store an entry; the caller holds the bucket's stripe lock."""
+        buf = self._buf
+        way = self._find(base, key_hash, raw_key)
+        if way < 0:
+            hashes = self._header.unpack_from(buf, base)[1:]
+            if 0 in hashes:
+                way = hashes.index(0)
+            else:
+                stamps = [_SLOT.unpack_from(buf, self._slot(base, w))[0] for w in range(self.ways)]
+                way = stamps.index(min(stamps))
+        
+        offset = self._slot(base, way)
+        seq = _SEQ.unpack_from(buf, base)[0]
+        _SEQ.pack_into(buf, base, seq + 1)
+        _HASH.pack_into(buf, base + _SEQ.size + way * _HASH.size, key_hash)
+        _SLOT.pack_into(buf, offset, seq + 2, len(raw), len(raw_key), kind)
+        start = offset + _SLOT.size
+        buf[start:start + len(raw_key)] = raw_key
+        start += self.key_size
+        buf[start:start + len(raw)] = raw
+        _SEQ.pack_into(buf, base, seq + 2)
+    
+    def _erase(self, base: int, way: int) -> None:
+        buf = self._buf
+        seq = _SEQ.unpack_from(buf, base)[0]
+        _SEQ.pack_into(buf, base, seq + 1)
+        _HASH.pack_into(buf, base + _SEQ.size + way * _HASH.size, 0)
+        _SEQ.pack_into(buf, base, seq + 2)
+    
+    def _prepare(self, key: Hashable, value: Any) -> Tuple[bytes, int, bytes]:
+        raw_key = _encode_key(key)
+        if len(raw_key) > self.key_size:
+            raise ValueError(f"Key longer than key_size={self.key_size} bytes")
+        kind, raw = _encode_value(value)
+        if len(raw) > self.value_size:
+            raise ValueError(f"Value longer than value_size={self.value_size} bytes")
+        return raw_key, kind, raw
+    
+    # ---- public cache interface ----
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        found = self._read(_encode_key(key))
+        if found is None:
+            return default
+        return _decode_value(*found)
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        raw_key, kind, raw = self._prepare(key, value)
+        key_hash, bucket = self._locate(raw_key)
+        with self._locks[bucket % len(self._locks)]:
+            self._write(bucket * self._bucket_size, key_hash, raw_key, kind, raw)
+    
+    def delete(self, key: Hashable) -> bool:
+        raw_key = _encode_key(key)
+        key_hash, bucket = self._locate(raw_key)
+        base = bucket * self._bucket_size
+        with self._locks[bucket % len(self._locks)]:
+            way = self._find(base, key_hash, raw_key)
+            if way < 0:
+                return False
+            self._erase(base, way)
+            return True
+    
+    def _update(self, key: Hashable, compute) -> Any:
+        """Atomically replace a value with ``compute(current_or_None)``."""
+        raw_key = _encode_key(key)
+        key_hash, bucket = self._locate(raw_key)
+        base = bucket * self._bucket_size
+        with self._locks[bucket % len(self._locks)]:
+            way = self._find(base, key_hash, raw_key)
+            exists = way >= 0
+            current = _decode_value(*self._read_slot(self._slot(base, way))) if exists else None
+            store, result = compute(exists, current)
+            if store is not None:
+                _, kind, raw = self._prepare(key, store[0])
+                self._write(base, key_hash, raw_key, kind, raw)
+            return result
+    
+    def get_or_set(self, key: Hashable, value: Any) -> Any:
+        def compute(exists, current):
+            return (None, current) if exists else ((value,), value)
+        return self._update(key, compute)
+    
+    def incr(self, key: Hashable, delta: int = 1, initial: int = 0) -> int:
+        def compute(exists, current):
+            result = (current if exists else initial) + delta
+            return (result,), result
+        return self._update(key, compute)
+    
+    def compare_and_set(self, key: Hashable, expected: Any, value: Any) -> bool:
+        def compute(exists, current):
+            if current != expected:
+                return None, False
+            return (value,), True
+        return self._update(key, compute)
+    
+    def sweep(self) -> int:
+        # Entries never expire; replacement happens inside full buckets
+        return 0
+    
+    def clear(self) -> None:
+        for bucket in range(self.buckets):
+            base = bucket * self._bucket_size
+            with self._locks[bucket % len(self._locks)]:
+                seq = _SEQ.unpack_from(self._buf, base)[0]
+                _SEQ.pack_into(self._buf, base, seq + 1)
+                self._buf[base + _SEQ.size:base + self._header.size] = bytes(self.ways * _HASH.size)
+                _SEQ.pack_into(self._buf, base, seq + 2)
+    
+    def __len__(self) -> int:
+        """Number of live entries (scans the whole table)."""
+        count = 0
+        for bucket in range(self.buckets):
+            hashes = self._header.unpack_from(self._buf, bucket * self._bucket_size)[1:]
+            count += self.ways - hashes.count(0)
+        return count
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return self._read(_encode_key(key)) is not None
+    
+    def close(self) -> None:
+        """Detach this process from the shared block."""
+        self._buf = None
+        self._shm.close()
+    
+    def unlink(self) -> None:
+        """Free the shared block (owner only); other processes keep their mapping."""
+        if self._owner:
+            self._shm.unlink()
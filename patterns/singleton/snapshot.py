@@ -0,0 +1,247 @@
+"""Binary snapshots of Cache contents for warm starts.
+
+A snapshot is one file holding an open-addressing hash table over its
+records, so it can be memory-mapped and queried key by key without being
+loaded. Layout (little-endian)::
+
+    header   magic "CSNP", version:u16, reserved:u16, entries:u64, slots:u64
+    hashes   slots x u32     0 = empty slot
+    offsets  slots x u64     record offset, per slot
+    records  key kind:u8, value kind:u8, key length:u32, value length:u32,
+             key bytes, value bytes
+
+Keys and values use the typed encoding of ``SharedMemoryCache`` (bytes,
+str, int and float natively, anything else pickled).
+"""
+
+import atexit
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from threading import Condition, Lock, Thread
+from typing import Any, Callable, Hashable, Iterable, Iterator, Optional, Tuple
+
+from .caching import _MISSING
+from .shared_cache import _decode_value, _encode_value
+
+
+MAGIC = b"CSNP"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHQQ")
+_RECORD = struct.Struct("<BBII")
+
+
+def _hash(kind: int, raw: bytes) -> int:
+    return zlib.crc32(raw, kind) or 1
+
+
+def write_snapshot(path: str, items: Iterable[Tuple[Hashable, Any]]) -> int:
+    """Write ``(key, value)`` pairs to ``path`` atomically; returns the count."""
+    encoded = [(_encode_value(key), _encode_value(value)) for key, value in items]
+    slots = 2
+    while slots < 2 * len(encoded):
+        slots *= 2
+    mask = slots - 1
+    hashes = array("I", bytes(4 * slots))
+    offsets = array("Q", bytes(8 * slots))
+    
+    offset = _HEADER.size + 12 * slots
+    records = []
+    for (key_kind, key_raw), (value_kind, value_raw) in encoded:
+        slot = key_hash = _hash(key_kind, key_raw)
+        slot &= mask
+        while hashes[slot]:
+            slot = (slot + 1) & mask
+        hashes[slot] = key_hash
+        offsets[slot] = offset
+        record = _RECORD.pack(key_kind, value_kind, len(key_raw), len(value_raw))
+        records.append(record + key_raw + value_raw)
+        offset += _RECORD.size + len(key_raw) + len(value_raw)
+    if sys.byteorder == "big":
+        hashes.byteswap()
+        offsets.byteswap()
+    
+    # Write aside and rename, so readers only ever see complete snapshots
+    partial = f"{path}.{os.getpid()}.tmp"
+    with open(partial, "wb") as handle:
+        handle.write(_HEADER.pack(MAGIC, VERSION, 0, len(encoded), slots))
+        handle.write(hashes.tobytes())
+        handle.write(offsets.tobytes())
+        handle.writelines(records)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(partial, path)
+    return len(encoded)
+
+
+class SnapshotReader:
+    """Memory-mapped snapshot, consumed one key at a time.
+
+    ``take(key)`` returns a key's value once and then treats the key as
+    gone, which is what lets a cache hydrate lazily: after an entry has
+    moved into the live cache (or was overwritten or deleted there), the
+    snapshot must never serve it again. ``remaining`` counts entries not
+    consumed yet. Lookups and ``close()`` share one lock, so the reader can
+    be closed while other threads still hold a reference to it.
+    """
+    
+    def __init__(self, path: str):
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, entries, slots = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a cache snapshot")
+        start = _HEADER.size
+        if sys.byteorder == "little":
+            self._view = memoryview(self._map)
+            self._hashes = self._view[start:start + 4 * slots].cast("I")
+            self._offsets = self._view[start + 4 * slots:start + 12 * slots].cast("Q")
+        else:
+            self._hashes = array("I", self._map[start:start + 4 * slots])
+            self._offsets = array("Q", self._map[start + 4 * slots:start + 12 * slots])
+            self._hashes.byteswap()
+            self._offsets.byteswap()
+        self._mask = slots - 1
+        self._consumed = bytearray(slots)
+        self._lock = Lock()
+        self.entries = entries
+        self.remaining = entries
+    
+    def _find(self, key: Hashable) -> int:
+        kind, raw = _encode_value(key)
+        key_hash = _hash(kind, raw)
+        hashes, view = self._hashes, self._map
+        slot = key_hash & self._mask
+        while True:
+            stored = hashes[slot]
+            if not stored:
+                return -1
+            if stored == key_hash:
+                offset = self._offsets[slot]
+                key_kind, _, key_length, _ = _RECORD.unpack_from(view, offset)
+                start = offset + _RECORD.size
+                if key_kind == kind and view[start:start + key_length] == raw:
+                    return slot
+            slot = (slot + 1) & self._mask
+    
+    def _record(self, slot: int) -> Tuple[Hashable, Any]:
+        offset = self._offsets[slot]
+        key_kind, value_kind, key_length, value_length = _RECORD.unpack_from(self._map, offset)
+        start = offset + _RECORD.size
+        key = _decode_value(key_kind, self._map[start:start + key_length])
+        start += key_length
+        return key, _decode_value(value_kind, self._map[start:start + value_length])
+    
+    def _consume(self, key: Hashable) -> int:
+        # The caller holds the lock
+        if self._map.closed:
+            return -1
+        slot = self._find(key)
+        if slot < 0 or self._consumed[slot]:
+            return -1
+        self._consumed[slot] = 1
+        self.remaining -= 1
+        return slot
+    
+    def take(self, key: Hashable, default: Any = _MISSING) -> Any:
+        """The key's value if it was not consumed yet; consumes it."""
+        with self._lock:
+            slot = self._consume(key)
+            return default if slot < 0 else self._record(slot)[1]
+    
+    def discard(self, key: Hashable) -> bool:
+        """Consume the key without decoding its value."""
+        with self._lock:
+            return self._consume(key) >= 0
+    
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            if self._map.closed:
+                return False
+            slot = self._find(key)
+            return slot >= 0 and not self._consumed[slot]
+    
+    def items(self) -> Iterator[Tuple[Hashable, Any]]:
+        """Entries not consumed yet."""
+        for slot in range(self._mask + 1):
+            with self._lock:
+                if self._map.closed:
+                    return
+                if not self._hashes[slot] or self._consumed[slot]:
+                    continue
+                record = self._record(slot)
+            yield record
+    
+    @property
+    def closed(self) -> bool:
+        return self._map.closed
+    
+    def close(self) -> None:
+        """Unmap the file; a closed reader behaves as if fully consumed."""
+        with self._lock:
+            if self._map.closed:
+                return
+            if isinstance(self._hashes, memoryview):
+                self._hashes.release()
+                self._offsets.release()
+                self._view.release()
+            self._map.close()
+    
+    def _after_fork_child(self) -> None:
+        self._lock = Lock()
+
+
+class PeriodicSnapshot:
+    """Calls ``take()`` every ``interval`` seconds from a daemon thread.
+
+    Failures are kept in ``last_error`` and retried on the next round.
+    ``close()`` (also run at interpreter exit) stops the thread and takes
+    one final snapshot.
+    """
+    
+    def __init__(self, take: Callable[[], Any], interval: float):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self._take = take
+        self._interval = interval
+        self._cond = Condition(Lock())
+        self._closed = False
+        self.snapshots_taken = 0
+        self.last_error: Optional[BaseException] = None
+        self._thread = Thread(target=self._run, name="cache-snapshot", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def run_once(self) -> None:
+        try:
+            self._take()
+            self.snapshots_taken += 1
+        except Exception as error:
+            self.last_error = error
+    
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.run_once()
+    
+    def _after_fork_child(self) -> None:
+        # The snapshot file belongs to the parent; a child never writes it
+        self._cond = Condition(Lock())
+        self._closed = True
+    
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._closed:
+                    self._cond.wait(self._interval)
+                if self._closed:
+                    return
+            self.run_once()
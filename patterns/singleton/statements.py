@@ -0,0 +1,109 @@
+"""Prepared-statement cache for DatabaseConnection.
+
+Query text is normalized before lookup - comments are dropped, runs of
+whitespace outside string literals collapse to one space and a trailing
+``;`` is dropped - so spellings of the same statement share one entry.
+Each cached statement keeps its own driver cursor, reused on every run
+instead of the cursor ``connection.execute`` would create per call. The
+driver always sees the normalized text, which lets a driver-side plan
+cache keyed by SQL text (like sqlite3's ``cached_statements``) reuse its
+compiled statement too.
+"""
+
+import re
+from collections import OrderedDict
+from typing import Any, Dict
+
+
+# String literals and quoted identifiers are kept verbatim. A run of
+# whitespace and comments - ``--`` to the end of the line, ``/* */`` to its
+# end or, as sqlite reads an unterminated one, the end of the text - is one
+# token that becomes a single space
+_TOKENS = re.compile(r"""'(?:[^']|'')*'|"(?:[^"]|"")*"|(?:\s|--[^\n]*|/\*.*?(?:\*/|\Z))+""",
+                     re.DOTALL)
+
+
+def normalize_sql(sql: str) -> str:
+    """Canonical text of ``sql``: comments dropped, whitespace collapsed outside literals."""
+    normalized = _TOKENS.sub(lambda m: m.group(0) if m.group(0)[0] in "'\"" else " ", sql)
+    return normalized.strip().rstrip(";").rstrip()
+
+
+class PreparedStatement:
+    """A cached statement: its normalized SQL, driver cursor and run count.
+
+    ``handle`` is opened by the connection on first use and stays bound to
+    that driver connection; ``StatementCache.release()`` drops it.
+    """
+    
+    __slots__ = ("sql", "executions", "handle")
+    
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.executions = 0
+        self.handle: Any = None
+
+
+class StatementCache:
+    """Bounded LRU of ``PreparedStatement`` objects keyed by normalized SQL.
+
+    ``hits`` and ``misses`` count lookups; ``evictions`` counts statements
+    dropped for the least recently used one beyond ``capacity``.
+    """
+    
+    def __init__(self, capacity: int = 128):
+        if capacity < 0:
+            raise ValueError("capacity must not be negative")
+        self.capacity = capacity
+        self._statements: "OrderedDict[str, PreparedStatement]" = OrderedDict()
+        # Raw text -> normalized text, so hot queries skip the regex
+        self._normalized: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, sql: str) -> PreparedStatement:
+        key = self._normalized.get(sql)
+        if key is None:
+            key = normalize_sql(sql)
+            if len(self._normalized) >= 4 * max(self.capacity, 1):
+                self._normalized.clear()
+            self._normalized[sql] = key
+        
+        statement = self._statements.get(key)
+        if statement is not None:
+            self._statements.move_to_end(key)
+            self.hits += 1
+            return statement
+        self.misses += 1
+        statement = PreparedStatement(key)
+        if self.capacity:
+            self._statements[key] = statement
+            if len(self._statements) > self.capacity:
+                self._statements.popitem(last=False)
+                self.evictions += 1
+        return statement
+    
+    def release(self, close: bool = True) -> None:
+        """Drop every statement's driver cursor (the connection is going away).
+
+        ``close=False`` only forgets them, for a forked child whose cursors
+        belong to the parent's connection.
+        """
+        for statement in self._statements.values():
+            if close and statement.handle is not None:
+                statement.handle.close()
+            statement.handle = None
+    
+    def clear(self) -> None:
+        self.release()
+        self._statements.clear()
+        self._normalized.clear()
+    
+    def __len__(self) -> int:
+        return len(self._statements)
+    
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
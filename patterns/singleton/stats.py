@@ -0,0 +1,83 @@
+"""Hit/miss/load statistics for the Cache singleton."""
+
+from bisect import bisect_left
+from typing import Any, Dict, Hashable, List, Tuple
+
+
+# Upper bounds (seconds) of the load-time histogram buckets
+LOAD_BUCKETS: Tuple[float, ...] = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05,
+                                   0.1, 0.5, 1.0, 5.0)
+
+
+class CacheStats:
+    """Counters kept by ``Cache(stats=True)``.
+
+    Besides totals, hits and misses are broken down by key prefix - the
+    part of a ``str`` key before ``separator`` (``"user"`` for
+    ``"user:42"``), at most ``max_prefixes`` of them, the rest counted
+    under ``"<other>"``. Loads from ``get_or_load`` are timed into a
+    histogram over ``LOAD_BUCKETS``.
+
+    Counters are updated without a lock: under heavy thread contention
+    they are close approximations, which is all monitoring needs.
+    """
+    
+    def __init__(self, separator: str = ":", max_prefixes: int = 100):
+        self.separator = separator
+        self.max_prefixes = max_prefixes
+        self.reset()
+    
+    def reset(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.load_errors = 0
+        self.load_time = 0.0
+        self.load_histogram: List[int] = [0] * (len(LOAD_BUCKETS) + 1)
+        # prefix -> [hits, misses]
+        self.prefixes: Dict[str, List[int]] = {}
+    
+    def _prefix_counters(self, key: Hashable) -> List[int]:
+        if isinstance(key, str):
+            prefix = key.partition(self.separator)[0]
+        else:
+            prefix = f"<{type(key).__name__}>"
+        counters = self.prefixes.get(prefix)
+        if counters is None:
+            if len(self.prefixes) >= self.max_prefixes:
+                prefix = "<other>"
+            counters = self.prefixes.setdefault(prefix, [0, 0])
+        return counters
+    
+    def hit(self, key: Hashable) -> None:
+        self.hits += 1
+        self._prefix_counters(key)[0] += 1
+    
+    def miss(self, key: Hashable) -> None:
+        self.misses += 1
+        self._prefix_counters(key)[1] += 1
+    
+    def load(self, seconds: float, failed: bool = False) -> None:
+        self.loads += 1
+        if failed:
+            self.load_errors += 1
+        self.load_time += seconds
+        self.load_histogram[bisect_left(LOAD_BUCKETS, seconds)] += 1
+    
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        labels = [f"<={bound:g}s" for bound in LOAD_BUCKETS] + [f">{LOAD_BUCKETS[-1]:g}s"]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "loads": self.loads,
+            "load_errors": self.load_errors,
+            "avg_load_time": self.load_time / self.loads if self.loads else 0.0,
+            "load_time_histogram": dict(zip(labels, self.load_histogram)),
+            "prefixes": {
+                prefix: {"hits": hits, "misses": misses,
+                         "hit_rate": hits / (hits + misses) if hits + misses else 0.0}
+                for prefix, (hits, misses) in sorted(self.prefixes.items())
+            },
+        }
@@ -0,0 +1,29 @@
+"""Shared fixtures for the pattern tests."""
+
+import types
+
+import pytest
+
+
+@pytest.fixture
+def fresh():
+    """Make a throwaway subclass of a singleton class.
+
+    Every class gets an instance (or keyed registry) of its own, so a test
+    never sees another test's singleton: ``fresh(Cache)()`` or, with class
+    options, ``fresh(Endpoint, max_instances=2)``. Instances with a
+    ``close()`` are closed after the test.
+    """
+    made = []
+    
+    def make(singleton_class, **options):
+        cls = types.new_class(f"Fresh{singleton_class.__name__}", (singleton_class,), options)
+        made.append(cls)
+        return cls
+    
+    yield make
+    for cls in made:
+        for instance in cls._live_instances():
+            close = getattr(instance, "close", None)
+            if close is not None:
+                close()
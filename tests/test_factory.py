@@ -0,0 +1,391 @@
+"""Tests for the Factory Method pattern (patterns/factory_method)."""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from patterns.factory_method import after as factory_after
+from patterns.factory_method.after import AWSVPS, GCPVPS, VPS, AzureVPS, FrozenVPS, VPSFactory
+from patterns.factory_method.analytics import (cost_by_config, cost_by_provider, fleet_report,
+                                               project_costs, top_n)
+from patterns.factory_method.deploy import DeploymentOrchestrator
+from patterns.factory_method.fleet import numpy
+from patterns.factory_method.manifest import ManifestLoader
+from patterns.factory_method.plugins import LazyProvider
+from patterns.factory_method.reconcile import Reconciler
+
+
+class TestReconciler:
+    def test_serial_apply_records_only_successful_deploys(self):
+        reconciler = Reconciler()
+        plan, results = reconciler.reconcile([("aws", "web", "small"), ("nope", "x", "small")])
+        
+        assert [(result.name, result.ok) for result in results] == [("web", True), ("x", False)]
+        assert isinstance(results[1].error, ValueError)
+        assert list(reconciler.state) == [("aws", "web")]
+        assert reconciler.plan([("aws", "web", "small")]).create == []
+    
+    def test_only_changed_servers_are_redeployed(self):
+        reconciler = Reconciler(orchestrator=DeploymentOrchestrator(max_concurrency=4))
+        reconciler.reconcile([("aws", f"web{n}", "small") for n in range(5)])
+        plan, results = reconciler.reconcile([("aws", "web0", "large")]
+                                             + [("aws", f"web{n}", "small") for n in range(1, 4)])
+        
+        assert (plan.update, plan.create) == ([("aws", "web0", "large")], [])
+        assert plan.delete == [("aws", "web4")] and [result.name for result in results] == ["web0"]
+        assert sorted(reconciler.state) == [("aws", f"web{n}") for n in range(4)]
+    
+    def test_deploy_one_is_the_serial_step(self):
+        result = DeploymentOrchestrator().deploy_one(("gcp", "db", "large"))
+        
+        assert result.ok and result.message == "Deploying db on GCP with config large"
+
+
+class TestFleet:
+    def test_create_many_matches_create(self):
+        specs = [("aws", "web", "small"), ("gcp", "db", "large"), ("aws", "api", "small")]
+        fleet = VPSFactory.create_many(specs)
+        
+        assert len(fleet) == 3
+        created = [VPSFactory.create(*spec) for spec in specs]
+        assert [(type(vps), vps.name, vps.config) for vps in fleet] == \
+            [(type(vps), vps.name, vps.config) for vps in created]
+        assert isinstance(fleet[-1], AWSVPS) and [vps.name for vps in fleet[1:]] == ["db", "api"]
+    
+    def test_columns_share_codes_for_repeated_values(self):
+        fleet = VPSFactory.create_many([("aws", f"web{n}", "small") for n in range(5)]
+                                       + [("gcp", "db", "small")])
+        
+        assert fleet.provider_keys == ["aws", "gcp"] and fleet.configs == ["small"]
+        assert list(fleet.column("provider_codes", use_numpy=False)) == [0] * 5 + [1]
+        assert fleet.pair_counts == {(0, 0): 5, (1, 0): 1}
+        assert list(fleet.rows())[-1] == ("gcp", "db", "small", 48.0)
+    
+    def test_total_cost_sums_every_server(self):
+        fleet = VPSFactory.create_many([("aws", "a", "x"), ("azure", "b", "x"), ("aws", "c", "y")])
+        
+        assert fleet.total_cost() == 50.0 + 55.0 + 50.0
+    
+    def test_unknown_provider_is_refused(self):
+        with pytest.raises(ValueError):
+            VPSFactory.create_many([("aws", "a", "x"), ("nope", "b", "x")])
+
+
+both_paths = pytest.mark.parametrize("use_numpy", [
+    False, pytest.param(True, marks=pytest.mark.skipif(numpy is None, reason="needs numpy"))])
+
+
+class TestFleetAnalytics:
+    def fleet(self):
+        return VPSFactory.create_many([("aws", "a", "small"), ("azure", "b", "large"),
+                                       ("gcp", "c", "small"), ("azure", "d", "small"),
+                                       ("aws", "e", "large")])
+    
+    @both_paths
+    def test_costs_by_provider_and_config(self, use_numpy):
+        fleet = self.fleet()
+        
+        assert cost_by_provider(fleet, use_numpy) == {"aws": 100.0, "azure": 110.0, "gcp": 48.0}
+        assert cost_by_config(fleet, use_numpy) == {"small": 153.0, "large": 105.0}
+    
+    @both_paths
+    def test_top_n_is_dearest_first_in_row_order(self, use_numpy):
+        fleet = self.fleet()
+        
+        assert [name for _, name, _, _ in top_n(fleet, 3, use_numpy)] == ["b", "d", "a"]
+        assert len(top_n(fleet, 10, use_numpy)) == 5 and top_n(fleet, 0, use_numpy) == []
+    
+    @both_paths
+    def test_projection_compounds_growth(self, use_numpy):
+        fleet = self.fleet()
+        
+        assert project_costs(fleet, 3, growth=0.5, use_numpy=use_numpy) == [258.0, 387.0, 580.5]
+        assert project_costs(fleet, 3, cumulative=True, use_numpy=use_numpy) == \
+            [258.0, 516.0, 774.0]
+        with pytest.raises(ValueError):
+            project_costs(fleet, -1, use_numpy=use_numpy)
+    
+    def test_report_combines_everything(self):
+        report = fleet_report(self.fleet(), months=2, top=1)
+        
+        assert (report["servers"], report["monthly_cost"], report["projected_total"]) == \
+            (5, 258.0, 516.0)
+        assert report["top"] == [("azure", "b", "large", 55.0)]
+
+
+class TestCompactVPS:
+    def test_instances_are_slotted_and_share_configs(self):
+        first = VPSFactory.create("aws", "web", "".join(["t2.", "micro"]))
+        second = VPSFactory.create("gcp", "db", "".join(["t2.", "micro"]))
+        
+        assert not hasattr(first, "__dict__")
+        assert first.config is second.config
+    
+    def test_subclass_without_slots_still_works(self):
+        class LinodeVPS(VPS):
+            def deploy(self):
+                return f"Deploying {self.name}"
+            
+            def get_cost(self):
+                return 46.0
+        
+        vps = LinodeVPS("edge", "nanode")
+        vps.region = "eu"
+        assert (vps.name, vps.config, vps.region) == ("edge", "nanode", "eu")
+    
+    def test_frozen_vps_round_trips_and_hashes(self):
+        vps = VPSFactory.create("azure", "app", "B2s")
+        frozen = VPSFactory.freeze(vps)
+        
+        assert frozen == FrozenVPS("azure", "app", "B2s")
+        assert len({frozen, FrozenVPS("azure", "app", "B2s")}) == 1
+        thawed = frozen.thaw()
+        assert type(thawed) is AzureVPS and (thawed.name, thawed.config) == ("app", "B2s")
+    
+    def test_freeze_needs_a_registered_class(self):
+        class Unregistered(AWSVPS):
+            __slots__ = ()
+        
+        with pytest.raises(ValueError):
+            VPSFactory.freeze(Unregistered("x", "y"))
+
+
+class TestDeploymentOrchestrator:
+    def concurrency_probe(self):
+        """Delay hook recording how many deploys per provider overlap."""
+        lock = threading.Lock()
+        running, peaks = Counter(), Counter()
+        
+        def delay(provider_type):
+            with lock:
+                running[provider_type] += 1
+                running["all"] += 1
+                peaks[provider_type] = max(peaks[provider_type], running[provider_type])
+                peaks["all"] = max(peaks["all"], running["all"])
+            time.sleep(0.01)
+            with lock:
+                running[provider_type] -= 1
+                running["all"] -= 1
+            return 0.0
+        
+        return delay, peaks
+    
+    def test_concurrency_is_bounded_overall_and_per_provider(self):
+        delay, peaks = self.concurrency_probe()
+        orchestrator = DeploymentOrchestrator(max_concurrency=4, provider_limits={"aws": 1},
+                                              delay=delay)
+        specs = [(provider, f"{provider}{n}", "small") for provider in ("aws", "gcp", "azure")
+                 for n in range(6)]
+        results = orchestrator.deploy(specs)
+        
+        assert sorted(result.name for result in results) == sorted(name for _, name, _ in specs)
+        assert all(result.ok for result in results)
+        assert peaks["aws"] == 1 and 1 < peaks["all"] <= 4
+    
+    def test_rate_limit_spaces_out_deploys(self):
+        orchestrator = DeploymentOrchestrator(rate_limits={"aws": 50})
+        started = time.perf_counter()
+        orchestrator.deploy([("aws", f"web{n}", "small") for n in range(60)])
+        
+        # The bucket starts with a burst of 50; the other 10 wait 1/50 s each
+        assert time.perf_counter() - started >= 0.15
+    
+    def test_failures_come_back_as_results(self):
+        def delay(provider_type):
+            if provider_type == "gcp":
+                raise TimeoutError("provider API down")
+            return 0.0
+        
+        results = DeploymentOrchestrator(delay=delay).deploy(
+            [("aws", "a", "x"), ("gcp", "b", "x"), ("nope", "c", "x")])
+        errors = {result.name: type(result.error) for result in results if not result.ok}
+        
+        assert errors == {"b": TimeoutError, "c": ValueError}
+    
+    def test_asyncio_backend_deploys_a_fleet(self):
+        fleet = VPSFactory.create_many([("aws", f"web{n}", "small") for n in range(10)])
+        results = asyncio.run(DeploymentOrchestrator(max_concurrency=3).adeploy(fleet))
+        
+        assert sorted(result.name for result in results) == sorted(fleet.names)
+        assert results[0].message.startswith("Deploying web")
+    
+    @pytest.mark.parametrize("options", [{"provider_limits": {"aws": 0}},
+                                         {"rate_limits": {"aws": 0}},
+                                         {"rate_limits": {"aws": -1.0}},
+                                         {"max_concurrency": 0}])
+    def test_limits_must_be_positive(self, options):
+        with pytest.raises(ValueError):
+            DeploymentOrchestrator(**options)
+
+
+class TestManifestLoader:
+    def write_jsonl(self, tmp_path, records):
+        path = tmp_path / "fleet.jsonl"
+        path.write_text("\n".join(json.dumps(record) for record in records) + "\n")
+        return str(path)
+    
+    def test_jsonl_streams_specs_and_vps_objects(self, tmp_path):
+        path = self.write_jsonl(tmp_path, [
+            {"provider": "aws", "name": f"web{n}", "config": "small"} for n in range(5)])
+        loader = ManifestLoader(path, chunk_size=2)
+        
+        assert [len(chunk) for chunk in loader.spec_chunks()] == [2, 2, 1]
+        assert [vps.name for vps in ManifestLoader(path)] == [f"web{n}" for n in range(5)]
+        assert loader.loaded == 5 and loader.skipped == 0
+    
+    def test_csv_columns_are_found_by_header(self, tmp_path):
+        path = tmp_path / "fleet.csv"
+        path.write_text("config,name,provider\nsmall,web,aws\nlarge,\"db, primary\",gcp\n")
+        fleets = list(ManifestLoader(str(path)).batches())
+        
+        assert [list(fleet.rows()) for fleet in fleets] == \
+            [[("aws", "web", "small", 50.0), ("gcp", "db, primary", "large", 48.0)]]
+    
+    def test_invalid_records_raise_with_their_line_number(self, tmp_path):
+        path = self.write_jsonl(tmp_path, [{"provider": "aws", "name": "a", "config": "x"},
+                                           {"provider": "nope", "name": "b", "config": "x"}])
+        
+        with pytest.raises(ValueError, match="line 2: unknown provider"):
+            list(ManifestLoader(path).specs())
+    
+    def test_errors_skip_counts_what_it_drops(self, tmp_path):
+        path = tmp_path / "fleet.jsonl"
+        path.write_text('{"provider": "aws", "name": "a", "config": "x"}\n'
+                        'not json\n'
+                        '\n'
+                        '[1, 2]\n'
+                        '{"provider": "gcp", "name": 7, "config": "x"}\n'
+                        '{"provider": "gcp", "name": "b", "config": "x"}\n')
+        loader = ManifestLoader(str(path), errors="skip")
+        
+        assert [name for _, name, _ in loader.specs()] == ["a", "b"]
+        assert loader.skipped == 3
+    
+    def test_csv_without_required_columns_is_refused(self, tmp_path):
+        path = tmp_path / "fleet.csv"
+        path.write_text("provider,name\naws,web\n")
+        
+        with pytest.raises(ValueError, match="config"):
+            list(ManifestLoader(str(path)).specs())
+    
+    def test_worker_processes_keep_the_order(self, tmp_path):
+        records = [{"provider": "azure", "name": f"n{n}", "config": "x"} for n in range(50)]
+        loader = ManifestLoader(self.write_jsonl(tmp_path, records), chunk_size=7, processes=2)
+        
+        assert [name for _, name, _ in loader.specs()] == [f"n{n}" for n in range(50)]
+
+
+PLUGIN = '''
+from patterns.factory_method.after import VPS
+
+
+class EdgeVPS(VPS):
+    __slots__ = ()
+
+    def deploy(self):
+        return f"Deploying {self.name} at the edge"
+
+    def get_cost(self):
+        return 7.0
+
+
+NOT_A_VPS = object()
+'''
+
+
+class TestLazyPlugins:
+    @pytest.fixture
+    def plugin(self, tmp_path, monkeypatch):
+        name = f"edge_plugin_{tmp_path.name}"
+        (tmp_path / f"{name}.py").write_text(PLUGIN)
+        monkeypatch.syspath_prepend(str(tmp_path))
+        yield name
+        sys.modules.pop(name, None)
+    
+    def test_plugin_is_imported_on_first_create(self, plugin):
+        with VPSFactory.scoped() as factory:
+            factory.register("edge", f"{plugin}:EdgeVPS")
+            assert plugin not in sys.modules and "edge" in factory.get_providers()
+            
+            vps = factory.create("edge", "cdn", "tiny")
+            assert plugin in sys.modules and vps.get_cost() == 7.0
+            assert factory._creators["edge"] is type(vps)
+    
+    def test_bad_paths_and_targets_are_refused(self, plugin):
+        with pytest.raises(ValueError):
+            LazyProvider("no_colon_here")
+        with VPSFactory.scoped() as factory:
+            factory.register("broken", f"{plugin}:NOT_A_VPS")
+            with pytest.raises(TypeError):
+                factory.create("broken", "x", "y")
+    
+    def test_discovered_providers_stay_lazy_and_do_not_override(self, plugin, monkeypatch):
+        monkeypatch.setattr(factory_after, "entry_point_targets",
+                            lambda group: {"edge": f"{plugin}:EdgeVPS", "aws": f"{plugin}:EdgeVPS"})
+        with VPSFactory.scoped() as factory:
+            assert factory.discover_providers() == ["edge"]
+            assert isinstance(factory._creators["edge"], LazyProvider)
+            assert factory._creators["aws"] is AWSVPS
+            assert factory.create("edge", "cdn", "tiny").deploy() == "Deploying cdn at the edge"
+
+
+class TestProviderRegistry:
+    def test_namespaces_are_isolated_but_see_their_parent_live(self):
+        with VPSFactory.scoped() as base:
+            tenant, other = base.namespace("tenant"), base.namespace("other")
+            tenant.register("edge", GCPVPS)
+            base.register("linode", AzureVPS)
+            
+            assert base.namespace("tenant") is tenant
+            assert "edge" in tenant.get_providers() and "edge" not in other.get_providers()
+            assert "edge" not in base.get_providers()
+            assert type(other.create("linode", "x", "y")) is AzureVPS
+    
+    def test_child_registrations_shadow_without_leaking(self):
+        with VPSFactory.scoped() as factory:
+            factory.register("aws", GCPVPS)
+            
+            assert type(factory.create("aws", "x", "y")) is GCPVPS
+            assert not factory.namespace("t").unregister("aws")
+            assert factory.unregister("aws") and type(factory.create("aws", "x", "y")) is AWSVPS
+        assert type(VPSFactory.create("aws", "x", "y")) is AWSVPS
+    
+    def test_scoped_registrations_disappear(self):
+        with VPSFactory.scoped() as factory:
+            factory.register("temp", GCPVPS)
+        
+        assert "temp" not in VPSFactory.get_providers()
+        with pytest.raises(ValueError):
+            VPSFactory.create("temp", "x", "y")
+    
+    def test_reads_never_fail_during_writes(self):
+        with VPSFactory.scoped() as factory:
+            stop = threading.Event()
+            failures = []
+            
+            def read():
+                while not stop.is_set():
+                    try:
+                        for _ in factory._creators.items():
+                            pass
+                        factory.create("aws", "x", "y")
+                    except Exception as error:
+                        failures.append(error)
+                        return
+            
+            readers = [threading.Thread(target=read) for _ in range(4)]
+            for thread in readers:
+                thread.start()
+            for number in range(500):
+                factory.register(f"burst{number % 7}", GCPVPS)
+                factory.unregister(f"burst{(number + 3) % 7}")
+            stop.set()
+            for thread in readers:
+                thread.join()
+        
+        assert failures == []
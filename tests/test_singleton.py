@@ -0,0 +1,795 @@
+"""Tests for the Singleton pattern (patterns/singleton)."""
+
+import asyncio
+import gc
+import io
+import os
+import sqlite3
+import struct
+import time
+import zlib
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from patterns.singleton.after import (ERROR, INFO, WARNING, AsyncDatabaseConnection, Cache,
+                                      DatabaseConnection, Logger, Singleton)
+from patterns.singleton.async_db import FakeDatabaseServer, QueryBatcher
+from patterns.singleton.caching import BoundedCache, ShardedCache
+from patterns.singleton.compact import CompactCache
+from patterns.singleton.cursor import to_columns
+from patterns.singleton.log_buffer import BufferedLogWriter
+from patterns.singleton.log_store import LogRecord, SegmentedLogStore
+from patterns.singleton.pool import ConnectionPool, PoolTimeoutError, sqlite_connector
+from patterns.singleton.shared_cache import SharedMemoryCache
+from patterns.singleton.snapshot import SnapshotReader
+from patterns.singleton.statements import normalize_sql
+
+
+class Endpoint(Singleton, keyed=True):
+    def __init__(self, host):
+        self.host = host
+
+
+class Counter(Singleton):
+    created = 0
+    
+    def __init__(self, start=0):
+        type(self).created += 1
+        self.value = start
+
+
+class TestSingletonFastPath:
+    def test_init_runs_once(self, fresh):
+        Once = fresh(Counter)
+        first = Once(5)
+        first.value = 7
+        
+        assert Once(9) is first and first.value == 7 and Once.created == 1
+    
+    def test_direct_publishes_the_instance(self, fresh):
+        Direct = fresh(Counter, direct=True)
+        assert Direct.instance is None
+        
+        assert Direct(3) is Direct.instance and Direct.instance.value == 3
+    
+    def test_subclasses_do_not_share_instances(self, fresh):
+        Base = fresh(Counter)
+        Derived = fresh(Base)
+        
+        assert Base() is not Derived() and type(Derived()) is Derived
+    
+    def test_concurrent_first_calls_create_one_instance(self, fresh):
+        Slow = fresh(Counter)
+        original_init = Slow.__init__
+        
+        def slow_init(self, start=0):
+            time.sleep(0.01)
+            original_init(self, start)
+        
+        Slow.__init__ = slow_init
+        with ThreadPoolExecutor(8) as pool:
+            instances = list(pool.map(lambda _: Slow(), range(8)))
+        
+        assert len({id(instance) for instance in instances}) == 1 and Slow.created == 1
+    
+    def test_keyed_classes_ignore_direct(self, fresh):
+        assert not hasattr(fresh(Endpoint, direct=True), "instance")
+
+
+class TestKeyedSingleton:
+    def test_connection_survives_without_references(self, fresh, capsys):
+        Connection = fresh(DatabaseConnection)
+        Connection.get_instance("db-keep", 5432, "app").connect()
+        gc.collect()
+        result = Connection.get_instance("db-keep", 5432, "app").execute_query("SELECT 1")
+        
+        assert result == "Executing: SELECT 1"
+        assert capsys.readouterr().out.count("Creating SINGLE database connection") == 1
+    
+    def test_weak_registry_is_opt_in(self, fresh):
+        WeakEndpoint = fresh(Endpoint, weak=True)
+        WeakEndpoint("a")
+        gc.collect()
+        assert len(WeakEndpoint._registry) == 0
+    
+    def test_max_instances_evicts_least_recently_used(self, fresh):
+        CappedEndpoint = fresh(Endpoint, max_instances=2)
+        first = CappedEndpoint("a")
+        CappedEndpoint("b")
+        assert CappedEndpoint("a") is first
+        CappedEndpoint("c")
+        assert list(CappedEndpoint._registry) == [("a",), ("c",)]
+
+
+class TestCacheWriteBehind:
+    def test_every_mutator_is_written_behind(self, fresh):
+        written = {}
+        cache = fresh(Cache)(write_behind=written.update, write_interval=60)
+        cache.incr("cnt")
+        cache.incr("cnt")
+        cache.get_or_set("name", "alice")
+        cache.get_or_set("name", "bob")
+        cache.set("state", "new")
+        assert cache.compare_and_set("state", "new", "done")
+        assert not cache.compare_and_set("state", "new", "lost")
+        cache.flush()
+        
+        assert written == {"cnt": 2, "name": "alice", "state": "done"}
+    
+    def test_delete_cancels_pending_write(self, fresh):
+        written = {}
+        cache = fresh(Cache)(write_behind=written.update, write_interval=60)
+        cache.set("gone", 1)
+        cache.delete("gone")
+        cache.flush()
+        
+        assert written == {}
+
+
+class TestLoggerLevels:
+    def test_legacy_log_respects_threshold(self, fresh, capsys):
+        logger = fresh(Logger)(level=WARNING)
+        logger.log("legacy info message")
+        
+        assert "legacy info message" not in capsys.readouterr().out
+        assert logger.get_logs() == []
+    
+    def test_legacy_log_emits_at_info(self, fresh, capsys):
+        logger = fresh(Logger)(level=INFO)
+        logger.log("legacy info message")
+        
+        assert "[LOG] legacy info message" in capsys.readouterr().out
+
+
+def in_forked_child(check) -> str:
+    """Run ``check()`` in a forked child and return what it reported."""
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_end)
+        try:
+            report = repr(check())
+        except BaseException as error:
+            report = f"error: {error!r}"
+        os.write(write_end, report.encode())
+        os._exit(0)
+    os.close(write_end)
+    with os.fdopen(read_end) as reader:
+        report = reader.read()
+    os.waitpid(pid, 0)
+    return report
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+class TestForkPolicies:
+    def test_reset_builds_a_new_instance_in_the_child(self, fresh):
+        Reset = fresh(Counter, fork_policy="reset")
+        parent = Reset(5)
+        parent.value = 7
+        
+        report = in_forked_child(lambda: (Reset._instance is None, Reset().value))
+        assert report == "(True, 0)"
+        assert Reset() is parent and parent.value == 7
+    
+    def test_recreate_reruns_the_constructor_with_its_arguments(self, fresh):
+        Recreate = fresh(Counter, fork_policy="recreate")
+        Recreate(5).value = 7
+        
+        report = in_forked_child(lambda: (Recreate.created, Recreate().value))
+        assert report == "(2, 5)"
+    
+    def test_keep_leaves_the_parent_instance(self, fresh):
+        Keep = fresh(Counter, fork_policy="keep")
+        parent = Keep(5)
+        parent.value = 7
+        
+        report = in_forked_child(lambda: (Keep.created, Keep() is parent, Keep().value))
+        assert report == "(1, True, 7)"
+    
+    def test_database_connection_is_not_inherited(self, fresh):
+        Connection = fresh(DatabaseConnection)
+        db = Connection("db-fork", 5432, "app")
+        db.connect()
+        
+        report = in_forked_child(lambda: Connection("db-fork", 5432, "app").is_connected)
+        assert report == "False"
+        assert db.is_connected
+
+
+class TestAsyncDatabaseConnection:
+    def test_aexecute_takes_params_and_uses_the_statement_cache(self, fresh):
+        db = fresh(AsyncDatabaseConnection)("db-async", 5432, "app", FakeDatabaseServer(latency=0))
+        db.connect()
+        
+        async def run():
+            return await asyncio.gather(db.aexecute("SELECT ?", (1,)),
+                                        db.aexecute("SELECT  ?;", (2,)))
+        
+        assert asyncio.run(run()) == ["Executing: SELECT ? (1,)", "Executing: SELECT ? (2,)"]
+        assert (db.statements.misses, db.statements.hits) == (1, 1)
+    
+    def test_sync_driver_methods_raise(self, fresh):
+        db = fresh(AsyncDatabaseConnection)("db-async", 5432, "app")
+        
+        with pytest.raises(TypeError):
+            db.execute("SELECT ?", (1,))
+        with pytest.raises(TypeError):
+            db.cursor("SELECT 1")
+
+
+class TestQueryBatcher:
+    def test_concurrent_queries_share_one_round_trip(self):
+        server = FakeDatabaseServer(latency=0)
+        
+        async def run():
+            batcher = QueryBatcher(server.query_batch)
+            return await asyncio.gather(*(batcher.submit(f"SELECT {n}") for n in range(5)))
+        
+        assert asyncio.run(run()) == [f"Executing: SELECT {n}" for n in range(5)]
+        assert (server.round_trips, server.queries) == (1, 5)
+    
+    def test_failed_round_trip_fails_the_whole_batch(self):
+        async def send_batch(queries):
+            raise ConnectionError("reset")
+        
+        async def run():
+            batcher = QueryBatcher(send_batch)
+            return await asyncio.gather(batcher.submit("a"), batcher.submit("b"),
+                                        return_exceptions=True)
+        
+        assert [type(error) for error in asyncio.run(run())] == [ConnectionError] * 2
+    
+    def test_short_reply_fails_the_unmatched_queries(self):
+        async def send_batch(queries):
+            return queries[:1]
+        
+        async def run():
+            batcher = QueryBatcher(send_batch)
+            futures = [batcher.submit("a"), batcher.submit("b"), batcher.submit("c")]
+            return await asyncio.wait_for(asyncio.gather(*futures, return_exceptions=True), 1)
+        
+        first, *rest = asyncio.run(run())
+        assert first == "a" and [type(error) for error in rest] == [RuntimeError] * 2
+
+
+class TestStatementCache:
+    def test_line_comment_does_not_swallow_the_query(self):
+        sql = "SELECT x -- note\nFROM t WHERE x > ?"
+        assert normalize_sql(sql) == "SELECT x FROM t WHERE x > ?"
+    
+    def test_comments_are_dropped_outside_literals_only(self):
+        sql = "SELECT '-- kept', \"/* kept */\" /* block\ncomment */ FROM t;"
+        assert normalize_sql(sql) == "SELECT '-- kept', \"/* kept */\" FROM t"
+    
+    def test_commented_query_runs_on_a_reused_cursor(self, fresh):
+        def driver():
+            connection = sqlite3.connect(":memory:")
+            connection.execute("CREATE TABLE t (x INTEGER)")
+            connection.executemany("INSERT INTO t VALUES (?)", [(1,), (5,), (9,)])
+            return connection
+        
+        db = fresh(DatabaseConnection)("sqlite", 0, "statements-test", driver=driver)
+        db.connect()
+        try:
+            first = db.execute("SELECT x -- note\nFROM t WHERE x > ?", (2,))
+            handle = db.statements.get("SELECT x FROM t WHERE x > ?").handle
+            second = db.execute("SELECT x FROM t WHERE x > ?", (6,))
+            
+            assert (first, second) == ([(5,), (9,)], [(9,)])
+            assert handle is not None
+            assert db.statements.get("SELECT x FROM t WHERE x > ?").handle is handle
+        finally:
+            db.close()
+        assert db.statements.get("SELECT x FROM t WHERE x > ?").handle is None
+
+
+class TestAdmission:
+    def full_cache(self):
+        cache = BoundedCache(capacity=4, admission="tinylfu")
+        for key in "abcd":
+            for _ in range(5):
+                cache.get(key)
+            cache.set(key, key)
+        return cache
+    
+    def test_set_of_a_cold_key_can_be_refused(self):
+        cache = self.full_cache()
+        cache.set("cold", 1)
+        
+        assert "cold" not in cache and cache.rejections == 1
+    
+    def test_incr_always_stores(self):
+        cache = self.full_cache()
+        
+        assert [cache.incr("counter") for _ in range(5)] == [1, 2, 3, 4, 5]
+        assert cache.get("counter") == 5
+    
+    def test_get_or_set_stores_what_it_returns(self):
+        cache = self.full_cache()
+        
+        assert cache.get_or_set("k", "v") == "v"
+        assert "k" in cache
+    
+    def test_compare_and_set_on_absent_key_stores(self):
+        cache = self.full_cache()
+        
+        assert cache.compare_and_set("k", None, "v")
+        assert cache.get("k") == "v"
+    
+    def test_miss_then_set_counts_as_one_access(self):
+        cache = BoundedCache(capacity=4, admission="tinylfu")
+        cache.get("k")
+        cache.set("k", 1)
+        
+        assert cache._admission.sketch.estimate("k") == 1
+        assert cache.peek("k") == 1 and cache._admission.sketch.estimate("k") == 1
+    
+    def test_read_through_miss_counts_as_one_access(self, fresh):
+        cache = fresh(Cache)(capacity=2, admission="tinylfu")
+        cache.set("a", "hot")
+        cache.get("a")
+        cache.set("b", "hot")
+        cache.get("b")
+        for number in range(3):
+            cache.get_or_load(f"once{number}", str.upper)
+        
+        assert ("a" in cache, "b" in cache, "once0" in cache) == (True, True, False)
+
+
+class TestCompactCache:
+    def test_overlong_key_is_refused_before_any_write(self):
+        cache = CompactCache()
+        cache.set("short", 1)
+        
+        with pytest.raises(ValueError):
+            cache.set("x" * 70000, 1)
+        with pytest.raises(ValueError):
+            cache.get("x" * 70000)
+        assert cache.get("short") == 1 and len(cache) == 1
+        cache.set("other", 2)
+        assert cache.get("other") == 2
+    
+    def test_values_round_trip_with_their_type(self):
+        cache = CompactCache()
+        values = {"i": -2**63, "f": 0.1, "b": b"\x00raw", "s": "тест", b"bytes-key": 1}
+        for key, value in values.items():
+            cache.set(key, value)
+        cache.set("i", "now a string")
+        
+        assert cache.get("i") == "now a string" and cache.get("s") == "тест"
+        assert cache.get(b"bytes-key") == 1 and cache.get("bytes-key") is None
+        assert sorted(cache.items(), key=repr) == sorted(
+            [(key, value) for key, value in values.items() if key != "i"]
+            + [("i", "now a string")], key=repr)
+    
+    def test_unsupported_values_are_refused(self):
+        cache = CompactCache()
+        for value in (True, None, [1], 2**64):
+            with pytest.raises(TypeError):
+                cache.set("k", value)
+        assert len(cache) == 0
+    
+    def test_clock_eviction_spares_recently_hit_keys(self):
+        cache = CompactCache(capacity=3)
+        for key in "abcd":
+            cache.set(key, 1)
+        assert "a" not in cache
+        cache.get("b")
+        cache.set("e", 1)
+        
+        assert sorted(key for key, _ in cache.items()) == ["b", "d", "e"]
+        assert cache.evictions == 2
+    
+    def test_churn_is_compacted_away(self):
+        cache = CompactCache()
+        for number in range(5000):
+            cache.set(f"key{number}", f"value{number}")
+        full = cache.memory_bytes
+        for number in range(5000):
+            if number % 10:
+                cache.delete(f"key{number}")
+        cache.set("after", "churn")
+        
+        assert len(cache) == 501 and cache.memory_bytes < full
+        assert all(cache.get(f"key{n}") == f"value{n}" for n in range(0, 5000, 10))
+    
+    def test_atomic_mutators(self):
+        cache = CompactCache()
+        
+        assert [cache.incr("n", 2) for _ in range(3)] == [2, 4, 6]
+        assert cache.get_or_set("k", "v") == "v" and cache.get_or_set("k", "w") == "v"
+        assert cache.compare_and_set("k", "v", "w") and not cache.compare_and_set("k", "v", "x")
+        assert cache.compare_and_set("absent", None, 1.5) and cache.get("absent") == 1.5
+    
+    def test_cache_rejects_options_compact_storage_ignores(self, fresh):
+        CompactStorageCache = fresh(Cache)
+        for option in ({"ttl": 60}, {"max_bytes": 1 << 20}, {"policy": "lfu"},
+                       {"admission": "tinylfu"}, {"shards": 4}):
+            with pytest.raises(ValueError):
+                CompactStorageCache(capacity=10, storage="compact", **option)
+        assert CompactStorageCache(capacity=10, storage="compact").get("k") is None
+
+
+class TestBoundedCache:
+    def test_lru_evicts_least_recently_used(self):
+        cache = BoundedCache(capacity=2, policy="lru")
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert sorted(cache.data) == ["a", "c"] and cache.evictions == 1
+    
+    def test_lfu_does_not_evict_the_key_being_stored(self):
+        cache = BoundedCache(capacity=2, policy="lfu")
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.get("b")
+        cache.set("c", 3)
+        
+        assert cache.get("c") == 3 and len(cache) == 2
+    
+    def test_lfu_keeps_new_counters_and_defaults(self):
+        cache = BoundedCache(capacity=2, policy="lfu")
+        for key in "ab":
+            cache.set(key, 0)
+            cache.get(key)
+        
+        assert cache.incr("hits") == 1 and cache.get("hits") == 1
+        assert cache.get_or_set("name", "v") == "v" and cache.get("name") == "v"
+    
+    def test_max_bytes_bounds_the_estimate(self):
+        cache = BoundedCache(max_bytes=1000, sizeof=lambda key, value: 300)
+        for key in "abcd":
+            cache.set(key, key)
+        
+        assert sorted(cache.data) == ["b", "c", "d"] and cache.size_bytes == 900
+    
+    def test_ttl_expires_entries(self):
+        now = [0.0]
+        cache = BoundedCache(ttl=10, clock=lambda: now[0])
+        cache.set("a", 1)
+        now[0] = 5.0
+        cache.set("b", 2)
+        now[0] = 12.0
+        
+        assert cache.get("a") is None and cache.get("b") == 2
+        assert cache.sweep(now=16.0) == 1 and len(cache) == 0
+
+
+class TestShardedCache:
+    def test_segment_limits_add_up_to_capacity(self):
+        cache = ShardedCache(shards=4, capacity=10, max_bytes=1001)
+        segments = [segment for _, segment in cache._shards]
+        
+        assert [segment.capacity for segment in segments] == [3, 3, 2, 2]
+        assert sum(segment.max_bytes for segment in segments) == 1001
+    
+    def test_never_holds_more_than_capacity(self):
+        cache = ShardedCache(shards=16, capacity=10)
+        for key in range(100):
+            cache.set(key, key)
+        
+        assert len(cache) <= 10
+    
+    def test_atomic_mutators_route_to_one_segment(self):
+        cache = ShardedCache(shards=4)
+        
+        assert [cache.incr("n") for _ in range(3)] == [1, 2, 3]
+        assert cache.get_or_set("k", "v") == "v" and cache.get_or_set("k", "w") == "v"
+        assert cache.compare_and_set("k", "v", "w") and cache.get("k") == "w"
+
+
+@pytest.fixture
+def shared_cache():
+    caches = []
+    
+    def make(**options):
+        caches.append(SharedMemoryCache(**options))
+        return caches[-1]
+    
+    yield make
+    for cache in caches:
+        cache.close()
+        cache.unlink()
+
+
+class TestSharedMemoryCache:
+    def test_values_keep_their_type(self, shared_cache):
+        cache = shared_cache(capacity=64)
+        values = {"b": b"raw", "s": "text", "i": -7, "f": 0.5, "big": 2**70, "t": (1, "x")}
+        for key, value in values.items():
+            cache.set(key, value)
+        
+        assert {key: cache.get(key) for key in values} == values
+        assert cache.get("missing", "default") == "default" and len(cache) == len(values)
+    
+    def test_full_bucket_replaces_its_oldest_entry(self, shared_cache):
+        cache = shared_cache(capacity=2, ways=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("a", 3)
+        cache.set("c", 4)
+        
+        assert ("a" in cache, "b" in cache, cache.get("c")) == (True, False, 4)
+    
+    def test_atomic_mutators_and_delete(self, shared_cache):
+        cache = shared_cache(capacity=16)
+        
+        assert [cache.incr("n") for _ in range(3)] == [1, 2, 3]
+        assert cache.get_or_set("k", "v") == "v" and cache.get_or_set("k", "w") == "v"
+        assert cache.compare_and_set("k", "v", "w") and not cache.compare_and_set("k", "v", "x")
+        assert cache.delete("k") and not cache.delete("k")
+        cache.clear()
+        assert len(cache) == 0
+    
+    def test_oversized_keys_and_values_are_refused(self, shared_cache):
+        cache = shared_cache(capacity=16, key_size=4, value_size=8)
+        
+        with pytest.raises(ValueError):
+            cache.set("toolong", 1)
+        with pytest.raises(ValueError):
+            cache.set("k", "x" * 9)
+        with pytest.raises(TypeError):
+            cache.set(1, 1)
+        assert len(cache) == 0
+    
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+    def test_forked_child_writes_are_seen_by_the_parent(self, shared_cache):
+        cache = shared_cache(capacity=64)
+        cache.set("from-parent", 1)
+        
+        report = in_forked_child(lambda: (cache.get("from-parent"), cache.incr("hits")))
+        assert report == "(1, 1)"
+        assert cache.get("hits") == 1
+
+
+class TestBufferedLogger:
+    def test_buffered_lines_reach_the_stream_in_order(self, fresh):
+        stream = io.StringIO()
+        logger = fresh(Logger)(buffered=True, stream=stream, capacity=4, flush_interval=60)
+        for number in range(10):
+            logger.info("line %d", number)
+        logger.flush()
+        
+        assert stream.getvalue() == "".join(f"[INFO] line {number}\n" for number in range(10))
+    
+    @pytest.mark.parametrize("overflow, kept", [("drop-newest", "ab"), ("drop-oldest", "de")])
+    def test_full_buffer_drops_by_policy(self, overflow, kept):
+        stream = io.StringIO()
+        writer = BufferedLogWriter(stream, capacity=2, overflow=overflow, flush_interval=60)
+        with writer._write_lock:
+            # The background writer cannot drain while the write lock is held
+            for line in "abcde":
+                writer.submit(line)
+        writer.close()
+        
+        assert stream.getvalue() == kept and writer.dropped == 3
+    
+    def test_close_flushes_and_stops_the_writer(self, fresh):
+        stream = io.StringIO()
+        logger = fresh(Logger)(buffered=True, stream=stream, flush_interval=60)
+        logger.warning("last words")
+        logger.close()
+        
+        assert stream.getvalue() == "[WARNING] last words\n"
+        assert not logger._writer._thread.is_alive()
+
+
+class TestSegmentedLogStore:
+    def test_records_round_trip_through_the_binary_format(self, tmp_path):
+        store = SegmentedLogStore(str(tmp_path))
+        store.append("started", INFO, timestamp=1.0)
+        store.append("disk full", WARNING, timestamp=2.0)
+        store.close()
+        
+        data = (tmp_path / "0000000000.log").read_bytes()
+        assert struct.unpack_from("<IIdB", data) == (7, zlib.crc32(b"started"), 1.0, INFO)
+        assert data[17:24] == b"started"
+        assert list(store.query()) == [LogRecord(1.0, INFO, "started"),
+                                       LogRecord(2.0, WARNING, "disk full")]
+    
+    def test_query_returns_every_record_at_the_start_timestamp(self, tmp_path):
+        store = SegmentedLogStore(str(tmp_path), index_interval=32)
+        for number in range(10):
+            store.append(f"record {number}", timestamp=100.0)
+        
+        assert len(list(store.query(start=100.0))) == 10
+    
+    def test_query_filters_across_rotated_segments(self, tmp_path):
+        store = SegmentedLogStore(str(tmp_path), segment_bytes=64, index_interval=32)
+        for number in range(20):
+            store.append(f"event {number}", WARNING if number % 5 == 0 else INFO,
+                         timestamp=float(number))
+        
+        assert len(store.segments) > 1
+        assert [record.message for record in store.query(start=4.5, end=15.0, level=WARNING)] \
+            == ["event 5", "event 10", "event 15"]
+        assert [record.timestamp for record in store.query(contains="event 1")] \
+            == [1.0] + [float(number) for number in range(10, 20)]
+    
+    def test_torn_tail_is_skipped(self, tmp_path):
+        store = SegmentedLogStore(str(tmp_path))
+        store.append("whole", timestamp=1.0)
+        store.append("torn", timestamp=2.0)
+        store.close()
+        segment = tmp_path / "0000000000.log"
+        segment.write_bytes(segment.read_bytes()[:-2])
+        
+        assert [record.message for record in store.query()] == ["whole"]
+    
+    def test_logger_query_works_after_close(self, fresh, tmp_path):
+        logger = fresh(Logger)(store=str(tmp_path), stream=io.StringIO())
+        logger.error("failed %s", "job")
+        logger.close()
+        
+        assert [record.message for record in logger.query(level=ERROR)] == ["failed job"]
+
+
+class TestConnectionPool:
+    def test_connections_are_reused_and_capped(self):
+        pool = ConnectionPool(sqlite_connector(":memory:"), min_size=0, max_size=2)
+        with pool.connection() as first:
+            pass
+        with pool.connection() as again:
+            second = pool.checkout()
+            with pytest.raises(PoolTimeoutError):
+                pool.checkout(timeout=0.01)
+            pool.checkin(second)
+        
+        assert again is first and (pool.size, pool.idle, pool.in_use) == (2, 2, 0)
+        pool.close()
+        assert pool.size == 0
+    
+    def test_failed_health_check_replaces_the_connection(self):
+        pool = ConnectionPool(object, min_size=1, check_after=0,
+                              health_check=lambda connection: False, close=lambda connection: None)
+        stale = next(iter(pool._idle.values())).connection
+        
+        assert pool.checkout() is not stale and pool.size == 1
+    
+    def test_raising_health_check_does_not_leak_the_slot(self):
+        def health_check(connection):
+            raise OSError("connection reset")
+        
+        pool = ConnectionPool(object, min_size=1, max_size=1, check_after=0,
+                              health_check=health_check, close=lambda connection: None)
+        connection = pool.checkout(timeout=0.1)
+        
+        assert (pool.size, pool.idle, pool.in_use) == (1, 0, 1)
+        pool.checkin(connection)
+    
+    def test_idle_connections_are_reaped_down_to_min_size(self):
+        pool = ConnectionPool(object, min_size=1, max_size=3, max_idle=0,
+                              close=lambda connection: None)
+        borrowed = [pool.checkout() for _ in range(3)]
+        for connection in borrowed:
+            pool.checkin(connection)
+        
+        assert pool.reap_idle() == 2 and pool.size == 1
+
+
+class TestResultCursor:
+    def connect(self, fresh):
+        def driver():
+            connection = sqlite3.connect(":memory:", check_same_thread=False)
+            connection.execute("CREATE TABLE t (id INTEGER, price REAL, name TEXT)")
+            connection.executemany("INSERT INTO t VALUES (?, ?, ?)",
+                                   [(n, n / 2, f"row{n}") for n in range(10)])
+            return connection
+        
+        db = fresh(DatabaseConnection)("sqlite", 0, "cursor-test", driver=driver)
+        db.connect()
+        return db
+    
+    def test_rows_are_fetched_arraysize_at_a_time(self, fresh):
+        db = self.connect(fresh)
+        with db.cursor("SELECT id FROM t WHERE id >= ?", (3,), arraysize=4) as cursor:
+            batches = list(cursor.iter_batches())
+        
+        assert [len(batch) for batch in batches] == [4, 3] and cursor.rowcount == 7
+    
+    def test_dbapi_fetches_continue_where_the_last_one_stopped(self, fresh):
+        db = self.connect(fresh)
+        with db.cursor("SELECT id FROM t") as cursor:
+            assert cursor.fetchone() == (0,)
+            assert cursor.fetchmany(2) == [(1,), (2,)]
+            assert [row for row, in cursor] == list(range(3, 10))
+            assert cursor.fetchall() == [] and cursor.rowcount == 10
+    
+    def test_columnar_batches_without_numpy(self, fresh):
+        db = self.connect(fresh)
+        with db.cursor("SELECT id, price, name FROM t WHERE id < 3") as cursor:
+            columns = cursor.fetch_columns(use_numpy=False)
+            
+            assert columns == {"id": array("q", [0, 1, 2]), "price": array("d", [0, 0.5, 1]),
+                               "name": ["row0", "row1", "row2"]}
+            assert cursor.fetch_columns(use_numpy=False) is None
+    
+    def test_null_and_empty_columns_stay_plain(self):
+        assert to_columns(["x"], [(1,), (None,)], use_numpy=False) == {"x": [1, None]}
+        assert to_columns(["x", "y"], [], use_numpy=False) == {"x": [], "y": []}
+    
+    def test_cursor_needs_a_driver(self, fresh):
+        with pytest.raises(RuntimeError):
+            fresh(DatabaseConnection)("db-no-driver", 5432, "app").cursor("SELECT 1")
+
+
+class TestSnapshotRestore:
+    def test_lazy_restore_moves_entries_in_on_first_use(self, fresh, tmp_path):
+        path = str(tmp_path / "cache.snap")
+        source = fresh(Cache)()
+        values = {"s": "text", "i": 42, "f": 1.5, "b": b"raw", "t": ("a", 1)}
+        for key, value in values.items():
+            source.set(key, value)
+        assert source.snapshot(path) == len(values)
+        
+        cache = fresh(Cache)()
+        assert cache.restore(path) == len(values) and len(cache) == len(values)
+        assert {key: cache.get(key) for key in values} == values
+        assert cache._snapshot is None
+    
+    def test_writes_and_deletes_win_over_the_snapshot(self, fresh, tmp_path):
+        path = str(tmp_path / "cache.snap")
+        source = fresh(Cache)()
+        for key in ("kept", "set", "deleted", "counter"):
+            source.set(key, 1)
+        source.snapshot(path)
+        
+        cache = fresh(Cache)()
+        cache.restore(path)
+        cache.set("set", 2)
+        assert cache.delete("deleted") and "deleted" not in cache
+        assert cache.incr("counter") == 2
+        
+        assert cache.get("set") == 2 and cache.get("deleted") is None
+        assert cache.get("kept") == 1 and len(cache) == 3
+    
+    def test_snapshot_keeps_entries_not_yet_restored(self, fresh, tmp_path):
+        first, second = str(tmp_path / "first.snap"), str(tmp_path / "second.snap")
+        source = fresh(Cache)()
+        source.set("a", 1)
+        source.set("b", 2)
+        source.snapshot(first)
+        
+        cache = fresh(Cache)()
+        cache.restore(first)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.snapshot(second) == 3
+        assert fresh(Cache)().restore(second, lazy=False) == 3
+    
+    def test_reader_is_closed_when_used_up_cleared_or_replaced(self, fresh, tmp_path):
+        path, empty = str(tmp_path / "cache.snap"), str(tmp_path / "empty.snap")
+        source = fresh(Cache)()
+        source.set("only", 1)
+        source.snapshot(path)
+        
+        cache = fresh(Cache)()
+        cache.restore(path)
+        reader = cache._snapshot
+        cache.get("only")
+        assert reader.closed and cache._snapshot is None
+        
+        cache.restore(path)
+        reader = cache._snapshot
+        cache.restore(path)
+        assert reader.closed and not cache._snapshot.closed
+        
+        reader = cache._snapshot
+        cache.clear()
+        assert reader.closed and cache.get("only") is None
+        
+        fresh(Cache)().snapshot(empty)
+        assert cache.restore(empty) == 0 and cache._snapshot is None
+    
+    def test_file_that_is_not_a_snapshot_is_refused(self, tmp_path):
+        path = tmp_path / "bogus.snap"
+        path.write_bytes(bytes(64))
+        
+        with pytest.raises(ValueError):
+            SnapshotReader(str(path))